@@ -1,14 +1,45 @@
 import argparse
 import os
 import queue
+import re
 import subprocess
 import sys
 import threading
+import time
 import tkinter as tk
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
 from tkinter import messagebox, ttk
 
+# Shared building blocks live in scripts/launcher_common.py (also used by scripts/launcher_ui.py).
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from launcher_common import (  # noqa: E402
+    PrefixedLog,
+    SessionLog,
+    VirtualLogView,
+    new_group_kwargs,
+    project_dev_ports,
+    read_output_chunks,
+    repo_root,
+    stop_process_tree,
+)
+
+# Output rendering: one Text.insert per tick, bounded by time and size so floods can't starve the Tk loop.
+OUTPUT_POLL_MS = 50
+OUTPUT_FRAME_BUDGET_S = 0.008
+OUTPUT_MAX_CHARS_PER_TICK = 256 * 1024
+
+# Stop: SIGTERM to the script's whole session, SIGKILL for whatever is left after this long.
+STOP_GRACE_S = 5.0
+
+# Scripts running at once; extra runs wait in a queue. Override with SCRIPTS_RUNNER_MAX_CONCURRENT or --max-concurrent.
+DEFAULT_MAX_CONCURRENT = 4
+
+SCRIPT_SUFFIXES = (".ps1", ".bat", ".cmd", ".sh")
+# Script discovery: directory mtimes are re-checked this often; only changed directories are listed again.
+SCRIPTS_WATCH_INTERVAL_S = 2.0
+
 
 @dataclass(frozen=True)
 class ScriptOption:
@@ -29,6 +60,33 @@ class Action:
     destructive: bool = False
 
 
+@dataclass(eq=False)
+class ScriptRun:
+    run_id: int
+    action: Action
+    cmd: list[str]
+    script_path: Path
+    parameter: str
+    tab: ttk.Frame
+    view: VirtualLogView
+    proc: subprocess.Popen | None = None
+    reader: threading.Thread | None = None
+    stopper: threading.Thread | None = None
+    stop_requested: bool = False
+    exit_code: int | None = None
+    started: float = 0.0
+    # Feeds the "Geral" tab: complete lines (and \r frames) only, prefixed with the tab title.
+    to_global: PrefixedLog | None = None
+
+    @property
+    def title(self) -> str:
+        return f"{self.action.label} #{self.run_id}"
+
+    @property
+    def active(self) -> bool:
+        return self.proc is not None and self.exit_code is None
+
+
 def _repo_root_from_scripts_dir(scripts_dir: Path) -> Path:
     return scripts_dir.parent
 
@@ -54,7 +112,94 @@ def _bash_command(script_path: Path, extra_args: list[str]) -> list[str]:
     return ["bash", str(script_path), *extra_args]
 
 
-def build_actions(scripts_dir: Path) -> list[Action]:
+class ScriptIndex:
+    # Persisted manifest of script files keyed by directory mtime. A directory's mtime changes when entries are
+    # added, removed or renamed in it, so an unchanged directory costs one stat instead of a listing.
+    MANIFEST_VERSION = 1
+
+    def __init__(self, scripts_dir: Path, manifest_path: Path | None = None):
+        self.scripts_dir = scripts_dir
+        self.manifest_path = manifest_path
+        self.files: frozenset[str] = frozenset()
+        self.rescanned = 0
+        self._dirs: dict[str, dict] = self._load()
+
+    def _load(self) -> dict[str, dict]:
+        import json
+
+        if self.manifest_path is None:
+            return {}
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != self.MANIFEST_VERSION or data.get("scripts_dir") != str(self.scripts_dir):
+            return {}
+        return data.get("dirs", {})
+
+    def _save(self) -> None:
+        import json
+
+        if self.manifest_path is None:
+            return
+        data = {"version": self.MANIFEST_VERSION, "scripts_dir": str(self.scripts_dir), "dirs": self._dirs}
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+            tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+            tmp.replace(self.manifest_path)
+        except OSError:
+            pass
+
+    def refresh(self) -> bool:
+        # Returns True when the set of script files changed since the last refresh.
+        dirs: dict[str, dict] = {}
+        files: list[str] = []
+        rescanned = 0
+        pending = [""]
+        while pending:
+            rel_dir = pending.pop()
+            path = self.scripts_dir / rel_dir if rel_dir else self.scripts_dir
+            try:
+                mtime = path.stat().st_mtime_ns
+            except OSError:
+                continue
+            entry = self._dirs.get(rel_dir)
+            if entry is None or entry["mtime_ns"] != mtime:
+                rescanned += 1
+                entry = {"mtime_ns": mtime, "files": [], "subdirs": []}
+                try:
+                    with os.scandir(path) as it:
+                        for e in it:
+                            if e.is_dir(follow_symlinks=False):
+                                if e.name != "__pycache__":
+                                    entry["subdirs"].append(e.name)
+                            elif e.name.lower().endswith(SCRIPT_SUFFIXES) and e.is_file():
+                                entry["files"].append(e.name)
+                except OSError:
+                    continue
+            dirs[rel_dir] = entry
+            prefix = f"{rel_dir}/" if rel_dir else ""
+            files.extend(prefix + name for name in entry["files"])
+            pending.extend(prefix + name for name in entry["subdirs"])
+
+        changed = frozenset(files) != self.files or dirs.keys() != self._dirs.keys()
+        self.files = frozenset(files)
+        self.rescanned = rescanned
+        if rescanned or dirs.keys() != self._dirs.keys():
+            self._dirs = dirs
+            self._save()
+        return changed
+
+    def exists(self, rel: str) -> bool:
+        return rel in self.files
+
+
+def _manifest_path() -> Path:
+    return repo_root() / "logs" / "scripts-runner" / "discovery-manifest.json"
+
+
+def build_actions(scripts_dir: Path, index: ScriptIndex | None = None) -> list[Action]:
     def label_from_filename(name: str) -> str:
         base = name
         for ext in (".ps1", ".bat", ".cmd", ".sh"):
@@ -80,20 +225,18 @@ def build_actions(scripts_dir: Path) -> list[Action]:
             ".sh": "Bash",
         }.get(suffix.lower(), suffix)
 
-    def is_script_file(p: Path) -> bool:
-        return p.suffix.lower() in (".ps1", ".bat", ".cmd", ".sh")
-
     def looks_destructive(rel: str) -> bool:
         low = rel.lower()
         return any(token in low for token in ("limpar", "clean", "reset", "prune", "matar", "kill"))
 
+    if index is None:
+        index = ScriptIndex(scripts_dir)
+        index.refresh()
+
     # Discover all scripts recursively (including testes/*).
     grouped: dict[tuple[str, str], dict[str, list[ScriptOption]]] = {}
-    for p in scripts_dir.rglob("*"):
-        if not p.is_file() or not is_script_file(p):
-            continue
-
-        rel = p.relative_to(scripts_dir).as_posix()
+    for rel in sorted(index.files):
+        p = Path(rel)
 
         # Ignore helper files that aren't meant to be run directly.
         if rel.lower().endswith("docker-entrypoint.sh"):
@@ -153,10 +296,9 @@ def build_actions(scripts_dir: Path) -> list[Action]:
     return actions
 
 
-def resolve_existing_option(scripts_dir: Path, action: Action) -> ScriptOption | None:
+def resolve_existing_option(index: ScriptIndex, action: Action) -> ScriptOption | None:
     for opt in action.options:
-        p = scripts_dir / opt.file_relative
-        if p.exists():
+        if index.exists(opt.file_relative):
             return opt
     return None
 
@@ -184,18 +326,25 @@ def build_command_for_option(
 
 
 class ScriptRunnerUI:
-    def __init__(self, root: tk.Tk, scripts_dir: Path):
+    def __init__(self, root: tk.Tk, scripts_dir: Path, max_concurrent: int = DEFAULT_MAX_CONCURRENT):
         self.root = root
         self.scripts_dir = scripts_dir
+        self.max_concurrent = max(1, max_concurrent)
         self.repo_root = _repo_root_from_scripts_dir(scripts_dir)
 
-        self.actions = build_actions(scripts_dir)
+        self.index = ScriptIndex(scripts_dir, _manifest_path())
+        self.index.refresh()
+        self.actions = build_actions(scripts_dir, self.index)
         self.actions_by_key = {a.key: a for a in self.actions}
+        self._scripts_dirty = threading.Event()
+        self._closing = threading.Event()
 
-        self.proc: subprocess.Popen[str] | None = None
-        self.output_queue: queue.Queue[str] = queue.Queue()
-        self.reader_thread: threading.Thread | None = None
-        self.stop_requested = False
+        # One queue shared by every reader; items are (run_id, text), run_id 0 is the runner itself.
+        self.output_queue: queue.Queue[tuple[int, str]] = queue.Queue()
+        self.runs: dict[int, ScriptRun] = {}
+        self.waiting: deque[ScriptRun] = deque()
+        self._global_parts: list[str] = []
+        self._run_seq = 0
 
         self.selected_action_key = tk.StringVar(value="")
         self.selected_option_label = tk.StringVar(value="")
@@ -205,6 +354,28 @@ class ScriptRunnerUI:
         self._populate_actions_tree()
 
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        threading.Thread(target=self._watch_scripts, name="scripts-watch", daemon=True).start()
+
+    def _watch_scripts(self) -> None:
+        # Off the Tk thread: one stat per directory per interval, a listing only where something changed.
+        while not self._closing.wait(SCRIPTS_WATCH_INTERVAL_S):
+            try:
+                if self.index.refresh():
+                    self._scripts_dirty.set()
+            except Exception:
+                pass
+
+    def _reload_actions(self) -> None:
+        self.actions = build_actions(self.scripts_dir, self.index)
+        self.actions_by_key = {a.key: a for a in self.actions}
+        selected = self.selected_action_key.get()
+        self._populate_actions_tree()
+        if selected not in self.actions_by_key:
+            self.selected_action_key.set("")
+            self.desc_label.configure(text="Selecione uma ação à esquerda.")
+            self.option_combo["values"] = []
+            self.selected_option_label.set("")
+            self._hide_parameter()
 
     def _build_ui(self) -> None:
         self.root.title("Scripts Runner - rainer-portfolio-backend")
@@ -264,30 +435,53 @@ class ScriptRunnerUI:
         self.run_btn = ttk.Button(buttons, text="Executar", command=self._run_selected)
         self.run_btn.grid(row=0, column=0, sticky="w")
 
-        self.stop_btn = ttk.Button(buttons, text="Parar", command=self._stop_process, state="disabled")
+        self.stop_btn = ttk.Button(buttons, text="Parar", command=self._stop_selected, state="disabled")
         self.stop_btn.grid(row=0, column=1, sticky="w", padx=(10, 0))
 
+        self.stop_all_btn = ttk.Button(buttons, text="Parar todos", command=self._stop_all, state="disabled")
+        self.stop_all_btn.grid(row=0, column=2, sticky="w", padx=(10, 0))
+
         self.clear_btn = ttk.Button(buttons, text="Limpar log", command=self._clear_log)
-        self.clear_btn.grid(row=0, column=2, sticky="w", padx=(10, 0))
+        self.clear_btn.grid(row=0, column=3, sticky="w", padx=(10, 0))
+
+        self.close_tab_btn = ttk.Button(buttons, text="Fechar aba", command=self._close_selected_tab, state="disabled")
+        self.close_tab_btn.grid(row=0, column=4, sticky="w", padx=(10, 0))
+
+        self.running_label = ttk.Label(buttons, text="")
+        self.running_label.grid(row=0, column=5, sticky="w", padx=(10, 0))
 
         self.cwd_label = ttk.Label(buttons, text=f"CWD: {self.repo_root}")
-        self.cwd_label.grid(row=0, column=3, sticky="e")
+        self.cwd_label.grid(row=0, column=6, sticky="e")
 
         log_frame = ttk.LabelFrame(right, text="Log", padding=8)
         log_frame.grid(row=2, column=0, sticky="nsew")
         log_frame.grid_rowconfigure(0, weight=1)
         log_frame.grid_columnconfigure(0, weight=1)
 
-        self.log_text = tk.Text(log_frame, wrap="none", height=18)
-        self.log_text.grid(row=0, column=0, sticky="nsew")
-        self.log_text.configure(state="disabled")
+        # "Geral" interleaves every run (prefixed by its tab title); each run also gets its own tab.
+        self.output_tabs = ttk.Notebook(log_frame)
+        self.output_tabs.grid(row=0, column=0, sticky="nsew")
+        self.output_tabs.bind("<<NotebookTabChanged>>", lambda _e: self._sync_run_buttons())
 
-        log_scroll = ttk.Scrollbar(log_frame, orient="vertical", command=self.log_text.yview)
-        log_scroll.grid(row=0, column=1, sticky="ns")
-        self.log_text.configure(yscrollcommand=log_scroll.set)
+        self.log_tab, self.log_view = self._new_log_tab(SessionLog.create(repo_root() / "logs" / "scripts-runner", "scripts-runner"))
+        self.output_tabs.add(self.log_tab, text="Geral")
+        self._sync_run_buttons()
 
         # periodic UI update from queue
-        self.root.after(100, self._poll_output)
+        self.root.after(OUTPUT_POLL_MS, self._poll_output)
+
+    def _new_log_tab(self, store: SessionLog) -> tuple[ttk.Frame, VirtualLogView]:
+        tab = ttk.Frame(self.output_tabs)
+        tab.grid_rowconfigure(0, weight=1)
+        tab.grid_columnconfigure(0, weight=1)
+
+        text = tk.Text(tab, wrap="none", height=18)
+        text.grid(row=0, column=0, sticky="nsew")
+        text.configure(state="disabled")
+
+        scroll = ttk.Scrollbar(tab, orient="vertical", command=text.yview)
+        scroll.grid(row=0, column=1, sticky="ns")
+        return tab, VirtualLogView(text, scroll, store)
 
     def _populate_actions_tree(self) -> None:
         self.tree.delete(*self.tree.get_children())
@@ -318,13 +512,13 @@ class ScriptRunnerUI:
         self.desc_label.configure(text=action.description)
 
         # options
-        available_opts = [opt for opt in action.options if (self.scripts_dir / opt.file_relative).exists()]
+        available_opts = [opt for opt in action.options if self.index.exists(opt.file_relative)]
         if not available_opts:
             self.selected_option_label.set("")
             self.option_combo["values"] = []
         else:
             self.option_combo["values"] = [opt.label for opt in available_opts]
-            preferred = resolve_existing_option(self.scripts_dir, action)
+            preferred = resolve_existing_option(self.index, action)
             self.selected_option_label.set(preferred.label if preferred else available_opts[0].label)
 
         self._sync_parameter_ui()
@@ -354,39 +548,93 @@ class ScriptRunnerUI:
         self.parameter_value.set("")
 
     def _append_log(self, text: str) -> None:
-        self.log_text.configure(state="normal")
-        self.log_text.insert("end", text)
-        self.log_text.see("end")
-        self.log_text.configure(state="disabled")
+        self.log_view.append(text)
+
+    def _selected_run(self) -> ScriptRun | None:
+        selected = self.output_tabs.select()
+        return next((r for r in self.runs.values() if str(r.tab) == selected), None)
+
+    def _active_runs(self) -> list[ScriptRun]:
+        return [r for r in self.runs.values() if r.active]
+
+    def _sync_run_buttons(self) -> None:
+        run = self._selected_run()
+        active = self._active_runs()
+        self.stop_btn.configure(state="normal" if run is not None and (run.active or run in self.waiting) else "disabled")
+        self.stop_all_btn.configure(state="normal" if active or self.waiting else "disabled")
+        self.close_tab_btn.configure(state="normal" if run is not None and run.exit_code is not None else "disabled")
+        waiting = f", {len(self.waiting)} na fila" if self.waiting else ""
+        self.running_label.configure(text=f"Em execução: {len(active)}/{self.max_concurrent}{waiting}")
+
+    def _set_tab_state(self, run: ScriptRun, mark: str) -> None:
+        self.output_tabs.tab(run.tab, text=f"{mark} {run.title}")
 
     def _clear_log(self) -> None:
-        self.log_text.configure(state="normal")
-        self.log_text.delete("1.0", "end")
-        self.log_text.configure(state="disabled")
+        run = self._selected_run()
+        (run.view if run is not None else self.log_view).clear()
 
-    def _poll_output(self) -> None:
+    def _close_selected_tab(self) -> None:
+        run = self._selected_run()
+        if run is None or run.exit_code is None:
+            return
+        self.output_tabs.forget(run.tab)
+        run.tab.destroy()
+        run.view.store.close()
+        del self.runs[run.run_id]
+        self._sync_run_buttons()
+
+    def _drain_output_queue(self) -> dict[int, list[str]]:
+        deadline = time.perf_counter() + OUTPUT_FRAME_BUDGET_S
+        chunks: dict[int, list[str]] = {}
+        size = 0
         try:
-            while True:
-                msg = self.output_queue.get_nowait()
-                self._append_log(msg)
+            while size < OUTPUT_MAX_CHARS_PER_TICK and time.perf_counter() < deadline:
+                run_id, msg = self.output_queue.get_nowait()
+                chunks.setdefault(run_id, []).append(msg)
+                size += len(msg)
         except queue.Empty:
             pass
+        return chunks
 
-        if self.proc is not None:
-            code = self.proc.poll()
-            if code is not None:
-                self.output_queue.put(f"\n[processo finalizado] exit_code={code}\n")
-                self.proc = None
-                self.run_btn.configure(state="normal")
-                self.stop_btn.configure(state="disabled")
-
-        self.root.after(100, self._poll_output)
+    def _poll_output(self) -> None:
+        if self._scripts_dirty.is_set():
+            self._scripts_dirty.clear()
+            self._reload_actions()
+
+        # One insert per tab per tick; the global view gets every run's lines tagged with its tab title.
+        for run_id, parts in self._drain_output_queue().items():
+            text = "".join(parts)
+            run = self.runs.get(run_id)
+            if run is None:
+                self._global_parts.append(text)
+                continue
+            run.view.append(text)
+            run.to_global(text)
+            if run.exit_code is not None:
+                run.to_global.flush()
+        if self._global_parts:
+            self._append_log("".join(self._global_parts))
+            self._global_parts.clear()
+
+        finished = False
+        for run in self._active_runs():
+            code = run.proc.poll()
+            # Wait for the reader (and a pending stop report) too, so the exit line lands last.
+            busy = [t for t in (run.reader, run.stopper) if t is not None and t.is_alive()]
+            if code is not None and not busy:
+                run.exit_code = code
+                elapsed = time.monotonic() - run.started
+                self.output_queue.put((run.run_id, f"\n[processo finalizado] exit_code={code} ({elapsed:.1f}s)\n"))
+                self._set_tab_state(run, "✅" if code == 0 else "❌")
+                finished = True
+        if finished:
+            self._start_waiting()
+            self._sync_run_buttons()
+
+        # Backlog left over: come back on the next idle slot instead of waiting a full interval.
+        self.root.after(1 if not self.output_queue.empty() else OUTPUT_POLL_MS, self._poll_output)
 
     def _run_selected(self) -> None:
-        if self.proc is not None:
-            messagebox.showwarning("Em execução", "Já existe um script em execução. Pare antes de iniciar outro.")
-            return
-
         action_key = self.selected_action_key.get()
         if not action_key:
             messagebox.showwarning("Seleção", "Selecione uma ação na lista.")
@@ -396,7 +644,7 @@ class ScriptRunnerUI:
 
         # find chosen option
         chosen_label = self.selected_option_label.get()
-        available_opts = [opt for opt in action.options if (self.scripts_dir / opt.file_relative).exists()]
+        available_opts = [opt for opt in action.options if self.index.exists(opt.file_relative)]
         chosen_opt = next((o for o in available_opts if o.label == chosen_label), None)
         if not chosen_opt and available_opts:
             chosen_opt = available_opts[0]
@@ -409,6 +657,13 @@ class ScriptRunnerUI:
             messagebox.showwarning("Parâmetro", "Selecione o parâmetro.")
             return
 
+        # The same script twice usually fights over ports/containers; different scripts run side by side.
+        busy = [r for r in self.runs.values() if r.action.key == action.key and (r.active or r in self.waiting)]
+        if busy and not messagebox.askyesno(
+            "Em execução", f"{busy[0].title} ainda está em execução.\n\nIniciar outra instância mesmo assim?"
+        ):
+            return
+
         # confirmations
         if action.destructive:
             if action.key == "docker_manage" and parameter != "clean":
@@ -427,36 +682,52 @@ class ScriptRunnerUI:
             messagebox.showerror("Erro", str(e))
             return
 
-        env = os.environ.copy()
-        env["PYTHONIOENCODING"] = "utf-8"
-
-        self._append_log("\n" + "=" * 90 + "\n")
-        self._append_log(f"Ação: {action.label}\n")
-        self._append_log(f"Script: {script_path}\n")
+        self._run_seq += 1
+        slug = re.sub(r"[^a-z0-9]+", "-", action.label.lower()).strip("-") or "script"
+        tab, view = self._new_log_tab(SessionLog.create(repo_root() / "logs" / "scripts-runner" / "runs", slug))
+        run = ScriptRun(self._run_seq, action, cmd, script_path, parameter, tab, view)
+        run.to_global = PrefixedLog(f"[{run.title}] ", self._global_parts.append)
+        self.runs[run.run_id] = run
+        self.output_tabs.add(tab, text=run.title)
+        self.output_tabs.select(tab)
+
+        header = "\n" + "=" * 90 + "\n"
+        header += f"Ação: {action.label}\nScript: {script_path}\n"
         if parameter:
-            self._append_log(f"Parâmetro: {parameter}\n")
-        self._append_log(f"Comando: {' '.join(cmd)}\n")
-        self._append_log("=" * 90 + "\n\n")
+            header += f"Parâmetro: {parameter}\n"
+        header += f"Comando: {' '.join(cmd)}\n" + "=" * 90 + "\n\n"
+        self.output_queue.put((run.run_id, header))
+
+        if len(self._active_runs()) >= self.max_concurrent:
+            self.waiting.append(run)
+            self._set_tab_state(run, "⏳")
+            self.output_queue.put((run.run_id, f"[na fila] limite de {self.max_concurrent} script(s) simultâneo(s)\n"))
+        else:
+            self._start_run(run)
+        self._sync_run_buttons()
 
-        self.stop_requested = False
-        self.run_btn.configure(state="disabled")
-        self.stop_btn.configure(state="normal")
+    def _start_waiting(self) -> None:
+        while self.waiting and len(self._active_runs()) < self.max_concurrent:
+            self._start_run(self.waiting.popleft())
+
+    def _start_run(self, run: ScriptRun) -> None:
+        env = os.environ.copy()
+        env["PYTHONIOENCODING"] = "utf-8"
 
         try:
-            self.proc = subprocess.Popen(
-                cmd,
+            run.proc = subprocess.Popen(
+                run.cmd,
                 cwd=str(self.repo_root),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
                 env=env,
+                # Own session/process group, so Stop reaches `docker compose logs -f`, `pnpm dev`, etc.
+                **new_group_kwargs(),
             )
         except FileNotFoundError as e:
-            self.proc = None
-            self.run_btn.configure(state="normal")
-            self.stop_btn.configure(state="disabled")
+            run.exit_code = -1
+            self._set_tab_state(run, "❌")
+            self.output_queue.put((run.run_id, f"[erro] {e}\n"))
             messagebox.showerror(
                 "Falha ao executar",
                 f"Não consegui executar o comando.\n\nDetalhes: {e}\n\n"
@@ -464,50 +735,83 @@ class ScriptRunnerUI:
             )
             return
 
-        self.reader_thread = threading.Thread(target=self._reader_loop, daemon=True)
-        self.reader_thread.start()
+        run.started = time.monotonic()
+        self._set_tab_state(run, "▶")
+        run.reader = threading.Thread(target=self._reader_loop, args=(run,), name=f"reader-{run.run_id}", daemon=True)
+        run.reader.start()
 
-    def _reader_loop(self) -> None:
-        assert self.proc is not None
-        assert self.proc.stdout is not None
+    def _reader_loop(self, run: ScriptRun) -> None:
+        assert run.proc is not None
+        assert run.proc.stdout is not None
 
         try:
-            for line in self.proc.stdout:
-                if self.stop_requested:
+            for chunk in read_output_chunks(run.proc.stdout):
+                if run.stop_requested:
                     break
-                self.output_queue.put(line)
+                self.output_queue.put((run.run_id, chunk))
         except Exception as e:
-            self.output_queue.put(f"\n[erro lendo stdout] {e}\n")
-
-    def _stop_process(self) -> None:
-        if self.proc is None:
+            self.output_queue.put((run.run_id, f"\n[erro lendo stdout] {e}\n"))
+
+    def _stop_selected(self) -> None:
+        run = self._selected_run()
+        if run is not None:
+            self._stop_process(run)
+
+    def _stop_all(self) -> None:
+        for run in [*self.waiting, *self._active_runs()]:
+            self._stop_process(run)
+
+    def _stop_process(self, run: ScriptRun) -> None:
+        if run in self.waiting:
+            self.waiting.remove(run)
+            run.exit_code = -1
+            self._set_tab_state(run, "❌")
+            self.output_queue.put((run.run_id, "[cancelado] removido da fila\n"))
+            self._sync_run_buttons()
+            return
+        if not run.active or (run.stopper and run.stopper.is_alive()):
             return
 
-        self.stop_requested = True
-        try:
-            self.proc.terminate()
-        except Exception:
-            pass
+        run.stop_requested = True
+        self.output_queue.put((run.run_id, "\n[solicitado] parar processo e subprocessos\n"))
+        # Escalation and the port check can take seconds; keep them off the Tk thread.
+        run.stopper = threading.Thread(target=self._stop_tree, args=(run,), name=f"stop-{run.run_id}", daemon=True)
+        run.stopper.start()
 
-        self.output_queue.put("\n[solicitado] parar processo\n")
+    def _stop_tree(self, run: ScriptRun) -> None:
+        def log(text: str) -> None:
+            self.output_queue.put((run.run_id, text))
+
+        try:
+            stop_process_tree(run.proc, log, grace=STOP_GRACE_S, ports=project_dev_ports(repo_root()))
+        except Exception as e:
+            log(f"[erro ao parar] {e}\n")
 
     def _on_close(self) -> None:
-        if self.proc is not None:
-            ok = messagebox.askyesno("Sair", "Existe um processo em execução. Deseja parar e sair?")
+        if self._active_runs() or self.waiting:
+            ok = messagebox.askyesno("Sair", "Existem processos em execução. Deseja parar todos e sair?")
             if not ok:
                 return
-            self._stop_process()
-
+            self._stop_all()
+            for run in self.runs.values():
+                if run.stopper is not None:
+                    run.stopper.join(timeout=2 * STOP_GRACE_S + 1)
+
+        self._closing.set()
+        for run in self.runs.values():
+            run.view.store.close()
+        self.log_view.store.close()
         self.root.destroy()
 
 
 def list_actions(scripts_dir: Path) -> int:
-    actions = build_actions(scripts_dir)
+    index = ScriptIndex(scripts_dir, _manifest_path())
+    index.refresh()
+    actions = build_actions(scripts_dir, index)
     for a in actions:
         print(f"[{a.category}] {a.label} :: key={a.key}")
         for opt in a.options:
-            p = scripts_dir / opt.file_relative
-            exists = "OK" if p.exists() else "MISSING"
+            exists = "OK" if index.exists(opt.file_relative) else "MISSING"
             print(f"  - {opt.label}: {opt.file_relative} ({exists})")
         if a.parameter_kind and a.parameter_choices:
             print(f"  - param: {a.parameter_label} -> {', '.join(a.parameter_choices)}")
@@ -519,6 +823,12 @@ def list_actions(scripts_dir: Path) -> int:
 def main(argv: list[str]) -> int:
     parser = argparse.ArgumentParser(description="UI para executar scripts do projeto")
     parser.add_argument("--list-actions", action="store_true", help="Lista ações detectadas e sai")
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=int(os.environ.get("SCRIPTS_RUNNER_MAX_CONCURRENT") or DEFAULT_MAX_CONCURRENT),
+        help="Quantos scripts podem rodar ao mesmo tempo (os demais entram na fila)",
+    )
     args = parser.parse_args(argv)
 
     scripts_dir = Path(__file__).resolve().parent
@@ -532,7 +842,7 @@ def main(argv: list[str]) -> int:
     except Exception:
         pass
 
-    ScriptRunnerUI(root, scripts_dir)
+    ScriptRunnerUI(root, scripts_dir, max_concurrent=args.max_concurrent)
     root.mainloop()
     return 0
 
@@ -0,0 +1,860 @@
+from __future__ import annotations
+
+# Building blocks shared by launcher_ui.py and 00-iniciar-ambiente/scripts-runner-ui.py: session logs and their
+# Tk view, chunked child output, and stopping process trees / freeing dev ports. Nothing here loads Tk.
+import os
+import platform
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import tkinter as tk
+    from tkinter import ttk
+
+# Log view: only a window of lines lives in the Text widget; the full session is spilled to disk.
+LOG_VIEW_MAX_LINES = 5000
+LOG_VIEW_PAGE_LINES = 1000
+# Newest lines kept searchable; the session file still holds (and the view still pages in) everything older.
+LOG_INDEX_MAX_LINES = 1_000_000
+LOG_SESSIONS_KEPT = 20
+
+
+def repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+def is_windows() -> bool:
+    return platform.system().lower().startswith("win")
+
+
+def _capture(cmd: list[str]) -> str:
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    return (proc.stdout or "") + (proc.stderr or "")
+
+
+def read_env_port(root: Path) -> str:
+    env_file = root / ".env"
+    if not env_file.exists():
+        return "4000"
+
+    for line in env_file.read_text(encoding="utf-8").splitlines():
+        if line.strip().startswith("#"):
+            continue
+        if line.strip().startswith("PORT") and "=" in line:
+            return line.split("=", 1)[1].strip() or "4000"
+
+    return "4000"
+
+
+def read_env_value(root: Path, key: str, default: str = "") -> str:
+    env_file = root / ".env"
+    if not env_file.exists():
+        return default
+
+    for line in env_file.read_text(encoding="utf-8").splitlines():
+        if line.strip().startswith("#") or "=" not in line:
+            continue
+        k, v = line.split("=", 1)
+        if k.strip() == key:
+            return v.strip().strip('"').strip("'") or default
+
+    return default
+
+
+# Child output is read in large binary chunks; one log call (and one UI queue item) per chunk, not per line.
+STREAM_READ_SIZE = 64 * 1024
+
+
+class OutputDecoder:
+    # Incremental UTF-8 decoding of raw child output. CRLF becomes LF; a bare CR is kept as an in-place line update.
+    def __init__(self):
+        import codecs
+
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._cr = False
+
+    def decode(self, data: bytes, final: bool = False) -> str:
+        text = self._decoder.decode(data, final)
+        if self._cr:
+            text = "\r" + text
+            self._cr = False
+        # A CR at the end of a chunk may be the first half of a CRLF split across reads.
+        if text.endswith("\r") and not final:
+            text = text[:-1]
+            self._cr = True
+        return text.replace("\r\n", "\n")
+
+
+def read_output_chunks(stream):
+    # Each read returns whatever the pipe holds (up to STREAM_READ_SIZE) instead of waiting for a newline.
+    decoder = OutputDecoder()
+    read = getattr(stream, "read1", stream.read)
+    while True:
+        data = read(STREAM_READ_SIZE)
+        if not data:
+            break
+        text = decoder.decode(data)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def collapse_cr(text: str) -> str:
+    # Final state of each line after its in-place (\r) updates, for sinks that can't rewrite a line.
+    if "\r" not in text:
+        return text
+    return "\n".join(line.rsplit("\r", 1)[-1] for line in text.split("\n"))
+
+
+def new_group_kwargs() -> dict:
+    # Own process group/session so the whole tree (pnpm -> node -> workers) can be signalled at once.
+    if is_windows():
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def terminate_process_group(proc: subprocess.Popen, grace: float = 5.0) -> None:
+    # SIGTERM the child's whole group, escalate to SIGKILL for anything still alive after `grace`.
+    if is_windows():
+        if proc.poll() is not None:
+            return
+        subprocess.run(["taskkill", "/T", "/PID", str(proc.pid)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            proc.wait(timeout=grace)
+        except subprocess.TimeoutExpired:
+            subprocess.run(["taskkill", "/T", "/F", "/PID", str(proc.pid)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            proc.wait(timeout=grace)
+        return
+
+    import signal
+
+    # Children are started with start_new_session, so pgid == pid even after the leader exits.
+    pgid = proc.pid
+    try:
+        os.killpg(pgid, signal.SIGTERM)
+    except ProcessLookupError:
+        return
+
+    deadline = time.monotonic() + grace
+    while time.monotonic() < deadline:
+        proc.poll()
+        try:
+            os.killpg(pgid, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.05)
+    else:
+        try:
+            os.killpg(pgid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    try:
+        proc.wait(timeout=grace)
+    except subprocess.TimeoutExpired:
+        pass
+
+
+# Dev ports owned by Node tooling: Next/other frontends, API, Prisma Studio, Storybook, dynamodb-admin.
+PROJECT_DEV_PORTS = (3000, 4000, 5555, 6007, 8001)
+# Processes that hold a port on behalf of a container; killing them breaks Docker, not the app.
+PORT_FORWARDER_NAMES = {"docker-proxy", "com.docker.backend", "vpnkit", "wslrelay", "rootlessport", "rootlesskit"}
+# When the listener's parent is one of these, the whole wrapper chain goes (otherwise `tsx watch` respawns node).
+NODE_WRAPPER_NAMES = {"node", "pnpm", "npm", "npx", "tsx", "nodemon", "ts-node", "prisma"}
+
+
+@dataclass(frozen=True)
+class PortOwner:
+    port: int
+    pid: int
+    name: str
+
+
+def _linux_process_table() -> dict[int, tuple[int, str]]:
+    table: dict[int, tuple[int, str]] = {}
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/stat", "rb") as f:
+                raw = f.read()
+        except OSError:
+            continue
+        name = raw[raw.find(b"(") + 1 : raw.rfind(b")")].decode("utf-8", errors="replace")
+        fields = raw[raw.rfind(b")") + 2 :].split()
+        table[int(entry.name)] = (int(fields[1]), name)
+    return table
+
+
+def _ps_process_table() -> dict[int, tuple[int, str]]:
+    table: dict[int, tuple[int, str]] = {}
+    for line in _capture(["ps", "-A", "-o", "pid=,ppid=,comm="]).splitlines():
+        parts = line.split(None, 2)
+        if len(parts) == 3 and parts[0].isdigit() and parts[1].isdigit():
+            table[int(parts[0])] = (int(parts[1]), os.path.basename(parts[2].strip()))
+    return table
+
+
+def process_table() -> dict[int, tuple[int, str]]:
+    # pid -> (ppid, name)
+    if is_windows():
+        return {}
+    if Path("/proc/self/stat").exists():
+        return _linux_process_table()
+    return _ps_process_table()
+
+
+def _linux_port_owners(ports: set[int]) -> list[PortOwner]:
+    inodes: dict[str, int] = {}
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table, encoding="ascii") as f:
+                next(f, None)
+                for line in f:
+                    fields = line.split()
+                    # st 0A == TCP_LISTEN
+                    if len(fields) < 10 or fields[3] != "0A":
+                        continue
+                    port = int(fields[1].rsplit(":", 1)[1], 16)
+                    if port in ports:
+                        inodes[f"socket:[{fields[9]}]"] = port
+        except OSError:
+            continue
+    if not inodes:
+        return []
+
+    names = {pid: name for pid, (_ppid, name) in _linux_process_table().items()}
+    owners: list[PortOwner] = []
+    for pid in names:
+        try:
+            fds = os.listdir(f"/proc/{pid}/fd")
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                target = os.readlink(f"/proc/{pid}/fd/{fd}")
+            except OSError:
+                continue
+            port = inodes.get(target)
+            if port is not None:
+                owners.append(PortOwner(port, pid, names[pid]))
+    return owners
+
+
+def _windows_port_owners(ports: set[int]) -> list[PortOwner]:
+    names: dict[int, str] = {}
+    for line in _capture(["tasklist", "/FO", "CSV", "/NH"]).splitlines():
+        parts = [p.strip('"') for p in line.split('","')]
+        if len(parts) >= 2 and parts[1].strip('"').isdigit():
+            names[int(parts[1].strip('"'))] = parts[0].lower().removesuffix(".exe")
+
+    owners: set[PortOwner] = set()
+    for line in _capture(["netstat", "-ano", "-p", "TCP"]).splitlines() + _capture(["netstat", "-ano", "-p", "TCPv6"]).splitlines():
+        parts = line.split()
+        # Foreign address ":0" marks a listener regardless of the OS language used for the state column.
+        if len(parts) < 5 or parts[0] != "TCP" or not parts[2].endswith(":0") or not parts[-1].isdigit():
+            continue
+        port_str = parts[1].rsplit(":", 1)[-1]
+        if port_str.isdigit() and int(port_str) in ports:
+            pid = int(parts[-1])
+            owners.add(PortOwner(int(port_str), pid, names.get(pid, "?")))
+    return sorted(owners, key=lambda o: (o.port, o.pid))
+
+
+def _lsof_port_owners(ports: set[int]) -> list[PortOwner]:
+    if not shutil.which("lsof"):
+        return []
+    owners: set[PortOwner] = set()
+    pid, name = 0, "?"
+    for line in _capture(["lsof", "-nP", "-iTCP", "-sTCP:LISTEN", "-Fpcn"]).splitlines():
+        if line.startswith("p"):
+            pid = int(line[1:])
+        elif line.startswith("c"):
+            name = line[1:]
+        elif line.startswith("n"):
+            port_str = line.rsplit(":", 1)[-1]
+            if port_str.isdigit() and int(port_str) in ports:
+                owners.add(PortOwner(int(port_str), pid, name))
+    return sorted(owners, key=lambda o: (o.port, o.pid))
+
+
+def listening_port_owners(ports: tuple[int, ...] | list[int]) -> list[PortOwner]:
+    wanted = set(ports)
+    if is_windows():
+        return _windows_port_owners(wanted)
+    if Path("/proc/net/tcp").exists():
+        return _linux_port_owners(wanted)
+    return _lsof_port_owners(wanted)
+
+
+def _tree_root(pid: int, table: dict[int, tuple[int, str]], protected: set[int]) -> int:
+    root = pid
+    while True:
+        ppid = table.get(root, (0, ""))[0]
+        if ppid <= 1 or ppid in protected or table.get(ppid, (0, ""))[1] not in NODE_WRAPPER_NAMES:
+            return root
+        root = ppid
+
+
+def _descendants(roots: set[int], table: dict[int, tuple[int, str]]) -> set[int]:
+    children: dict[int, list[int]] = {}
+    for pid, (ppid, _name) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    out: set[int] = set()
+    stack = list(roots)
+    while stack:
+        pid = stack.pop()
+        if pid in out:
+            continue
+        out.add(pid)
+        stack.extend(children.get(pid, ()))
+    return out
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    try:
+        # A zombie no longer holds any port; don't wait for its parent to reap it.
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            raw = f.read()
+        return raw[raw.rfind(b")") + 2 : raw.rfind(b")") + 3] != b"Z"
+    except OSError:
+        return True
+
+
+def free_ports(ports: tuple[int, ...] | list[int], log: callable, grace: float = 3.0) -> list[PortOwner]:
+    # Kills only the process trees listening on `ports` (TERM, then KILL after `grace`). Returns what is still held.
+    started = time.monotonic()
+    owners = [o for o in listening_port_owners(ports) if o.name.lower() not in PORT_FORWARDER_NAMES]
+    if not owners:
+        log(f"✅ Nenhum processo escutando em {', '.join(map(str, ports))}\n")
+        return []
+
+    if is_windows():
+        for o in owners:
+            log(f"Porta {o.port}: pid {o.pid} ({o.name})\n")
+        pids = sorted({o.pid for o in owners})
+        for force in (False, True):
+            for pid in pids:
+                cmd = ["taskkill", "/T", *(["/F"] if force else []), "/PID", str(pid)]
+                subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            deadline = time.monotonic() + grace
+            while time.monotonic() < deadline and listening_port_owners(ports):
+                time.sleep(0.1)
+            if not force and not [o for o in listening_port_owners(ports) if o.pid in pids]:
+                break
+    else:
+        import signal
+
+        table = process_table()
+        # Never take down the launcher itself or anything above it.
+        protected = {os.getpid()}
+        pid = os.getppid()
+        while pid > 1 and pid not in protected:
+            protected.add(pid)
+            pid = table.get(pid, (0, ""))[0]
+
+        roots: set[int] = set()
+        for o in owners:
+            if o.pid in protected:
+                log(f"⚠️  Porta {o.port}: pid {o.pid} ({o.name}) é o próprio launcher; ignorado\n")
+                continue
+            root = _tree_root(o.pid, table, protected)
+            roots.add(root)
+            via = f" via {root} ({table.get(root, (0, '?'))[1]})" if root != o.pid else ""
+            log(f"Porta {o.port}: pid {o.pid} ({o.name}){via}\n")
+
+        victims = _descendants(roots, table) - protected
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            for victim in victims:
+                try:
+                    os.kill(victim, sig)
+                except (ProcessLookupError, PermissionError):
+                    pass
+            deadline = time.monotonic() + grace
+            while time.monotonic() < deadline and any(_pid_alive(v) for v in victims):
+                time.sleep(0.05)
+            victims = {v for v in victims if _pid_alive(v)}
+            if not victims:
+                break
+            if sig == signal.SIGTERM:
+                log(f"Escalando para SIGKILL: {', '.join(map(str, sorted(victims)))}\n")
+
+    remaining = [o for o in listening_port_owners(ports) if o.name.lower() not in PORT_FORWARDER_NAMES]
+    freed = sorted({o.port for o in owners} - {o.port for o in remaining})
+    elapsed = time.monotonic() - started
+    if freed:
+        log(f"✅ Portas liberadas: {', '.join(map(str, freed))} em {elapsed:.2f}s\n")
+    for o in remaining:
+        log(f"⚠️  Porta {o.port} ainda ocupada por pid {o.pid} ({o.name})\n")
+    return remaining
+
+
+def project_dev_ports(root: Path) -> tuple[int, ...]:
+    port = read_env_port(root)
+    extra = (int(port),) if port.isdigit() else ()
+    return tuple(sorted(set(PROJECT_DEV_PORTS) | set(extra)))
+
+
+def stop_process_tree(proc: subprocess.Popen, log: callable, grace: float = 5.0, ports: tuple[int, ...] = ()) -> list[PortOwner]:
+    # Stops a child started with new_group_kwargs() and everything below it, then checks that the ports
+    # the tree was listening on are free again. Returns the owners still holding them.
+    started = time.monotonic()
+    table = process_table()
+    # Snapshot the tree first: grandchildren that called setsid() (or were reparented) escape killpg.
+    tree = _descendants({proc.pid}, table) if table and proc.poll() is None else {proc.pid}
+    held = [o for o in listening_port_owners(ports) if o.pid in tree] if ports else []
+
+    terminate_process_group(proc, grace)
+
+    if not is_windows():
+        import signal
+
+        strays = {pid for pid in tree - {proc.pid} if _pid_alive(pid)}
+        if strays:
+            log(f"Processos fora do grupo: {', '.join(map(str, sorted(strays)))}\n")
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            if not strays:
+                break
+            for pid in strays:
+                try:
+                    os.kill(pid, sig)
+                except (ProcessLookupError, PermissionError):
+                    pass
+            deadline = time.monotonic() + grace
+            while time.monotonic() < deadline and any(_pid_alive(p) for p in strays):
+                time.sleep(0.05)
+            strays = {p for p in strays if _pid_alive(p)}
+            if strays and sig == signal.SIGTERM:
+                log(f"Escalando para SIGKILL: {', '.join(map(str, sorted(strays)))}\n")
+
+    elapsed = time.monotonic() - started
+    log(f"Árvore de processos do pid {proc.pid} encerrada em {elapsed:.2f}s (exit_code={proc.poll()})\n")
+    if not held:
+        return []
+    ports_held = sorted({o.port for o in held})
+    remaining = [o for o in listening_port_owners(ports_held) if o.name.lower() not in PORT_FORWARDER_NAMES]
+    freed = sorted(set(ports_held) - {o.port for o in remaining})
+    if freed:
+        log(f"✅ Portas liberadas: {', '.join(map(str, freed))}\n")
+    for o in remaining:
+        log(f"⚠️  Porta {o.port} ainda ocupada por pid {o.pid} ({o.name})\n")
+    return remaining
+
+
+class PrefixedLog:
+    # Tags lines with `prefix` for a log shared by several sources. Only complete lines and \r-terminated
+    # progress frames are forwarded; an unfinished tail waits for its end, so sources never splice into
+    # each other's lines. Call flush() when the source is done.
+    def __init__(self, prefix: str, log: callable):
+        import re
+
+        self.prefix = prefix
+        self.log = log
+        self._split = re.compile(r"(?<=[\n\r])").split
+        self._lock = threading.Lock()
+        self._tail = ""
+
+    def __call__(self, text: str) -> None:
+        with self._lock:
+            pieces = self._split(self._tail + text)
+            self._tail = pieces.pop()
+            # A line that never ends (minified JSON, a hung prompt) still has to show up eventually.
+            if len(self._tail) > STREAM_READ_SIZE:
+                pieces.append(self._tail + "\n")
+                self._tail = ""
+            out = [self.prefix + piece for piece in pieces if piece != "\r"]
+            if out:
+                self.log("".join(out))
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._tail:
+                self.log(f"{self.prefix}{self._tail}\n")
+                self._tail = ""
+
+
+class SessionLog:
+    # Append-only session file with a sparse line index; reads go through an mmap of the file.
+    def __init__(self, path: Path, index_every: int = 1024):
+        from array import array
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.index_every = index_every
+        self._fh = open(path, "wb")
+        self._rfh = open(path, "rb")
+        self._map = None
+        self._map_size = 0
+        self.size = 0
+        self._complete_lines = 0
+        self._tail_partial = False
+        # Byte offset of every `index_every`-th line: 8 bytes per block instead of per line.
+        self._index = array("Q", [0])
+
+    @classmethod
+    def create(cls, directory: Path, prefix: str, keep: int = LOG_SESSIONS_KEPT) -> "SessionLog":
+        directory.mkdir(parents=True, exist_ok=True)
+        old = sorted(directory.glob(f"{prefix}-*.log"), key=lambda p: p.stat().st_mtime)
+        for stale in old[: max(0, len(old) - keep + 1)]:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+        return cls(directory / f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.log")
+
+    @property
+    def line_count(self) -> int:
+        return self._complete_lines + (1 if self._tail_partial else 0)
+
+    def append(self, text: str) -> None:
+        data = text.encode("utf-8", errors="replace")
+        if not data:
+            return
+        self._fh.write(data)
+
+        pos = data.find(b"\n")
+        while pos >= 0:
+            self._complete_lines += 1
+            if self._complete_lines % self.index_every == 0:
+                self._index.append(self.size + pos + 1)
+            pos = data.find(b"\n", pos + 1)
+
+        self.size += len(data)
+        self._tail_partial = not data.endswith(b"\n")
+
+    def _view(self):
+        import mmap
+
+        if self._map is None or self._map_size != self.size:
+            self._fh.flush()
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self.size == 0:
+                return b""
+            self._map = mmap.mmap(self._rfh.fileno(), 0, access=mmap.ACCESS_READ)
+            self._map_size = self.size
+        return self._map
+
+    def offset_of_line(self, line: int) -> int:
+        line = max(0, min(line, self._complete_lines))
+        block, skip = divmod(line, self.index_every)
+        offset = self._index[block]
+        if skip:
+            view = self._view()
+            for _ in range(skip):
+                offset = view.find(b"\n", offset) + 1
+        return offset
+
+    def read(self, offset: int, max_lines: int) -> tuple[str, int]:
+        view = self._view()
+        end = offset
+        for _ in range(max_lines):
+            nl = view.find(b"\n", end)
+            if nl < 0:
+                end = len(view)
+                break
+            end = nl + 1
+        return bytes(view[offset:end]).decode("utf-8", errors="replace"), end
+
+    def read_lines(self, start: int, count: int) -> str:
+        return self.read(self.offset_of_line(start), count)[0]
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._fh.close()
+        self._rfh.close()
+
+
+class LogIndex:
+    # Incremental index (source prefix, level, tokens -> line numbers) built off the UI thread as text arrives.
+    SOURCE_PATTERN = r"^\[([^\]\s]{1,40})\] "
+    TOKEN_PATTERN = r"[^\W_][\w-]{1,39}"
+    LEVEL_PATTERNS = (
+        ("error", r"(?i)\b(error|erro|failed|falhou|fatal|exception)\b|❌|✖"),
+        ("warn", r"(?i)\b(warn|warning|aviso)\b|⚠"),
+    )
+    MAIN_SOURCE = "(principal)"
+
+    def __init__(self):
+        import re
+        from array import array
+
+        self._array = array
+        self._source_re = re.compile(self.SOURCE_PATTERN)
+        self._token_re = re.compile(self.TOKEN_PATTERN)
+        self._level_res = [(name, re.compile(pattern)) for name, pattern in self.LEVEL_PATTERNS]
+        self._lock = threading.Lock()
+        self._queue: queue.Queue[str] = queue.Queue()
+        self._pending = b""
+        self._size = 0
+        # Line numbers are absolute; `offsets[i]` belongs to line `base + i`. Lines below `_floor` are dropped.
+        self.base = 0
+        self._floor = 0
+        self.offsets = array("Q")
+        self.sources: dict[str, array] = {}
+        self.levels: dict[str, array] = {}
+        self.tokens: dict[str, array] = {}
+        threading.Thread(target=self._run, name="log-index", daemon=True).start()
+
+    def feed(self, text: str) -> None:
+        self._queue.put(text)
+
+    def _run(self) -> None:
+        while True:
+            parts = [self._queue.get()]
+            try:
+                while len(parts) < 512:
+                    parts.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            self._index_bytes("".join(parts).encode("utf-8", errors="replace"))
+
+    def _posting(self, table: dict, key: str):
+        posting = table.get(key)
+        if posting is None:
+            posting = table[key] = self._array("I")
+        return posting
+
+    def _index_bytes(self, data: bytes) -> None:
+        # Offsets mirror SessionLog, which receives exactly the same text in the same order.
+        buf = self._pending + data
+        pos = self._size - len(self._pending)
+        lines = buf.split(b"\n")
+        self._pending = lines.pop()
+        self._size += len(data)
+
+        with self._lock:
+            for raw in lines:
+                line_no = self.base + len(self.offsets)
+                self.offsets.append(pos)
+                pos += len(raw) + 1
+
+                text = raw.decode("utf-8", errors="replace")
+                m = self._source_re.match(text)
+                self._posting(self.sources, m.group(1) if m else self.MAIN_SOURCE).append(line_no)
+                for name, level_re in self._level_res:
+                    if level_re.search(text):
+                        self._posting(self.levels, name).append(line_no)
+                        break
+                for token in {t.lower() for t in self._token_re.findall(text)}:
+                    if not token.isdigit():
+                        self._posting(self.tokens, token).append(line_no)
+
+            # Trim in batches (10% over the cap) so the array compaction cost is amortized.
+            if len(self.offsets) > LOG_INDEX_MAX_LINES + LOG_INDEX_MAX_LINES // 10:
+                self._floor = max(self._floor, self.base + len(self.offsets) - LOG_INDEX_MAX_LINES)
+            if self._floor > self.base:
+                self._trim_locked()
+
+    def trim(self, floor: int) -> None:
+        # Forget every line below `floor` (e.g. cleared from the view). Lines not indexed yet are dropped on arrival.
+        with self._lock:
+            self._floor = max(self._floor, floor)
+            self._trim_locked()
+
+    def _trim_locked(self) -> None:
+        import bisect
+
+        drop = min(self._floor, self.base + len(self.offsets)) - self.base
+        if drop <= 0:
+            return
+        del self.offsets[:drop]
+        self.base += drop
+        for table in (self.sources, self.levels, self.tokens):
+            for key in list(table):
+                posting = table[key]
+                cut = bisect.bisect_left(posting, self.base)
+                if cut == len(posting):
+                    del table[key]
+                elif cut:
+                    del posting[:cut]
+
+    @property
+    def line_count(self) -> int:
+        return len(self.offsets)
+
+    def source_names(self) -> list[str]:
+        with self._lock:
+            return sorted(self.sources)
+
+    def _token_lines(self, token: str) -> set[int]:
+        # Substring semantics, like search(): every indexed token containing it, the exact one included
+        # ("post" must also find "posts", "prisma" must find "prisma-studio"). Scans the vocabulary, not the log.
+        lines: set[int] = set()
+        for candidate, posting in self.tokens.items():
+            if token in candidate:
+                lines.update(posting)
+        return lines
+
+    def candidates(self, source: str | None = None, level: str | None = None, query: str = "") -> list[int]:
+        with self._lock:
+            sets: list[set[int]] = []
+            if source:
+                sets.append(set(self.sources.get(source, ())))
+            if level:
+                sets.append(set(self.levels.get(level, ())))
+            for token in {t.lower() for t in self._token_re.findall(query)}:
+                if not token.isdigit():
+                    sets.append(self._token_lines(token))
+            if not sets:
+                return list(range(self.base, self.base + len(self.offsets)))
+
+        sets.sort(key=len)
+        result = sets[0]
+        for other in sets[1:]:
+            result = result & other
+        return sorted(result)
+
+    def search(
+        self,
+        store: SessionLog,
+        source: str | None = None,
+        level: str | None = None,
+        query: str = "",
+        limit: int = 2000,
+    ) -> tuple[list[tuple[int, str]], bool]:
+        # Newest matches first; the query is re-checked as a substring on the candidate lines only.
+        needle = query.strip().lower()
+        matches: list[tuple[int, str]] = []
+        for line_no in reversed(self.candidates(source, level, query)):
+            with self._lock:
+                if line_no < self.base:
+                    continue
+                offset = self.offsets[line_no - self.base]
+            text = collapse_cr(store.read(offset, 1)[0].rstrip("\n"))
+            if needle and needle not in text.lower():
+                continue
+            matches.append((line_no, text))
+            if len(matches) >= limit:
+                return matches, True
+        return matches, False
+
+
+class VirtualLogView:
+    # Keeps at most `max_lines` in the Text widget and pages older/newer lines in from a SessionLog on scroll.
+    def __init__(
+        self,
+        text: tk.Text,
+        scrollbar: ttk.Scrollbar,
+        store: SessionLog,
+        max_lines: int = LOG_VIEW_MAX_LINES,
+        page_lines: int = LOG_VIEW_PAGE_LINES,
+        index: LogIndex | None = None,
+    ):
+        self.text = text
+        self.scrollbar = scrollbar
+        self.store = store
+        self.index = index
+        self.max_lines = max_lines
+        self.page_lines = page_lines
+        self.first_line = 0
+        self.floor_line = 0
+        self.end_offset = 0
+        self._paging = False
+        self._cr_pending = False
+        text.configure(yscrollcommand=self._on_yscroll)
+
+    def _widget_lines(self) -> int:
+        return int(self.text.index("end-1c").split(".")[0])
+
+    def _top_line(self) -> int:
+        return int(self.text.index("@0,0").split(".")[0])
+
+    def _edit(self, fn: callable, *args: str) -> None:
+        self.text.configure(state="normal")
+        fn(*args)
+        self.text.configure(state="disabled")
+
+    def _insert_tail(self, text: str) -> None:
+        # A bare \r goes back to the start of the last line, like a terminal redrawing a progress bar:
+        # the line stays visible until something other than \n arrives to replace it.
+        for i, piece in enumerate(text.split("\r")):
+            if i:
+                self._cr_pending = True
+            if not piece:
+                continue
+            if self._cr_pending and not piece.startswith("\n"):
+                self.text.delete("end-1c linestart", "end-1c")
+            self._cr_pending = False
+            self.text.insert("end", piece)
+
+    def append(self, text: str) -> None:
+        # Only follow the tail if the user hasn't scrolled up to read something.
+        at_tail = self.end_offset >= self.store.size and self.text.yview()[1] >= 0.999
+        self.store.append(text)
+        if self.index is not None:
+            self.index.feed(text)
+        if not at_tail:
+            return
+        self._edit(self._insert_tail, text)
+        self.end_offset = self.store.size
+        self._trim_head()
+        self.text.see("end")
+
+    def clear(self) -> None:
+        self._edit(self.text.delete, "1.0", "end")
+        self.first_line = self.floor_line = self.store.line_count
+        self.end_offset = self.store.size
+        self._cr_pending = False
+        if self.index is not None:
+            self.index.trim(self.floor_line)
+
+    def _trim_head(self) -> int:
+        excess = self._widget_lines() - self.max_lines
+        if excess <= 0:
+            return 0
+        self._edit(self.text.delete, "1.0", f"{excess + 1}.0")
+        self.first_line += excess
+        return excess
+
+    def _on_yscroll(self, first: str, last: str) -> None:
+        self.scrollbar.set(first, last)
+        if self._paging:
+            return
+        if float(first) <= 0.0 and self.first_line > self.floor_line:
+            self._paging = True
+            self.text.after_idle(self._page_older)
+        elif float(last) >= 1.0 and self.end_offset < self.store.size:
+            self._paging = True
+            self.text.after_idle(self._page_newer)
+
+    def _page_older(self) -> None:
+        try:
+            n = min(self.page_lines, self.first_line - self.floor_line)
+            if n <= 0:
+                return
+            top = self._top_line()
+            self._edit(self.text.insert, "1.0", collapse_cr(self.store.read_lines(self.first_line - n, n)))
+            self.first_line -= n
+            if self._widget_lines() > self.max_lines:
+                self._edit(self.text.delete, f"{self.max_lines + 1}.0", "end")
+                self.end_offset = self.store.offset_of_line(self.first_line + self.max_lines)
+            self.text.yview(f"{top + n}.0")
+        finally:
+            self._paging = False
+
+    def _page_newer(self) -> None:
+        try:
+            top = self._top_line()
+            chunk, self.end_offset = self.store.read(self.end_offset, self.page_lines)
+            self._edit(self._insert_tail, chunk)
+            removed = self._trim_head()
+            self.text.yview(f"{max(1, top - removed)}.0")
+        finally:
+            self._paging = False
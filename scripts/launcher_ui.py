@@ -1,18 +1,57 @@
-import argparse
+from __future__ import annotations
+
 import os
-import platform
 import queue
 import shutil
 import subprocess
 import sys
 import threading
 import time
-import tkinter as tk
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
-from tkinter import messagebox, simpledialog, ttk
-from urllib.error import URLError
-from urllib.request import Request, urlopen
+
+from launcher_common import (
+    LogIndex,
+    PrefixedLog,
+    SessionLog,
+    VirtualLogView,
+    collapse_cr,
+    free_ports,
+    is_windows,
+    listening_port_owners,
+    new_group_kwargs,
+    project_dev_ports,
+    read_env_port,
+    read_env_value,
+    read_output_chunks,
+    repo_root,
+    terminate_process_group,
+)
+
+# Tk is only needed by the GUI; headless runs (--action, --self-check) never load it. See _load_tk().
+tk = ttk = messagebox = simpledialog = None
+
+
+# Log rendering: one Text.insert per tick, bounded by time and size so floods can't starve the Tk loop.
+LOG_POLL_MS = 50
+LOG_FRAME_BUDGET_S = 0.008
+LOG_MAX_CHARS_PER_TICK = 256 * 1024
+
+PROCESS_PANEL_REFRESH_MS = 1000
+
+# Phase timing history: each flow's phases are compared with the median of its last N successful runs.
+PHASE_HISTORY_RUNS = 10
+PHASE_REGRESSION_PCT = 25.0
+# Ignore swings below this; sub-second steps are mostly noise.
+PHASE_REGRESSION_MIN_S = 0.5
+
+# Chrome trace files (chrome://tracing, ui.perfetto.dev) written per action run.
+TRACES_KEPT = 20
+
+# Container telemetry: samples kept per metric and container (Docker streams stats at ~1 Hz).
+STATS_WINDOW = 300
+STATS_SPARK_WIDTH = 24
 
 
 @dataclass(frozen=True)
@@ -23,12 +62,25 @@ class RunnerConfig:
     seed_mongodb: bool
     create_dynamodb_tables: bool
     seed_dynamodb: bool
+    force_prisma: bool = False
 
 
 class CommandError(RuntimeError):
     pass
 
 
+def _load_tk() -> None:
+    global tk, ttk, messagebox, simpledialog
+    if tk is not None:
+        return
+    import tkinter
+    from tkinter import messagebox as _messagebox
+    from tkinter import simpledialog as _simpledialog
+    from tkinter import ttk as _ttk
+
+    tk, ttk, messagebox, simpledialog = tkinter, _ttk, _messagebox, _simpledialog
+
+
 @dataclass(frozen=True)
 class ActionDef:
     key: str
@@ -41,12 +93,96 @@ class ActionDef:
     destructive: bool = False
 
 
-def repo_root() -> Path:
-    return Path(__file__).resolve().parents[1]
-
-
-def is_windows() -> bool:
-    return platform.system().lower().startswith("win")
+@dataclass(frozen=True)
+class ProbeResult:
+    ok: bool
+    detail: str = ""
+
+
+class TraceRecorder:
+    # Collects Chrome Trace Event "complete" spans; each track (step, background process, thread) gets its own tid.
+    def __init__(self, name: str):
+        self.name = name
+        self.t0 = time.perf_counter()
+        self.events: list[dict] = []
+        self._tracks: dict[str, int] = {}
+        self._open: dict[int, dict] = {}
+        self._next_token = 0
+        self._lock = threading.Lock()
+
+    def _now_us(self) -> float:
+        return round((time.perf_counter() - self.t0) * 1e6, 1)
+
+    def _tid(self, track: str) -> int:
+        tid = self._tracks.get(track)
+        if tid is None:
+            tid = self._tracks[track] = len(self._tracks) + 1
+        return tid
+
+    def begin(self, name: str, cat: str, track: str, **args) -> int:
+        with self._lock:
+            self._next_token += 1
+            self._open[self._next_token] = {"name": name, "cat": cat, "ph": "X", "ts": self._now_us(), "pid": 1, "tid": self._tid(track), "args": args}
+            return self._next_token
+
+    def end(self, token: int, **args) -> None:
+        with self._lock:
+            event = self._open.pop(token, None)
+            if event is not None:
+                event["dur"] = self._now_us() - event["ts"]
+                event["args"].update(args)
+                self.events.append(event)
+
+    def instant(self, name: str, cat: str, track: str, **args) -> None:
+        with self._lock:
+            self.events.append({"name": name, "cat": cat, "ph": "i", "s": "t", "ts": self._now_us(), "pid": 1, "tid": self._tid(track), "args": args})
+
+    def export(self, path: Path) -> Path:
+        import json
+
+        with self._lock:
+            now = self._now_us()
+            # Still running (supervised processes, usually): close them at export time.
+            still_open = [{**e, "dur": now - e["ts"], "args": {**e["args"], "running": True}} for e in self._open.values()]
+            meta = [{"name": "process_name", "ph": "M", "pid": 1, "tid": 0, "args": {"name": f"launcher: {self.name}"}}]
+            meta += [
+                {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": track}}
+                for track, tid in self._tracks.items()
+            ]
+            meta += [{"name": "thread_sort_index", "ph": "M", "pid": 1, "tid": tid, "args": {"sort_index": tid}} for tid in self._tracks.values()]
+            events = meta + sorted(self.events + still_open, key=lambda e: e["ts"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8")
+        return path
+
+
+_active_trace: TraceRecorder | None = None
+_trace_local = threading.local()
+
+
+def _current_track() -> str:
+    return getattr(_trace_local, "track", None) or threading.current_thread().name
+
+
+class trace_span:
+    # `with trace_span(...)`: no-op unless an action run is being traced.
+    def __init__(self, name: str, cat: str, track: str | None = None, **args):
+        self.recorder = _active_trace
+        self.name, self.cat, self.track, self.args = name, cat, track, args
+        self.token = 0
+
+    def __enter__(self) -> "trace_span":
+        if self.recorder is not None:
+            self.token = self.recorder.begin(self.name, self.cat, self.track or _current_track(), **self.args)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.recorder is not None:
+            # args may have been filled in while the span was open (exit codes, counts).
+            extra = dict(self.args)
+            if exc is not None:
+                extra["error"] = str(exc)
+            self.recorder.end(self.token, **extra)
 
 
 def which_any(candidates: list[str]) -> str | None:
@@ -82,28 +218,33 @@ def run_stream(
     check: bool = True,
 ) -> int:
     log(f"$ {' '.join(cmd)}\n")
-    proc = subprocess.Popen(
-        cmd,
-        cwd=str(cwd),
-        env=env,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
-        universal_newlines=True,
-    )
+    with trace_span(" ".join(cmd[:3]), "subprocess", cmd=" ".join(cmd)) as span:
+        proc = subprocess.Popen(
+            cmd,
+            cwd=str(cwd),
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
 
-    assert proc.stdout is not None
-    for line in proc.stdout:
-        log(line)
+        assert proc.stdout is not None
+        for chunk in read_output_chunks(proc.stdout):
+            log(chunk)
 
-    code = proc.wait()
+        code = proc.wait()
+        span.args["exit_code"] = code
     if check and code != 0:
         raise CommandError(f"Comando falhou (exit_code={code}): {' '.join(cmd)}")
     return code
 
 
-def spawn_background(cmd: list[str], cwd: Path, env: dict[str, str] | None, log: callable) -> subprocess.Popen[str]:
+def spawn_background(
+    cmd: list[str],
+    cwd: Path,
+    env: dict[str, str] | None,
+    log: callable,
+    new_group: bool = False,
+) -> subprocess.Popen:
     log(f"[bg] $ {' '.join(cmd)}\n")
     proc = subprocess.Popen(
         cmd,
@@ -111,21 +252,259 @@ def spawn_background(cmd: list[str], cwd: Path, env: dict[str, str] | None, log:
         env=env,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
-        universal_newlines=True,
+        **(new_group_kwargs() if new_group else {}),
     )
     return proc
 
 
-def _read_bg_output(proc: subprocess.Popen[str], prefix: str, log: callable) -> None:
+def _read_bg_output(proc: subprocess.Popen, prefix: str, log: callable) -> None:
     if proc.stdout is None:
         return
+    out = PrefixedLog(prefix, log)
     try:
-        for line in proc.stdout:
-            log(f"{prefix}{line}")
+        for chunk in read_output_chunks(proc.stdout):
+            out(chunk)
     except Exception as e:
         log(f"{prefix}[erro lendo stdout bg] {e}\n")
+    finally:
+        out.flush()
+
+
+def _process_group_usage() -> dict[int, tuple[float, int]]:
+    # pgid -> (cpu seconds, rss bytes) summed over every process in the group. Linux only (/proc).
+    if not Path("/proc/self/stat").exists():
+        return {}
+
+    ticks = os.sysconf("SC_CLK_TCK")
+    page = os.sysconf("SC_PAGE_SIZE")
+    usage: dict[int, tuple[float, int]] = {}
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/stat", "rb") as f:
+                raw = f.read()
+        except OSError:
+            continue
+        fields = raw[raw.rfind(b")") + 2 :].split()
+        pgid = int(fields[2])
+        cpu = (int(fields[11]) + int(fields[12])) / ticks
+        rss = int(fields[21]) * page
+        prev_cpu, prev_rss = usage.get(pgid, (0.0, 0))
+        usage[pgid] = (prev_cpu + cpu, prev_rss + rss)
+    return usage
+
+
+@dataclass(frozen=True)
+class ProcessSpec:
+    name: str
+    cmd: list[str]
+    cwd: Path
+    env: dict[str, str] | None = None
+    ready_probe: Callable[[], ProbeResult] | None = None
+    # never | on-failure | always
+    restart: str = "on-failure"
+    max_restarts: int = 5
+
+
+class ManagedProcess:
+    STABLE_AFTER_S = 60.0
+    MAX_BACKOFF_S = 30.0
+
+    def __init__(self, spec: ProcessSpec, log: callable):
+        self.spec = spec
+        self.log = log
+        self.proc: subprocess.Popen | None = None
+        self.state = "starting"
+        self.restarts = 0
+        self.started_at = 0.0
+        self.exit_code: int | None = None
+        self.cpu_percent: float | None = None
+        self.rss_bytes: int | None = None
+        self._cpu_sample: tuple[float, float] | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Trace of the action that started it; spans keep landing there across restarts.
+        self.trace = _active_trace
+
+    @property
+    def pid(self) -> int | None:
+        return self.proc.pid if self.proc else None
+
+    @property
+    def alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def launch(self) -> None:
+        self._thread = threading.Thread(target=self._supervise, name=f"supervisor-{self.spec.name}", daemon=True)
+        self._thread.start()
+
+    def _supervise(self) -> None:
+        prefix = f"[{self.spec.name}] "
+        delay = 1.0
+        while True:
+            self.state = "starting"
+            self.exit_code = None
+            self._cpu_sample = None
+            try:
+                self.proc = spawn_background(self.spec.cmd, cwd=self.spec.cwd, env=self.spec.env, log=self.log, new_group=True)
+            except OSError as e:
+                self.state = "crashed"
+                self.log(f"{prefix}falha ao iniciar: {e}\n")
+                return
+
+            started = time.monotonic()
+            self.started_at = time.time()
+            track = f"bg {self.spec.name}"
+            span = self.trace.begin(self.spec.name, "background", track, pid=self.proc.pid, attempt=self.restarts) if self.trace else 0
+            if self.spec.ready_probe is not None:
+                threading.Thread(target=self._await_ready, args=(self.proc, started), daemon=True).start()
+            else:
+                self.state = "ready"
+
+            _read_bg_output(self.proc, prefix, self.log)
+            code = self.proc.wait()
+            self.exit_code = code
+            if self.trace:
+                self.trace.end(span, exit_code=code)
+            ran = time.monotonic() - started
+
+            if self._stop.is_set():
+                self.state = "stopped"
+                self.log(f"{prefix}parado (exit_code={code})\n")
+                return
+
+            self.state = "crashed" if code != 0 else "exited"
+            self.log(f"{prefix}processo terminou (exit_code={code}) após {ran:.1f}s\n")
+
+            policy = self.spec.restart
+            if policy == "never" or (policy == "on-failure" and code == 0):
+                return
+            if ran >= self.STABLE_AFTER_S:
+                # It was healthy for a while: treat this as a fresh failure, not part of a crash loop.
+                delay = 1.0
+                self.restarts = 0
+            if self.restarts >= self.spec.max_restarts:
+                self.log(f"{prefix}desistindo após {self.restarts} reinícios\n")
+                return
+
+            self.restarts += 1
+            self.state = "backoff"
+            self.log(f"{prefix}reiniciando em {delay:.0f}s (tentativa {self.restarts}/{self.spec.max_restarts})\n")
+            if self._stop.wait(delay):
+                self.state = "stopped"
+                return
+            delay = min(delay * 2, self.MAX_BACKOFF_S)
+
+    def _await_ready(self, proc: subprocess.Popen, started: float) -> None:
+        delay = 0.2
+        while proc.poll() is None and not self._stop.is_set():
+            try:
+                ok = self.spec.ready_probe().ok
+            except Exception:
+                ok = False
+            if ok:
+                if self.proc is proc and self.state == "starting":
+                    self.state = "ready"
+                    self.log(f"[{self.spec.name}] pronto em {time.monotonic() - started:.1f}s\n")
+                    if self.trace:
+                        self.trace.instant("pronto", "background", f"bg {self.spec.name}", after_s=round(time.monotonic() - started, 3))
+                return
+            time.sleep(delay)
+            delay = min(delay * 2, 2.0)
+
+    def stop(self, grace: float = 5.0) -> None:
+        self._stop.set()
+        if self.proc is not None:
+            terminate_process_group(self.proc, grace=grace)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=grace)
+
+    def sample_usage(self, usage: dict[int, tuple[float, int]]) -> None:
+        pid = self.pid
+        if pid is None or self.proc.poll() is not None or pid not in usage:
+            self.cpu_percent = None
+            self.rss_bytes = None
+            return
+        cpu, rss = usage[pid]
+        now = time.monotonic()
+        if self._cpu_sample is not None and now > self._cpu_sample[0]:
+            self.cpu_percent = max(0.0, (cpu - self._cpu_sample[1]) / (now - self._cpu_sample[0]) * 100)
+        self._cpu_sample = (now, cpu)
+        self.rss_bytes = rss
+
+
+class ProcessSupervisor:
+    def __init__(self):
+        import atexit
+
+        self._procs: dict[str, ManagedProcess] = {}
+        self._lock = threading.Lock()
+        atexit.register(self.stop_all)
+
+    def start(self, spec: ProcessSpec, log: callable) -> ManagedProcess:
+        with self._lock:
+            previous = self._procs.get(spec.name)
+        if previous is not None and previous.alive:
+            log(f"[{spec.name}] já supervisionado; reiniciando\n")
+            previous.stop()
+
+        managed = ManagedProcess(spec, log)
+        with self._lock:
+            self._procs[spec.name] = managed
+        managed.launch()
+        return managed
+
+    def get(self, name: str) -> ManagedProcess | None:
+        with self._lock:
+            return self._procs.get(name)
+
+    def processes(self) -> list[ManagedProcess]:
+        with self._lock:
+            return list(self._procs.values())
+
+    def stop(self, name: str) -> None:
+        managed = self.get(name)
+        if managed is not None:
+            managed.stop()
+
+    def restart(self, name: str) -> None:
+        managed = self.get(name)
+        if managed is not None:
+            self.start(managed.spec, managed.log)
+
+    def stop_all(self, log: Callable[[str], None] | None = None) -> None:
+        alive = [m for m in self.processes() if m.alive]
+        if alive and log:
+            log(f"Parando processos supervisionados: {', '.join(m.spec.name for m in alive)}\n")
+        threads = [threading.Thread(target=m.stop, daemon=True) for m in alive]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=15)
+
+    def any_alive(self) -> bool:
+        return any(m.alive for m in self.processes())
+
+    def sample(self) -> list[ManagedProcess]:
+        procs = self.processes()
+        if procs:
+            usage = _process_group_usage()
+            for m in procs:
+                m.sample_usage(usage)
+        return procs
+
+
+_supervisor: ProcessSupervisor | None = None
+_supervisor_lock = threading.Lock()
+
+
+def get_supervisor() -> ProcessSupervisor:
+    global _supervisor
+    with _supervisor_lock:
+        if _supervisor is None:
+            _supervisor = ProcessSupervisor()
+        return _supervisor
 
 
 def ensure_env_file(root: Path, log: callable) -> None:
@@ -171,28 +550,10 @@ def update_env_value(root: Path, key: str, value: str, log: callable) -> None:
     log(f".env atualizado: {key}={value}\n")
 
 
-def read_env_port(root: Path) -> str:
-    env_file = root / ".env"
-    if not env_file.exists():
-        return "4000"
-
-    for line in env_file.read_text(encoding="utf-8").splitlines():
-        if line.strip().startswith("#"):
-            continue
-        if line.strip().startswith("PORT") and "=" in line:
-            return line.split("=", 1)[1].strip() or "4000"
-
-    return "4000"
-
-
 def kill_node_processes(log: callable) -> None:
-    if is_windows():
-        # No psutil dependency.
-        subprocess.run(["taskkill", "/F", "/IM", "node.exe"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        log("Processos node.exe finalizados (se existiam).\n")
-    else:
-        subprocess.run(["pkill", "-f", "node"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        log("Processos node finalizados (se existiam).\n")
+    # Stop our own children first so the supervisor doesn't treat the kill as a crash and restart them.
+    get_supervisor().stop_all(log)
+    free_ports(project_dev_ports(repo_root()), log)
 
 
 def docker_up(services: list[str], root: Path, log: callable) -> None:
@@ -209,6 +570,615 @@ def run_package_script(script_name: str, log: callable, extra_args: list[str] |
     run_stream(cmd, cwd=root, env=None, log=log, check=check)
 
 
+PRISMA_SCHEMA_RELATIVE = "src/database/mongodb/prisma/schema.prisma"
+
+_step_cache_lock = threading.Lock()
+
+
+def _step_cache_file(root: Path) -> Path:
+    # Lives next to the generated client, so wiping node_modules also invalidates it.
+    return root / "node_modules" / ".cache" / "launcher-ui" / "step-fingerprints.json"
+
+
+def _sha256_text(text: str) -> str:
+    import hashlib
+
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _sha256_file(path: Path) -> str:
+    import hashlib
+
+    if not path.exists():
+        return "missing"
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def prisma_locked_version(root: Path) -> str:
+    import re
+
+    pnpm_lock = root / "pnpm-lock.yaml"
+    if pnpm_lock.exists():
+        m = re.search(r"^  '?prisma@([0-9][^:'(]*)", pnpm_lock.read_text(encoding="utf-8", errors="replace"), re.MULTILINE)
+        if m:
+            return m.group(1)
+
+    npm_lock = root / "package-lock.json"
+    if npm_lock.exists():
+        import json
+
+        try:
+            data = json.loads(npm_lock.read_text(encoding="utf-8"))
+            return data.get("packages", {}).get("node_modules/prisma", {}).get("version", "unknown")
+        except ValueError:
+            pass
+
+    return "unknown"
+
+
+def run_cached_step(
+    name: str,
+    inputs: dict[str, str],
+    run: callable,
+    log: callable,
+    root: Path,
+    force: bool = False,
+    outputs: tuple[Path, ...] = (),
+) -> bool:
+    # Runs `run(log)` only when the hashed inputs differ from the last successful run.
+    # Returns True when the step actually ran.
+    import json
+
+    cache_file = _step_cache_file(root)
+    hashed = {k: _sha256_text(v) for k, v in inputs.items()}
+
+    with _step_cache_lock:
+        try:
+            cache = json.loads(cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            cache = {}
+    previous = cache.get(name)
+
+    if force:
+        reason = "forçado"
+    elif previous is None:
+        reason = "sem execução anterior registrada"
+    elif previous != hashed:
+        changed = sorted(k for k in hashed.keys() | previous.keys() if hashed.get(k) != previous.get(k))
+        reason = f"mudou: {', '.join(changed)}"
+    elif any(not p.exists() for p in outputs):
+        reason = "artefatos ausentes"
+    else:
+        log(f"⚡ cache HIT: {name} (entradas inalteradas, pulando)\n")
+        return False
+
+    log(f"cache MISS: {name} ({reason})\n")
+    run(log)
+
+    with _step_cache_lock:
+        try:
+            cache = json.loads(cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            cache = {}
+        cache[name] = hashed
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps(cache, indent=2, sort_keys=True), encoding="utf-8")
+    return True
+
+
+def _compose_container_id(service: str, root: Path) -> str:
+    try:
+        proc = subprocess.run([*docker_compose_base_cmd(), "ps", "-q", service], cwd=str(root), capture_output=True, text=True)
+    except (CommandError, OSError):
+        return ""
+    return proc.stdout.strip() if proc.returncode == 0 else ""
+
+
+def _prisma_inputs(root: Path) -> dict[str, str]:
+    return {
+        "schema": _sha256_file(root / PRISMA_SCHEMA_RELATIVE),
+        "prisma_version": prisma_locked_version(root),
+    }
+
+
+def prisma_generate_cached(pm: list[str], root: Path, log: callable, force: bool = False) -> None:
+    run_cached_step(
+        "prisma:generate",
+        _prisma_inputs(root),
+        lambda slog: run_stream([*pm, "run", "prisma:generate"], cwd=root, env=None, log=slog),
+        log,
+        root,
+        force=force,
+        outputs=(root / "node_modules" / ".prisma" / "client",),
+    )
+
+
+def prisma_push_cached(pm: list[str], root: Path, log: callable, force: bool = False) -> None:
+    inputs = _prisma_inputs(root)
+    inputs["database_url"] = read_env_value(root, "DATABASE_URL")
+    # A recreated container may come with a fresh volume, so its id is part of the key.
+    inputs["mongodb_container"] = _compose_container_id("mongodb", root)
+    run_cached_step(
+        "prisma:push",
+        inputs,
+        lambda slog: run_stream([*pm, "run", "prisma:push"], cwd=root, env=None, log=slog),
+        log,
+        root,
+        force=force,
+    )
+
+
+SNAPSHOTS_KEPT = 3
+MONGO_SEED_RELATIVE = "src/database/mongodb/prisma/mongodb.seed.ts"
+
+
+def _snapshot_dir(root: Path) -> Path:
+    return root / "logs" / "launcher" / "snapshots"
+
+
+def mongo_snapshot_key(root: Path) -> str:
+    import json
+
+    try:
+        seed_script = json.loads((root / "package.json").read_text(encoding="utf-8")).get("scripts", {}).get("seed", "")
+    except (OSError, ValueError):
+        seed_script = ""
+    inputs = {
+        **_prisma_inputs(root),
+        "seed_script": seed_script,
+        "seed": _sha256_file(root / MONGO_SEED_RELATIVE),
+        "database_url": read_env_value(root, "DATABASE_URL"),
+    }
+    return _sha256_text(json.dumps(inputs, sort_keys=True))[:16]
+
+
+def _mongo_container_uri(root: Path) -> tuple[str, str]:
+    # DATABASE_URL points at the published port; inside the container the server is on 127.0.0.1.
+    from urllib.parse import urlparse
+
+    url = urlparse(read_env_value(root, "DATABASE_URL", "mongodb://localhost:27017/rainer-portfolio"))
+    auth = url.netloc.rsplit("@", 1)[0] + "@" if "@" in url.netloc else ""
+    db = url.path.lstrip("/") or "rainer-portfolio"
+    return f"mongodb://{auth}127.0.0.1:27017/{db}?directConnection=true", db
+
+
+def _redacted_cmd(cmd: list[str], uri: str) -> str:
+    import re
+
+    return " ".join(cmd).replace(uri, re.sub(r"//[^/@]+@", "//***@", uri))
+
+
+def _mongo_container(root: Path) -> str:
+    cid = _compose_container_id("mongodb", root)
+    if not cid:
+        raise CommandError("Container do MongoDB não está em execução (docker compose up -d mongodb).")
+    return cid
+
+
+def mongo_snapshot_create(root: Path, log: callable) -> Path:
+    # mongodump streams a gzipped archive to stdout, so nothing is staged inside the container.
+    uri, db = _mongo_container_uri(root)
+    directory = _snapshot_dir(root)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"mongodb-{mongo_snapshot_key(root)}.archive.gz"
+    tmp = path.with_name(path.name + ".part")
+    cmd = ["docker", "exec", _mongo_container(root), "mongodump", f"--uri={uri}", "--archive", "--gzip", "--quiet"]
+    log(f"$ {_redacted_cmd(cmd, uri)} > {path.name}\n")
+    started = time.monotonic()
+    with trace_span("mongodump", "subprocess", db=db), tmp.open("wb") as out:
+        proc = subprocess.run(cmd, stdout=out, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        tmp.unlink(missing_ok=True)
+        raise CommandError(f"mongodump falhou (exit_code={proc.returncode}): {proc.stderr.decode('utf-8', 'replace').strip()}")
+    tmp.replace(path)
+    log(f"✅ Snapshot MongoDB ({db}): {path.name} ({_format_bytes(path.stat().st_size)}) em {time.monotonic() - started:.1f}s\n")
+
+    old = sorted(directory.glob("mongodb-*.archive.gz"), key=lambda p: p.stat().st_mtime)
+    for stale in old[: max(0, len(old) - SNAPSHOTS_KEPT)]:
+        stale.unlink(missing_ok=True)
+    return path
+
+
+def mongo_snapshot_restore(root: Path, path: Path, log: callable) -> None:
+    uri, db = _mongo_container_uri(root)
+    cmd = ["docker", "exec", "-i", _mongo_container(root), "mongorestore", f"--uri={uri}", "--archive", "--gzip", "--drop", "--quiet"]
+    log(f"$ {_redacted_cmd(cmd, uri)} < {path.name}\n")
+    started = time.monotonic()
+    with trace_span("mongorestore", "subprocess", db=db), path.open("rb") as src:
+        proc = subprocess.run(cmd, stdin=src, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    if proc.returncode != 0:
+        raise CommandError(f"mongorestore falhou (exit_code={proc.returncode}): {proc.stdout.decode('utf-8', 'replace').strip()}")
+    log(f"✅ MongoDB restaurado de {path.name} em {time.monotonic() - started:.1f}s\n")
+
+
+def seed_mongodb_cached(root: Path, pm: list[str], log: callable, force: bool = False) -> None:
+    # Restores the snapshot for the current schema + seed; seeds from scratch (and snapshots) only when it changed.
+    path = _snapshot_dir(root) / f"mongodb-{mongo_snapshot_key(root)}.archive.gz"
+    if path.exists() and not force:
+        try:
+            mongo_snapshot_restore(root, path, log)
+            return
+        except CommandError as e:
+            log(f"⚠️  Restauração do snapshot falhou ({e}); executando seed completo.\n")
+            path.unlink(missing_ok=True)
+    else:
+        log("Sem snapshot para o schema/seed atuais; executando seed completo.\n")
+
+    run_stream([*pm, "run", "seed"], cwd=root, env=None, log=log)
+    try:
+        mongo_snapshot_create(root, log)
+    except CommandError as e:
+        log(f"⚠️  Snapshot MongoDB não criado: {e}\n")
+
+
+def mongo_snapshot(action: str, log: callable) -> None:
+    root = repo_root()
+    directory = _snapshot_dir(root)
+    current = directory / f"mongodb-{mongo_snapshot_key(root)}.archive.gz"
+    if action == "criar":
+        mongo_snapshot_create(root, log)
+    elif action == "restaurar":
+        if not current.exists():
+            raise CommandError("Nenhum snapshot para o schema/seed atuais; rode o seed ou 'criar' primeiro.")
+        mongo_snapshot_restore(root, current, log)
+    elif action == "descartar":
+        for path in directory.glob("mongodb-*.archive.gz"):
+            path.unlink()
+            log(f"Removido: {path.name}\n")
+    else:
+        snapshots = sorted(directory.glob("mongodb-*.archive.gz"), key=lambda p: p.stat().st_mtime, reverse=True)
+        if not snapshots:
+            log("Nenhum snapshot MongoDB.\n")
+        for path in snapshots:
+            mark = "✅ atual" if path == current else "obsoleto"
+            log(f"- {path.name}  {_format_bytes(path.stat().st_size)}  {mark}\n")
+
+
+def _start_supervised(
+    name: str,
+    cmd: list[str],
+    root: Path,
+    env: dict[str, str] | None,
+    port: int | None,
+    log: callable,
+) -> ManagedProcess:
+    probe = tcp_probe("127.0.0.1", port) if port else None
+    return get_supervisor().start(ProcessSpec(name, cmd, root, env=env, ready_probe=probe), log)
+
+
+@dataclass(frozen=True)
+class Step:
+    name: str
+    run: callable
+    deps: tuple[str, ...] = ()
+    # Optional steps are reported but don't fail the whole run.
+    optional: bool = False
+
+
+@dataclass
+class StepResult:
+    name: str
+    status: str = "pending"
+    started: float = 0.0
+    finished: float = 0.0
+    error: str = ""
+
+    @property
+    def duration(self) -> float:
+        return max(0.0, self.finished - self.started)
+
+
+def _topological_order(steps: list[Step]) -> list[str]:
+    by_name = {s.name: s for s in steps}
+    for s in steps:
+        for d in s.deps:
+            if d not in by_name:
+                raise CommandError(f"Passo '{s.name}' depende de '{d}', que não existe.")
+
+    indegree = {s.name: len(s.deps) for s in steps}
+    dependents: dict[str, list[str]] = {s.name: [] for s in steps}
+    for s in steps:
+        for d in s.deps:
+            dependents[d].append(s.name)
+
+    ready = [s.name for s in steps if indegree[s.name] == 0]
+    order: list[str] = []
+    while ready:
+        name = ready.pop(0)
+        order.append(name)
+        for child in dependents[name]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+
+    if len(order) != len(steps):
+        cyclic = sorted(n for n, deg in indegree.items() if deg > 0)
+        raise CommandError(f"Dependências cíclicas entre passos: {', '.join(cyclic)}")
+    return order
+
+
+def _critical_path(steps: list[Step], results: dict[str, StepResult]) -> list[str]:
+    by_name = {s.name: s for s in steps}
+    ran = [r for r in results.values() if r.status in ("ok", "failed")]
+    if not ran:
+        return []
+
+    current = max(ran, key=lambda r: r.finished).name
+    path = [current]
+    while True:
+        deps = [results[d] for d in by_name[current].deps if results[d].status in ("ok", "failed")]
+        if not deps:
+            break
+        current = max(deps, key=lambda r: r.finished).name
+        path.append(current)
+    return path[::-1]
+
+
+def _log_steps_summary(steps: list[Step], results: dict[str, StepResult], wall: float, log: callable) -> None:
+    log("\n=== Resumo dos passos ===\n")
+    width = max((len(s.name) for s in steps), default=0)
+    for name in _topological_order(steps):
+        r = results[name]
+        timing = f"{r.duration:7.2f}s  (início +{r.started:.2f}s)" if r.status in ("ok", "failed") else ""
+        log(f"  {name.ljust(width)}  {r.status:<7}  {timing}".rstrip() + "\n")
+
+    busy = sum(r.duration for r in results.values())
+    path = _critical_path(steps, results)
+    log(f"Tempo total: {wall:.2f}s | soma dos passos: {busy:.2f}s\n")
+    if path:
+        log(f"Caminho crítico ({results[path[-1]].finished:.2f}s): {' → '.join(path)}\n")
+
+
+def _emit_event(log: callable, kind: str, **fields) -> None:
+    # Structured sinks (headless NDJSON) expose .event(); plain log callables just get the text.
+    event = getattr(log, "event", None)
+    if event is not None:
+        event(kind, **fields)
+
+
+def run_steps(steps: list[Step], log: callable, max_workers: int = 4, history: str | None = None) -> dict[str, StepResult]:
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    _topological_order(steps)
+    by_name = {s.name: s for s in steps}
+    results = {s.name: StepResult(s.name) for s in steps}
+    pending = [s.name for s in steps]
+    running: dict = {}
+    t0 = time.monotonic()
+
+    def execute(step: Step) -> None:
+        res = results[step.name]
+        res.started = time.monotonic() - t0
+        log(f"▶  [{step.name}] iniciando\n")
+        _emit_event(log, "step_start", step=step.name)
+        # Each step gets its own trace track; its subprocesses and probe waits nest under it.
+        _trace_local.track = f"passo {step.name}"
+        try:
+            slog = PrefixedLog(f"[{step.name}] ", log)
+            try:
+                with trace_span(step.name, "step", deps=list(step.deps)):
+                    step.run(slog)
+            finally:
+                slog.flush()
+            res.status = "ok"
+        except Exception as e:
+            res.status = "failed"
+            res.error = str(e)
+        finally:
+            res.finished = time.monotonic() - t0
+            _trace_local.track = None
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="launcher-step") as pool:
+        while pending or running:
+            changed = True
+            while changed:
+                changed = False
+                for name in list(pending):
+                    step = by_name[name]
+                    broken = [d for d in step.deps if results[d].status in ("failed", "skipped")]
+                    if broken:
+                        results[name].status = "skipped"
+                        results[name].error = f"dependência não concluída: {', '.join(broken)}"
+                        log(f"⏭  [{name}] pulado ({results[name].error})\n")
+                        _emit_event(log, "step_end", step=name, status="skipped", error=results[name].error)
+                        pending.remove(name)
+                        changed = True
+                    elif all(results[d].status == "ok" for d in step.deps):
+                        results[name].status = "running"
+                        running[pool.submit(execute, step)] = name
+                        pending.remove(name)
+
+            if not running:
+                break
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                r = results[name]
+                if r.status == "ok":
+                    log(f"✔  [{name}] ok ({r.duration:.2f}s)\n")
+                else:
+                    log(f"✖  [{name}] falhou ({r.duration:.2f}s): {r.error}\n")
+                _emit_event(log, "step_end", step=name, status=r.status, duration=round(r.duration, 3), error=r.error)
+
+    wall = time.monotonic() - t0
+    _log_steps_summary(steps, results, wall, log)
+
+    failed = [s.name for s in steps if not s.optional and results[s.name].status in ("failed", "skipped")]
+    if history:
+        try:
+            report_phase_regressions(repo_root(), history, results, wall, log)
+            record_phase_run(repo_root(), history, results, wall, "failed" if failed else "ok")
+        except Exception as e:
+            log(f"⚠️  Histórico de tempos indisponível: {e}\n")
+    if failed:
+        raise CommandError(f"Passos não concluídos: {', '.join(failed)}")
+    return results
+
+
+def _phase_history_db(root: Path):
+    import sqlite3
+
+    path = root / "logs" / "launcher" / "phase-history.sqlite3"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(str(path), timeout=5.0)
+    db.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            flow TEXT NOT NULL,
+            started_at REAL NOT NULL,
+            wall REAL NOT NULL,
+            status TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS phases (
+            run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+            name TEXT NOT NULL,
+            duration REAL NOT NULL,
+            status TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS runs_flow ON runs(flow, id);
+        """
+    )
+    return db
+
+
+def record_phase_run(root: Path, flow: str, results: dict[str, StepResult], wall: float, status: str) -> None:
+    db = _phase_history_db(root)
+    try:
+        with db:
+            run_id = db.execute(
+                "INSERT INTO runs (flow, started_at, wall, status) VALUES (?, ?, ?, ?)", (flow, time.time() - wall, wall, status)
+            ).lastrowid
+            db.executemany(
+                "INSERT INTO phases (run_id, name, duration, status) VALUES (?, ?, ?, ?)",
+                [(run_id, r.name, r.duration, r.status) for r in results.values()],
+            )
+    finally:
+        db.close()
+
+
+def phase_baseline(root: Path, flow: str, last_n: int = PHASE_HISTORY_RUNS) -> tuple[int, dict[str, float]]:
+    # Median duration per phase over the last N successful runs of this flow.
+    from statistics import median
+
+    db = _phase_history_db(root)
+    try:
+        run_ids = [row[0] for row in db.execute("SELECT id FROM runs WHERE flow = ? AND status = 'ok' ORDER BY id DESC LIMIT ?", (flow, last_n))]
+        samples: dict[str, list[float]] = {"(total)": []}
+        if run_ids:
+            marks = ",".join("?" * len(run_ids))
+            for name, duration in db.execute(f"SELECT name, duration FROM phases WHERE status = 'ok' AND run_id IN ({marks})", run_ids):
+                samples.setdefault(name, []).append(duration)
+            samples["(total)"] = [row[0] for row in db.execute(f"SELECT wall FROM runs WHERE id IN ({marks})", run_ids)]
+    finally:
+        db.close()
+    return len(run_ids), {name: median(values) for name, values in samples.items() if values}
+
+
+def report_phase_regressions(
+    root: Path,
+    flow: str,
+    results: dict[str, StepResult],
+    wall: float,
+    log: callable,
+    last_n: int = PHASE_HISTORY_RUNS,
+    threshold_pct: float = PHASE_REGRESSION_PCT,
+) -> list[str]:
+    runs, baseline = phase_baseline(root, flow, last_n)
+    if not runs:
+        log("Histórico de tempos: primeira execução registrada para este fluxo.\n")
+        return []
+
+    current = {r.name: r.duration for r in results.values() if r.status == "ok"}
+    current["(total)"] = wall
+    width = max(len(name) for name in current)
+    log(f"\n=== Comparação com a mediana das últimas {runs} execuções ===\n")
+    regressions: list[str] = []
+    for name, duration in current.items():
+        base = baseline.get(name)
+        if base is None:
+            log(f"  {name.ljust(width)}  {duration:7.2f}s  (sem histórico)\n")
+            continue
+        delta = (duration - base) / base * 100 if base > 0 else 0.0
+        slower = delta > threshold_pct and duration - base > PHASE_REGRESSION_MIN_S
+        mark = "⚠️ " if slower else "  "
+        log(f"{mark}{name.ljust(width)}  {duration:7.2f}s  mediana {base:7.2f}s  {delta:+6.0f}%\n")
+        if slower:
+            regressions.append(name)
+            _emit_event(log, "phase_regression", phase=name, duration=round(duration, 3), median=round(base, 3), delta_pct=round(delta, 1))
+    if regressions:
+        log(f"⚠️  Mais de {threshold_pct:.0f}% mais lento: {', '.join(regressions)}\n")
+    return regressions
+
+
+def show_phase_history(flow: str, log: callable, last_n: int = PHASE_HISTORY_RUNS) -> None:
+    root = repo_root()
+    log(f"=== Histórico de tempos: {flow} (últimas {last_n}) ===\n")
+    db = _phase_history_db(root)
+    try:
+        runs = list(db.execute("SELECT id, started_at, wall, status FROM runs WHERE flow = ? ORDER BY id DESC LIMIT ?", (flow, last_n)))
+        phases: dict[int, dict[str, float]] = {}
+        for run_id, name, duration in db.execute(
+            "SELECT run_id, name, duration FROM phases WHERE run_id IN (SELECT id FROM runs WHERE flow = ? ORDER BY id DESC LIMIT ?)",
+            (flow, last_n),
+        ):
+            phases.setdefault(run_id, {})[name] = duration
+    finally:
+        db.close()
+    if not runs:
+        log("Nenhuma execução registrada ainda.\n")
+        return
+
+    names = sorted({name for by_name in phases.values() for name in by_name})
+    log("quando             status  total    " + "  ".join(n[:16].rjust(16) for n in names) + "\n")
+    for run_id, started_at, wall, status in runs:
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(started_at))
+        cells = "  ".join((f"{phases[run_id][n]:.2f}s" if n in phases.get(run_id, {}) else "-").rjust(16) for n in names)
+        log(f"{when}  {status:<6}  {wall:6.1f}s  {cells}\n")
+
+    _runs, baseline = phase_baseline(root, flow, last_n)
+    if baseline:
+        log("mediana (ok)             " + f"{baseline.get('(total)', 0):6.1f}s  " + "  ".join((f"{baseline[n]:.2f}s" if n in baseline else "-").rjust(16) for n in names) + "\n")
+
+
+def _dev_server_step(root: Path, pm: list[str], log: callable, deps: tuple[str, ...]) -> Step:
+    # Part of the DAG so the boot (spawn → port accepting) is timed like every other phase.
+    def run(slog: callable) -> None:
+        port = read_env_port(root)
+        _start_dev_server(root, pm, log)
+        if port.isdigit():
+            wait_ready("dev", tcp_probe("127.0.0.1", int(port)), slog, timeout=180)
+
+    return Step("dev:ready", run, deps, optional=True)
+
+
+def _pm_step(name: str, pm: list[str], root: Path, deps: tuple[str, ...] = (), optional: bool = False) -> Step:
+    return Step(name, lambda slog: run_stream([*pm, "run", name], cwd=root, env=None, log=slog), deps, optional)
+
+
+def _dynamodb_admin_step(root: Path, log: callable, deps: tuple[str, ...]) -> Step | None:
+    # The old script used: npx -y dynamodb-admin
+    if not shutil.which("npx"):
+        log("npx não encontrado; não foi possível abrir dynamodb-admin.\n")
+        return None
+
+    env = os.environ.copy()
+    env["DYNAMO_ENDPOINT"] = "http://localhost:8000"
+    return Step(
+        "dynamodb-admin",
+        lambda slog: _start_supervised("dynamodb-admin", ["npx", "-y", "dynamodb-admin"], root, env, 8001, log),
+        deps,
+        optional=True,
+    )
+
+
+def _start_dev_server(root: Path, pm: list[str], log: callable) -> None:
+    port = read_env_port(root)
+    log(f"Iniciando servidor de desenvolvimento (PORT={port})...\n")
+    _start_supervised("dev", [*pm, "run", "dev"], root, None, int(port) if port.isdigit() else None, log)
+
+
 def start_mongodb_environment(cfg: RunnerConfig, log: callable) -> None:
     root = repo_root()
 
@@ -218,34 +1188,37 @@ def start_mongodb_environment(cfg: RunnerConfig, log: callable) -> None:
 
     kill_node_processes(log)
 
-    docker_up(["mongodb"], root, log)
-    log("Aguardando Replica Set (30s)...\n")
-    time.sleep(30)
-
     pm = package_manager_cmd()
-    run_stream([*pm, "run", "prisma:generate"], cwd=root, env=None, log=log)
-    run_stream([*pm, "run", "prisma:push"], cwd=root, env=None, log=log)
+    steps = [
+        Step("mongodb:up", lambda slog: docker_up(["mongodb"], root, slog)),
+        Step("mongodb:ready", wait_mongodb_ready, ("mongodb:up",)),
+        Step("prisma:generate", lambda slog: prisma_generate_cached(pm, root, slog, force=cfg.force_prisma)),
+        Step(
+            "prisma:push",
+            lambda slog: prisma_push_cached(pm, root, slog, force=cfg.force_prisma),
+            ("mongodb:ready", "prisma:generate"),
+        ),
+    ]
 
     if cfg.seed_mongodb:
-        run_stream([*pm, "run", "seed"], cwd=root, env=None, log=log)
+        steps.append(Step("seed", lambda slog: seed_mongodb_cached(root, pm, slog, force=cfg.force_prisma), ("prisma:push",)))
     else:
         log("Seed MongoDB desativado (pelo UI).\n")
 
-    bg_procs: list[tuple[subprocess.Popen[str], str]] = []
-
     if cfg.open_prisma_studio:
-        p = spawn_background([*pm, "run", "prisma:studio"], cwd=root, env=None, log=log)
-        bg_procs.append((p, "[prisma-studio] "))
+        steps.append(
+            Step(
+                "prisma-studio",
+                lambda slog: _start_supervised("prisma-studio", [*pm, "run", "prisma:studio"], root, None, 5555, log),
+                ("prisma:push",),
+                optional=True,
+            )
+        )
 
     if cfg.start_dev_server:
-        port = read_env_port(root)
-        log(f"Iniciando servidor de desenvolvimento (PORT={port})...\n")
-        run_stream([*pm, "run", "dev"], cwd=root, env=None, log=log, check=False)
+        steps.append(_dev_server_step(root, pm, log, tuple(st.name for st in steps if not st.optional)))
 
-    # Keep background readers alive as long as main thread exists.
-    for proc, prefix in bg_procs:
-        t = threading.Thread(target=_read_bg_output, args=(proc, prefix, log), daemon=True)
-        t.start()
+    run_steps(steps, log, history="env_mongodb")
 
 
 def start_dynamodb_environment(cfg: RunnerConfig, log: callable) -> None:
@@ -257,42 +1230,32 @@ def start_dynamodb_environment(cfg: RunnerConfig, log: callable) -> None:
 
     kill_node_processes(log)
 
-    docker_up(["dynamodb-local"], root, log)
-    log("Aguardando DynamoDB estabilizar (5s)...\n")
-    time.sleep(5)
-
     pm = package_manager_cmd()
+    steps = [
+        Step("dynamodb:up", lambda slog: docker_up(["dynamodb"], root, slog)),
+        Step("dynamodb:ready", wait_dynamodb_ready, ("dynamodb:up",)),
+    ]
 
     if cfg.create_dynamodb_tables:
-        run_stream([*pm, "run", "dynamodb:create-tables"], cwd=root, env=None, log=log)
+        steps.append(Step("dynamodb:create-tables", lambda slog: ensure_dynamodb_tables(root, pm, slog), ("dynamodb:ready",)))
     else:
         log("Criação de tabelas DynamoDB desativada (pelo UI).\n")
 
     if cfg.seed_dynamodb:
-        run_stream([*pm, "run", "dynamodb:seed"], cwd=root, env=None, log=log)
+        seed_deps = ("dynamodb:create-tables",) if cfg.create_dynamodb_tables else ("dynamodb:ready",)
+        steps.append(Step("dynamodb:seed", lambda slog: seed_dynamodb(root, pm, slog), seed_deps))
     else:
         log("Seed DynamoDB desativado (pelo UI).\n")
 
-    bg_procs: list[tuple[subprocess.Popen[str], str]] = []
-
     if cfg.open_dynamodb_admin:
-        env = os.environ.copy()
-        env["DYNAMO_ENDPOINT"] = "http://localhost:8000"
-        # The old script used: npx -y dynamodb-admin
-        if not shutil.which("npx"):
-            log("npx não encontrado; não foi possível abrir dynamodb-admin.\n")
-        else:
-            p = spawn_background(["npx", "-y", "dynamodb-admin"], cwd=root, env=env, log=log)
-            bg_procs.append((p, "[dynamodb-admin] "))
+        admin = _dynamodb_admin_step(root, log, ("dynamodb:ready",))
+        if admin:
+            steps.append(admin)
 
     if cfg.start_dev_server:
-        port = read_env_port(root)
-        log(f"Iniciando servidor de desenvolvimento (PORT={port})...\n")
-        run_stream([*pm, "run", "dev"], cwd=root, env=None, log=log, check=False)
+        steps.append(_dev_server_step(root, pm, log, tuple(st.name for st in steps if not st.optional)))
 
-    for proc, prefix in bg_procs:
-        t = threading.Thread(target=_read_bg_output, args=(proc, prefix, log), daemon=True)
-        t.start()
+    run_steps(steps, log, history="env_dynamodb")
 
 
 def start_complete_environment(cfg: RunnerConfig, log: callable) -> None:
@@ -304,51 +1267,55 @@ def start_complete_environment(cfg: RunnerConfig, log: callable) -> None:
     # In complete mode, scripts don't enforce provider here; keep whatever .env says.
     kill_node_processes(log)
 
-    docker_up(["mongodb"], root, log)
-    log("Aguardando MongoDB Replica Set (15s)...\n")
-    time.sleep(15)
-
-    docker_up(["dynamodb-local"], root, log)
-    log("Aguardando DynamoDB estabilizar (5s)...\n")
-    time.sleep(5)
-
     pm = package_manager_cmd()
-    run_stream([*pm, "run", "prisma:generate"], cwd=root, env=None, log=log)
-    run_stream([*pm, "run", "prisma:push"], cwd=root, env=None, log=log)
+    # A single compose call boots both containers in parallel (and avoids racing on the network).
+    steps = [
+        Step("containers:up", lambda slog: docker_up(["mongodb", "dynamodb"], root, slog)),
+        Step("mongodb:ready", wait_mongodb_ready, ("containers:up",)),
+        Step("dynamodb:ready", wait_dynamodb_ready, ("containers:up",)),
+        Step("prisma:generate", lambda slog: prisma_generate_cached(pm, root, slog, force=cfg.force_prisma)),
+        Step(
+            "prisma:push",
+            lambda slog: prisma_push_cached(pm, root, slog, force=cfg.force_prisma),
+            ("mongodb:ready", "prisma:generate"),
+        ),
+    ]
 
     if cfg.seed_mongodb:
-        run_stream([*pm, "run", "seed"], cwd=root, env=None, log=log)
+        steps.append(Step("seed", lambda slog: seed_mongodb_cached(root, pm, slog, force=cfg.force_prisma), ("prisma:push",)))
     else:
         log("Seed MongoDB desativado (pelo UI).\n")
 
-    # DynamoDB tables are created in background in the original script.
-    bg_procs: list[tuple[subprocess.Popen[str], str]] = []
-
+    # Table creation used to run in background here, so it stays non-fatal.
     if cfg.create_dynamodb_tables:
-        p_tables = spawn_background([*pm, "run", "dynamodb:create-tables"], cwd=root, env=None, log=log)
-        bg_procs.append((p_tables, "[dynamodb:create-tables] "))
+        steps.append(
+            Step(
+                "dynamodb:create-tables",
+                lambda slog: ensure_dynamodb_tables(root, pm, slog),
+                ("dynamodb:ready",),
+                optional=True,
+            )
+        )
 
     if cfg.open_prisma_studio:
-        p = spawn_background([*pm, "run", "prisma:studio"], cwd=root, env=None, log=log)
-        bg_procs.append((p, "[prisma-studio] "))
+        steps.append(
+            Step(
+                "prisma-studio",
+                lambda slog: _start_supervised("prisma-studio", [*pm, "run", "prisma:studio"], root, None, 5555, log),
+                ("prisma:push",),
+                optional=True,
+            )
+        )
 
     if cfg.open_dynamodb_admin:
-        env = os.environ.copy()
-        env["DYNAMO_ENDPOINT"] = "http://localhost:8000"
-        if shutil.which("npx"):
-            p = spawn_background(["npx", "-y", "dynamodb-admin"], cwd=root, env=env, log=log)
-            bg_procs.append((p, "[dynamodb-admin] "))
-        else:
-            log("npx não encontrado; não foi possível abrir dynamodb-admin.\n")
+        admin = _dynamodb_admin_step(root, log, ("dynamodb:ready",))
+        if admin:
+            steps.append(admin)
 
     if cfg.start_dev_server:
-        port = read_env_port(root)
-        log(f"Iniciando servidor de desenvolvimento (PORT={port})...\n")
-        run_stream([*pm, "run", "dev"], cwd=root, env=None, log=log, check=False)
+        steps.append(_dev_server_step(root, pm, log, tuple(st.name for st in steps if not st.optional)))
 
-    for proc, prefix in bg_procs:
-        t = threading.Thread(target=_read_bg_output, args=(proc, prefix, log), daemon=True)
-        t.start()
+    run_steps(steps, log, history="env_complete")
 
 
 def start_dev_clean(cfg: RunnerConfig, log: callable) -> None:
@@ -363,17 +1330,15 @@ def start_dev_clean(cfg: RunnerConfig, log: callable) -> None:
     pm = package_manager_cmd()
 
     if cfg.open_prisma_studio:
-        p = spawn_background([*pm, "run", "prisma:studio"], cwd=root, env=None, log=log)
-        t = threading.Thread(target=_read_bg_output, args=(p, "[prisma-studio] ", log), daemon=True)
-        t.start()
+        _start_supervised("prisma-studio", [*pm, "run", "prisma:studio"], root, None, 5555, log)
 
     if cfg.start_dev_server:
-        log("Iniciando servidor de desenvolvimento (PORT=4000)...\n")
-        run_stream([*pm, "run", "dev"], cwd=root, env=None, log=log, check=False)
+        _start_dev_server(root, pm, log)
 
 
 def _capture(cmd: list[str], cwd: Path | None = None) -> str:
-    proc = subprocess.run(cmd, cwd=str(cwd) if cwd else None, capture_output=True, text=True)
+    with trace_span(" ".join(cmd[:3]), "subprocess", cmd=" ".join(cmd)):
+        proc = subprocess.run(cmd, cwd=str(cwd) if cwd else None, capture_output=True, text=True)
     return (proc.stdout or "") + (proc.stderr or "")
 
 
@@ -397,58 +1362,1809 @@ def _port_open(host: str, port: int, timeout: float = 0.3) -> bool:
 
 
 def _http_get(url: str, timeout: float = 3.0) -> str:
+    from urllib.request import Request, urlopen
+
     req = Request(url, headers={"User-Agent": "launcher-ui"})
     with urlopen(req, timeout=timeout) as resp:
         data = resp.read()
     return data.decode("utf-8", errors="replace")
 
 
+def wait_ready(
+    name: str,
+    probe: callable,
+    log: callable,
+    timeout: float = 60.0,
+    initial_delay: float = 0.1,
+    max_delay: float = 2.0,
+) -> float:
+    with trace_span(f"aguardar {name}", "probe", timeout=timeout):
+        return _wait_ready(name, probe, log, timeout, initial_delay, max_delay)
+
+
+def _wait_ready(name: str, probe: callable, log: callable, timeout: float, initial_delay: float, max_delay: float) -> float:
+    # Polls `probe` with exponential backoff until it reports ok or the deadline passes.
+    log(f"Aguardando {name} (até {timeout:.0f}s)...\n")
+    start = time.monotonic()
+    deadline = start + timeout
+    delay = initial_delay
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            result = probe()
+        except Exception as e:
+            result = ProbeResult(False, str(e))
+
+        now = time.monotonic()
+        if result.ok:
+            elapsed = now - start
+            detail = f" - {result.detail}" if result.detail else ""
+            log(f"✅ {name} pronto em {elapsed:.2f}s ({attempts} tentativa(s)){detail}\n")
+            return elapsed
+
+        if now >= deadline:
+            raise CommandError(f"{name} não ficou pronto em {timeout:.0f}s ({attempts} tentativas): {result.detail}")
+
+        time.sleep(min(delay, deadline - now))
+        delay = min(delay * 2, max_delay)
+
+
+def tcp_probe(host: str, port: int, timeout: float = 0.3) -> callable:
+    def probe() -> ProbeResult:
+        if _port_open(host, port, timeout=timeout):
+            return ProbeResult(True, f"{host}:{port} aceitando conexões")
+        return ProbeResult(False, f"{host}:{port} fechado")
+
+    return probe
+
+
+def http_probe(url: str, timeout: float = 2.0, max_status: int = 399) -> callable:
+    from urllib.error import HTTPError, URLError
+    from urllib.request import Request, urlopen
+
+    def probe() -> ProbeResult:
+        req = Request(url, headers={"User-Agent": "launcher-ui"})
+        try:
+            with urlopen(req, timeout=timeout) as resp:
+                status = resp.status
+        except HTTPError as e:
+            status = e.code
+        except (URLError, OSError) as e:
+            return ProbeResult(False, f"{url}: {getattr(e, 'reason', e)}")
+        return ProbeResult(status <= max_status, f"{url} -> HTTP {status}")
+
+    return probe
+
+
+class DockerEngineError(CommandError):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Docker Engine HTTP {status}: {message}")
+        self.status = status
+
+
+@dataclass(frozen=True)
+class ContainerInfo:
+    id: str
+    name: str
+    image: str
+    state: str
+    status: str
+    labels: dict
+
+    @property
+    def health(self) -> str:
+        # /containers/json has no Health field on older engines; the status text always carries it.
+        for marker, health in (("(healthy)", "healthy"), ("(unhealthy)", "unhealthy"), ("(health: starting)", "starting")):
+            if marker in self.status:
+                return health
+        return ""
+
+
+def _docker_socket_path() -> str | None:
+    host = os.environ.get("DOCKER_HOST", "")
+    if host:
+        # tcp:// and npipe:// hosts (and TLS) are left to the CLI.
+        return host[len("unix://") :] if host.startswith("unix://") else None
+    candidates = [
+        "/var/run/docker.sock",
+        str(Path.home() / ".docker" / "run" / "docker.sock"),
+        os.path.join(os.environ.get("XDG_RUNTIME_DIR", ""), "docker.sock"),
+    ]
+    for path in candidates:
+        if path and os.path.exists(path):
+            return path
+    return None
+
+
+class DockerClient:
+    # Docker Engine API over the unix socket; one keep-alive connection per thread.
+    def __init__(self, socket_path: str, timeout: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _new_connection(self, timeout: float | None):
+        import http.client
+        import socket
+
+        conn = http.client.HTTPConnection("localhost", timeout=timeout)
+        path = self.socket_path
+
+        def connect() -> None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(timeout)
+            sock.connect(path)
+            conn.sock = sock
+
+        conn.connect = connect
+        return conn
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._new_connection(self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _drop_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def request(self, method: str, path: str, query: dict | None = None, body: dict | None = None) -> tuple[int, bytes]:
+        import http.client
+        import json
+        from urllib.parse import urlencode
+
+        url = path + ("?" + urlencode(query) if query else "")
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Host": "docker", "Content-Type": "application/json"}
+        # A keep-alive connection may have been closed by the daemon while idle: retry once on a fresh one.
+        for attempt in (1, 2):
+            conn = self._connection()
+            try:
+                conn.request(method, url, body=payload, headers=headers)
+                resp = conn.getresponse()
+                return resp.status, resp.read()
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest, BrokenPipeError, ConnectionResetError):
+                self._drop_connection()
+                if attempt == 2:
+                    raise
+            except OSError:
+                self._drop_connection()
+                raise
+        raise AssertionError("unreachable")
+
+    def json(self, method: str, path: str, query: dict | None = None, body: dict | None = None, ok: tuple[int, ...] = ()):
+        import json
+
+        status, raw = self.request(method, path, query, body)
+        if status >= 400 and status not in ok:
+            try:
+                message = json.loads(raw or b"{}").get("message", "")
+            except ValueError:
+                message = raw.decode("utf-8", "replace")
+            raise DockerEngineError(status, message or method + " " + path)
+        return json.loads(raw) if raw.strip() else None
+
+    def stream(self, path: str, query: dict | None = None):
+        # Long-lived streams (/events) get their own timeout-less connection. Returns (response, socket);
+        # shutting the socket down from another thread ends the stream.
+        from urllib.parse import urlencode
+
+        conn = self._new_connection(None)
+        conn.request("GET", path + ("?" + urlencode(query) if query else ""), headers={"Host": "docker"})
+        resp = conn.getresponse()
+        if resp.status >= 400:
+            body = resp.read().decode("utf-8", "replace")
+            conn.close()
+            raise DockerEngineError(resp.status, body)
+        return resp, conn.sock
+
+    def ping(self) -> bool:
+        try:
+            status, _ = self.request("GET", "/_ping")
+        except OSError:
+            return False
+        return status == 200
+
+    def containers(self, all: bool = True, filters: dict[str, list[str]] | None = None) -> list[ContainerInfo]:
+        import json
+
+        query: dict = {"all": "1" if all else "0"}
+        if filters:
+            query["filters"] = json.dumps(filters)
+        out = []
+        for c in self.json("GET", "/containers/json", query) or []:
+            names = c.get("Names") or [""]
+            out.append(
+                ContainerInfo(
+                    id=c.get("Id", ""),
+                    name=names[0].lstrip("/"),
+                    image=c.get("Image", ""),
+                    state=c.get("State", ""),
+                    status=c.get("Status", ""),
+                    labels=c.get("Labels") or {},
+                )
+            )
+        return out
+
+    def inspect(self, container: str) -> dict:
+        return self.json("GET", f"/containers/{container}/json")
+
+    def stop(self, container: str, timeout: int = 10) -> None:
+        # 304: already stopped, 404: already gone.
+        self.json("POST", f"/containers/{container}/stop", {"t": str(timeout)}, ok=(304, 404))
+
+    def remove_container(self, container: str) -> None:
+        self.json("DELETE", f"/containers/{container}", {"force": "1", "v": "1"}, ok=(404,))
+
+    def remove_image(self, image: str) -> None:
+        self.json("DELETE", f"/images/{image}", {"force": "1"}, ok=(404,))
+
+    def remove_volume(self, volume: str) -> None:
+        self.json("DELETE", f"/volumes/{volume}", {"force": "1"}, ok=(404,))
+
+    def bulk(self, fn: Callable[[str], None], ids: list[str], max_workers: int = 8) -> dict[str, str]:
+        # Runs fn over ids concurrently (one connection per worker); returns id -> error for the failures.
+        from concurrent.futures import ThreadPoolExecutor
+
+        errors: dict[str, str] = {}
+
+        def one(item: str) -> None:
+            try:
+                fn(item)
+            except (CommandError, OSError) as e:
+                errors[item] = str(e)
+
+        if ids:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ids))), thread_name_prefix="docker-api") as pool:
+                list(pool.map(one, ids))
+        return errors
+
+
+_docker_client: DockerClient | None = None
+_docker_client_lock = threading.Lock()
+
+
+def docker_engine() -> DockerClient | None:
+    # Engine API client when the daemon socket answers; None means "use the docker CLI".
+    global _docker_client
+    with _docker_client_lock:
+        if _docker_client is not None:
+            return _docker_client
+        path = _docker_socket_path()
+        if path is None:
+            return None
+        client = DockerClient(path)
+        if not client.ping():
+            return None
+        _docker_client = client
+        return client
+
+
+def list_containers(all: bool = True, filters: dict[str, list[str]] | None = None) -> list[ContainerInfo]:
+    client = docker_engine()
+    if client is not None:
+        return client.containers(all=all, filters=filters)
+
+    import json
+
+    cmd = ["docker", "ps", "--no-trunc", "--format", "{{json .}}"]
+    if all:
+        cmd.append("-a")
+    for key, values in (filters or {}).items():
+        cmd += [arg for v in values for arg in ("--filter", f"{key}={v}")]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+    except FileNotFoundError:
+        raise CommandError("Docker não encontrado (nem socket da Engine API nem CLI).") from None
+    if proc.returncode != 0:
+        raise CommandError(proc.stderr.strip() or "docker ps falhou")
+    out = []
+    for line in proc.stdout.splitlines():
+        if not line.strip():
+            continue
+        c = json.loads(line)
+        labels = dict(kv.split("=", 1) for kv in (c.get("Labels") or "").split(",") if "=" in kv)
+        out.append(ContainerInfo(c.get("ID", ""), c.get("Names", ""), c.get("Image", ""), c.get("State", ""), c.get("Status", ""), labels))
+    return out
+
+
+def format_containers_table(containers: list[ContainerInfo]) -> str:
+    rows = [("NAME", "IMAGE", "STATUS")] + [(c.name, c.image, c.status) for c in containers]
+    widths = [max(len(r[i]) for r in rows) for i in range(2)]
+    return "".join(f"{r[0].ljust(widths[0])}  {r[1].ljust(widths[1])}  {r[2]}\n" for r in rows)
+
+
+def compose_health_probe(service: str, root: Path) -> callable:
+    def probe() -> ProbeResult:
+        client = docker_engine()
+        if client is not None:
+            # One API round-trip: compose labels identify the container, the status text carries health.
+            try:
+                found = client.containers(
+                    filters={"label": [f"com.docker.compose.service={service}", f"com.docker.compose.project.working_dir={root}"]}
+                )
+            except (CommandError, OSError) as e:
+                return ProbeResult(False, str(e))
+            if not found:
+                return ProbeResult(False, f"container de {service} ainda não existe")
+            c = found[0]
+            if c.health:
+                return ProbeResult(c.health == "healthy", f"{service}: {c.state}/{c.health}")
+            return ProbeResult(c.state == "running", f"{service}: {c.state}")
+
+        ps = subprocess.run([*docker_compose_base_cmd(), "ps", "-q", service], cwd=str(root), capture_output=True, text=True)
+        cid = ps.stdout.strip().splitlines()[0] if ps.returncode == 0 and ps.stdout.strip() else ""
+        if not cid:
+            return ProbeResult(False, f"container de {service} ainda não existe")
+
+        fmt = "{{.State.Status}} {{if .State.Health}}{{.State.Health.Status}}{{end}}"
+        inspect = subprocess.run(["docker", "inspect", "-f", fmt, cid], capture_output=True, text=True)
+        if inspect.returncode != 0:
+            return ProbeResult(False, inspect.stderr.strip())
+
+        parts = inspect.stdout.split()
+        state = parts[0] if parts else "unknown"
+        health = parts[1] if len(parts) > 1 else ""
+        if health:
+            return ProbeResult(health == "healthy", f"{service}: {state}/{health}")
+        # No healthcheck defined for the service: running is the best we can tell.
+        return ProbeResult(state == "running", f"{service}: {state}")
+
+    return probe
+
+
+@dataclass(frozen=True)
+class ComposeService:
+    name: str
+    container_name: str = ""
+    has_healthcheck: bool = False
+    image: str = ""
+    build: bool = False
+
+
+def compose_services(root: Path) -> list[ComposeService]:
+    # Just enough YAML for the top-level `services:` block of docker-compose.yml.
+    path = root / "docker-compose.yml"
+    if not path.exists():
+        return []
+    services: list[ComposeService] = []
+    current: dict | None = None
+    in_services = False
+    indent = None
+    for raw in path.read_text(encoding="utf-8", errors="replace").splitlines():
+        line = raw.split(" #", 1)[0].rstrip()
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        depth = len(line) - len(line.lstrip())
+        if depth == 0:
+            in_services = line == "services:"
+            continue
+        if not in_services:
+            continue
+        if indent is None:
+            indent = depth
+        if depth == indent and line.endswith(":"):
+            current = {"name": line.strip()[:-1]}
+            services.append(current)
+        elif current is not None and depth == indent * 2:
+            key, _, value = line.strip().partition(":")
+            if key in ("container_name", "image"):
+                current[key] = value.strip().strip("\"'")
+            elif key == "healthcheck":
+                current["has_healthcheck"] = True
+            elif key == "build":
+                current["build"] = True
+    return [ComposeService(**svc) for svc in services]
+
+
+def compose_project_name(root: Path) -> str:
+    # Same precedence as docker compose: env var, .env, top-level `name:`, then the directory name.
+    import re
+
+    name = os.environ.get("COMPOSE_PROJECT_NAME") or read_env_value(root, "COMPOSE_PROJECT_NAME")
+    compose_file = root / "docker-compose.yml"
+    if not name and compose_file.exists():
+        for line in compose_file.read_text(encoding="utf-8", errors="replace").splitlines():
+            if line.startswith("name:"):
+                name = line.split(":", 1)[1].strip().strip("\"'")
+                break
+    name = re.sub(r"[^a-z0-9_-]", "", (name or root.name).lower())
+    return name.lstrip("_-")
+
+
+def _parse_docker_time(value: str) -> float | None:
+    from datetime import datetime
+
+    if not value or value.startswith("0001-"):
+        return None
+    # RFC 3339 with nanoseconds: keep microseconds, which is all datetime understands.
+    head, _, frac = value.rstrip("Z").partition(".")
+    frac = "".join(ch for ch in frac if ch.isdigit())[:6]
+    try:
+        dt = datetime.fromisoformat(head + (f".{frac}" if frac else "") + "+00:00")
+    except ValueError:
+        return None
+    return dt.timestamp()
+
+
+@dataclass
+class ServiceStatus:
+    service: str
+    container: str = ""
+    container_id: str = ""
+    state: str = "ausente"
+    health: str = ""
+    started_at: float | None = None
+    exit_code: str = ""
+
+
+class ContainerWatcher:
+    # Live state of the compose services, fed by the Docker events stream (Engine API, or `docker events`).
+    def __init__(self, root: Path, on_change: Callable[[], None] | None = None, log: Callable[[str], None] | None = None):
+        self.root = root
+        self.on_change = on_change
+        self.log = log
+        self.services = {svc.name: svc for svc in compose_services(root)}
+        self._status = {name: ServiceStatus(name) for name in self.services}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._stream_sock = None
+        self._stream_proc: subprocess.Popen | None = None
+
+    def start(self) -> None:
+        if self.services and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="container-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        import socket
+
+        self._stop.set()
+        if self._stream_sock is not None:
+            try:
+                self._stream_sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._stream_proc is not None and self._stream_proc.poll() is None:
+            self._stream_proc.terminate()
+
+    def snapshot(self) -> list[ServiceStatus]:
+        from dataclasses import replace
+
+        with self._lock:
+            return [replace(self._status[name]) for name in self.services]
+
+    def _changed(self) -> None:
+        if self.on_change is not None:
+            self.on_change()
+
+    def _service_of(self, labels: dict, name: str) -> str | None:
+        service = labels.get("com.docker.compose.service")
+        if service not in self.services:
+            return None
+        workdir = labels.get("com.docker.compose.project.working_dir")
+        if workdir == str(self.root) or name == self.services[service].container_name:
+            return service
+        return None
+
+    def _resync(self) -> None:
+        import json
+
+        fresh = {name: ServiceStatus(name) for name in self.services}
+        matched = {}
+        for c in list_containers(all=True):
+            service = self._service_of(c.labels, c.name)
+            if service is not None and (service not in matched or c.state == "running"):
+                matched[service] = c
+
+        if matched:
+            client = docker_engine()
+            if client is not None:
+                details = [client.inspect(c.id) for c in matched.values()]
+            else:
+                out = subprocess.run(["docker", "inspect", *[c.id for c in matched.values()]], capture_output=True, text=True)
+                details = json.loads(out.stdout or "[]") if out.returncode == 0 else []
+            by_id = {d.get("Id", ""): d for d in details}
+            for service, c in matched.items():
+                state = (by_id.get(c.id) or {}).get("State") or {}
+                fresh[service] = ServiceStatus(
+                    service,
+                    container=c.name,
+                    container_id=c.id,
+                    state=c.state,
+                    health=(state.get("Health") or {}).get("Status", "") or c.health,
+                    started_at=_parse_docker_time(state.get("StartedAt", "")) if c.state == "running" else None,
+                    exit_code=str(state.get("ExitCode", "")) if c.state == "exited" else "",
+                )
+        with self._lock:
+            self._status = fresh
+        self._changed()
+
+    def _apply(self, event: dict) -> None:
+        action = event.get("Action") or event.get("status") or ""
+        actor = event.get("Actor") or {}
+        attrs = actor.get("Attributes") or {}
+        service = self._service_of(attrs, attrs.get("name", ""))
+        if service is None:
+            return
+        when = int(event.get("timeNano") or 0) / 1e9 or float(event.get("time") or time.time())
+
+        with self._lock:
+            st = self._status[service]
+            st.container = attrs.get("name", st.container)
+            st.container_id = actor.get("ID") or event.get("id") or st.container_id
+            if action == "create":
+                st.state, st.health, st.started_at, st.exit_code = "created", "", None, ""
+            elif action == "start" or action == "unpause":
+                if action == "start":
+                    st.started_at = when
+                    st.health = "starting" if self.services[service].has_healthcheck else ""
+                st.state, st.exit_code = "running", ""
+            elif action == "pause":
+                st.state = "paused"
+            elif action == "die":
+                st.state, st.health, st.started_at = "exited", "", None
+                st.exit_code = attrs.get("exitCode", "")
+            elif action == "destroy":
+                self._status[service] = ServiceStatus(service)
+            elif action.startswith("health_status"):
+                st.health = action.split(":", 1)[-1].strip()
+            else:
+                return
+        self._changed()
+
+    def _events(self, since: int):
+        import json
+
+        filters = {"type": ["container"], "label": ["com.docker.compose.service"]}
+        client = docker_engine()
+        if client is not None:
+            resp, self._stream_sock = client.stream("/events", {"since": str(since), "filters": json.dumps(filters)})
+            try:
+                while not self._stop.is_set():
+                    line = resp.readline()
+                    if not line:
+                        return
+                    if line.strip():
+                        yield json.loads(line)
+            finally:
+                self._stream_sock = None
+                resp.close()
+            return
+
+        cmd = ["docker", "events", "--format", "{{json .}}", "--since", str(since), "--filter", "type=container"]
+        self._stream_proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        try:
+            for line in self._stream_proc.stdout:
+                if self._stop.is_set():
+                    return
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            if self._stream_proc.poll() is None:
+                self._stream_proc.terminate()
+            self._stream_proc = None
+
+    def _run(self) -> None:
+        delay = 1.0
+        failing = False
+        while not self._stop.is_set():
+            since = int(time.time())
+            try:
+                # Snapshot first, then replay anything that happened since it was taken.
+                self._resync()
+                if failing and self.log:
+                    self.log("✅ Eventos Docker reconectados\n")
+                failing, delay = False, 1.0
+                for event in self._events(since):
+                    self._apply(event)
+            except (CommandError, OSError, ValueError) as e:
+                if not failing and self.log and not self._stop.is_set():
+                    self.log(f"⚠️  Eventos Docker indisponíveis ({e}); tentando novamente\n")
+                failing = True
+            if self._stop.wait(delay):
+                return
+            delay = min(delay * 2, 30.0)
+
+
+class RingBuffer:
+    # Fixed-capacity float buffer; appending past capacity overwrites the oldest sample.
+    __slots__ = ("_data", "_head", "count")
+
+    def __init__(self, capacity: int):
+        from array import array
+
+        self._data = array("d", bytes(8 * capacity))
+        self._head = 0
+        self.count = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def append(self, value: float) -> None:
+        self._data[self._head] = value
+        self._head = (self._head + 1) % len(self._data)
+        self.count = min(self.count + 1, len(self._data))
+
+    def values(self) -> list[float]:
+        if self.count < len(self._data):
+            return self._data[: self.count].tolist()
+        return self._data[self._head :].tolist() + self._data[: self._head].tolist()
+
+    def last(self) -> float | None:
+        return self._data[self._head - 1] if self.count else None
+
+
+def sparkline(values: list[float], width: int = STATS_SPARK_WIDTH) -> str:
+    bars = "▁▂▃▄▅▆▇█"
+    values = values[-width:]
+    if not values:
+        return ""
+    top = max(values)
+    if top <= 0:
+        return bars[0] * len(values)
+    return "".join(bars[min(len(bars) - 1, int(v / top * (len(bars) - 1) + 0.5))] for v in values)
+
+
+STATS_FIELDS = ("cpu_percent", "mem_bytes", "mem_percent", "net_rx_bps", "net_tx_bps", "blk_read_bps", "blk_write_bps")
+
+
+class ContainerSeries:
+    def __init__(self, service: str, container_id: str, capacity: int = STATS_WINDOW):
+        self.service = service
+        self.container_id = container_id
+        self.times = RingBuffer(capacity)
+        self.metrics = {field: RingBuffer(capacity) for field in STATS_FIELDS}
+        self._lock = threading.Lock()
+        self._prev: tuple[float, float, float, float, float] | None = None
+
+    def add(self, ts: float, cpu: float, mem: float, mem_pct: float, rx: float, tx: float, blk_r: float, blk_w: float) -> None:
+        # Network and block I/O arrive as counters since container start; store them as rates.
+        with self._lock:
+            rates = (0.0, 0.0, 0.0, 0.0)
+            if self._prev is not None and ts > self._prev[0]:
+                dt = ts - self._prev[0]
+                rates = tuple(max(0.0, (cur - old) / dt) for cur, old in zip((rx, tx, blk_r, blk_w), self._prev[1:]))
+            self._prev = (ts, rx, tx, blk_r, blk_w)
+            self.times.append(ts)
+            for field, value in zip(STATS_FIELDS, (cpu, mem, mem_pct, *rates)):
+                self.metrics[field].append(value)
+
+    def window(self) -> tuple[list[float], dict[str, list[float]]]:
+        with self._lock:
+            return self.times.values(), {field: buf.values() for field, buf in self.metrics.items()}
+
+    def last(self, field: str) -> float | None:
+        with self._lock:
+            return self.metrics[field].last()
+
+
+def _parse_api_stats(sample: dict) -> tuple[float, ...] | None:
+    cpu, pre = sample.get("cpu_stats") or {}, sample.get("precpu_stats") or {}
+    if not cpu:
+        return None
+    # Same formula as `docker stats`.
+    cpu_delta = (cpu.get("cpu_usage") or {}).get("total_usage", 0) - (pre.get("cpu_usage") or {}).get("total_usage", 0)
+    system_delta = cpu.get("system_cpu_usage", 0) - pre.get("system_cpu_usage", 0)
+    online = cpu.get("online_cpus") or len((cpu.get("cpu_usage") or {}).get("percpu_usage") or ()) or 1
+    cpu_pct = cpu_delta / system_delta * online * 100.0 if cpu_delta > 0 and system_delta > 0 else 0.0
+
+    mem = sample.get("memory_stats") or {}
+    details = mem.get("stats") or {}
+    # cgroup v2 reports inactive_file, v1 reports cache; both are reclaimable page cache.
+    used = mem.get("usage", 0) - details.get("inactive_file", details.get("cache", 0))
+    limit = mem.get("limit", 0)
+
+    rx = tx = 0
+    for net in (sample.get("networks") or {}).values():
+        rx += net.get("rx_bytes", 0)
+        tx += net.get("tx_bytes", 0)
+
+    blk_r = blk_w = 0
+    for entry in (sample.get("blkio_stats") or {}).get("io_service_bytes_recursive") or ():
+        op = str(entry.get("op", "")).lower()
+        if op == "read":
+            blk_r += entry.get("value", 0)
+        elif op == "write":
+            blk_w += entry.get("value", 0)
+
+    return cpu_pct, max(0, used), used / limit * 100.0 if limit else 0.0, rx, tx, blk_r, blk_w
+
+
+def _parse_size(text: str) -> float:
+    import re
+
+    m = re.match(r"\s*([\d.]+)\s*([kKMGTP]?i?B)?", text)
+    if not m:
+        return 0.0
+    scale = {"": 1, "B": 1, "kB": 1e3, "KB": 1e3, "MB": 1e6, "GB": 1e9, "TB": 1e12, "KiB": 1024, "MiB": 1024**2, "GiB": 1024**3, "TiB": 1024**4}
+    return float(m.group(1)) * scale.get(m.group(2) or "", 1)
+
+
+def _parse_cli_stats(row: dict) -> tuple[float, ...]:
+    def pair(text: str | None) -> tuple[float, float]:
+        left, _, right = (text or "0B / 0B").partition("/")
+        return _parse_size(left), _parse_size(right)
+
+    def percent(text: str | None) -> float:
+        return float((text or "0").strip().rstrip("%") or 0)
+
+    mem, _limit = pair(row.get("MemUsage"))
+    rx, tx = pair(row.get("NetIO"))
+    blk_r, blk_w = pair(row.get("BlockIO"))
+    return percent(row.get("CPUPerc")), mem, percent(row.get("MemPerc")), rx, tx, blk_r, blk_w
+
+
+class StatsCollector:
+    # Streams per-container stats into fixed-size ring buffers; memory stays constant however long it runs.
+    def __init__(self, targets: Callable[[], dict[str, str]], capacity: int = STATS_WINDOW):
+        self.targets = targets
+        self.capacity = capacity
+        self._series: dict[str, ContainerSeries] = {}
+        self._streams: dict[str, tuple[threading.Event, list, str]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._cli: subprocess.Popen | None = None
+        self._cli_ids: frozenset[str] = frozenset()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._manage, name="stats-collector", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        for service in list(self._streams):
+            self._close_stream(service)
+        self._stop_cli()
+
+    def series(self) -> list[ContainerSeries]:
+        with self._lock:
+            return list(self._series.values())
+
+    def export_csv(self, path: Path) -> int:
+        import csv
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        rows = 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["timestamp", "service", "container_id", *STATS_FIELDS])
+            for s in self.series():
+                times, metrics = s.window()
+                for i, ts in enumerate(times):
+                    writer.writerow([f"{ts:.3f}", s.service, s.container_id[:12], *(f"{metrics[f][i]:.2f}" for f in STATS_FIELDS)])
+                    rows += 1
+        return rows
+
+    def _manage(self) -> None:
+        while not self._stop.wait(1.0):
+            try:
+                wanted = self.targets()
+            except Exception:
+                continue
+            with self._lock:
+                for service, cid in wanted.items():
+                    current = self._series.get(service)
+                    if current is None or current.container_id != cid:
+                        self._series[service] = ContainerSeries(service, cid, self.capacity)
+            client = docker_engine()
+            if client is not None:
+                for service, (_stop, _holder, cid) in list(self._streams.items()):
+                    if wanted.get(service) != cid:
+                        self._close_stream(service)
+                for service in wanted:
+                    if service not in self._streams:
+                        self._open_stream(client, service)
+            else:
+                self._sync_cli(wanted)
+
+    def _open_stream(self, client: DockerClient, service: str) -> None:
+        stop, holder = threading.Event(), []
+        series = self._series[service]
+        self._streams[service] = (stop, holder, series.container_id)
+        threading.Thread(target=self._read_api, args=(client, series, stop, holder), name=f"stats-{service}", daemon=True).start()
+
+    def _close_stream(self, service: str) -> None:
+        import socket
+
+        stop, holder, _cid = self._streams.pop(service, (None, [], ""))
+        if stop is not None:
+            stop.set()
+        for sock in holder:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _read_api(self, client: DockerClient, series: ContainerSeries, stop: threading.Event, holder: list) -> None:
+        import json
+
+        try:
+            resp, sock = client.stream(f"/containers/{series.container_id}/stats", {"stream": "1"})
+            holder.append(sock)
+            while not stop.is_set():
+                line = resp.readline()
+                if not line:
+                    break
+                parsed = _parse_api_stats(json.loads(line)) if line.strip() else None
+                if parsed is not None:
+                    series.add(time.time(), *parsed)
+        except (CommandError, OSError, ValueError):
+            pass
+        finally:
+            # Let _manage reopen it if the container is still wanted.
+            if self._streams.get(series.service, (None,))[0] is stop:
+                self._streams.pop(series.service, None)
+
+    def _stop_cli(self) -> None:
+        if self._cli is not None and self._cli.poll() is None:
+            self._cli.terminate()
+        self._cli = None
+
+    def _sync_cli(self, wanted: dict[str, str]) -> None:
+        # One `docker stats` process streams every container; restart it when the set changes.
+        ids = frozenset(wanted.values())
+        if ids == self._cli_ids and self._cli is not None and self._cli.poll() is None:
+            return
+        self._stop_cli()
+        self._cli_ids = ids
+        if not ids:
+            return
+        try:
+            self._cli = subprocess.Popen(
+                ["docker", "stats", "--format", "{{json .}}", *sorted(ids)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        except FileNotFoundError:
+            return
+        by_id = {cid: service for service, cid in wanted.items()}
+        threading.Thread(target=self._read_cli, args=(self._cli, by_id), name="stats-cli", daemon=True).start()
+
+    def _read_cli(self, proc: subprocess.Popen, by_id: dict[str, str]) -> None:
+        import json
+        import re
+
+        ansi = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+        for line in proc.stdout:
+            line = ansi.sub("", line).strip()
+            if not line.startswith("{"):
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            cid = next((full for full in by_id if full.startswith(row.get("ID", "\0"))), None)
+            series = self._series.get(by_id.get(cid, ""))
+            if series is not None:
+                series.add(time.time(), *_parse_cli_stats(row))
+
+
+def _bson_encode(doc: dict) -> bytes:
+    import struct
+
+    body = b""
+    for k, v in doc.items():
+        key = k.encode("utf-8") + b"\x00"
+        if isinstance(v, bool):
+            body += b"\x08" + key + (b"\x01" if v else b"\x00")
+        elif isinstance(v, int):
+            if -(2**31) <= v < 2**31:
+                body += b"\x10" + key + struct.pack("<i", v)
+            else:
+                body += b"\x12" + key + struct.pack("<q", v)
+        elif isinstance(v, float):
+            body += b"\x01" + key + struct.pack("<d", v)
+        elif isinstance(v, str):
+            raw = v.encode("utf-8") + b"\x00"
+            body += b"\x02" + key + struct.pack("<i", len(raw)) + raw
+        elif v is None:
+            body += b"\x0a" + key
+        elif isinstance(v, dict):
+            body += b"\x03" + key + _bson_encode(v)
+        elif isinstance(v, (list, tuple)):
+            body += b"\x04" + key + _bson_encode({str(i): item for i, item in enumerate(v)})
+        else:
+            raise TypeError(f"Tipo BSON não suportado: {type(v).__name__}")
+    return struct.pack("<i", len(body) + 5) + body + b"\x00"
+
+
+def _bson_decode(data: bytes, pos: int = 0) -> dict:
+    import struct
+
+    size = struct.unpack_from("<i", data, pos)[0]
+    end = pos + size - 1
+    pos += 4
+    out: dict = {}
+    while pos < end:
+        kind = data[pos]
+        pos += 1
+        key_end = data.index(b"\x00", pos)
+        key = data[pos:key_end].decode("utf-8", errors="replace")
+        pos = key_end + 1
+
+        if kind == 0x01:
+            value = struct.unpack_from("<d", data, pos)[0]
+            pos += 8
+        elif kind == 0x02:
+            n = struct.unpack_from("<i", data, pos)[0]
+            value = data[pos + 4 : pos + 3 + n].decode("utf-8", errors="replace")
+            pos += 4 + n
+        elif kind in (0x03, 0x04):
+            n = struct.unpack_from("<i", data, pos)[0]
+            sub = _bson_decode(data, pos)
+            value = sub if kind == 0x03 else list(sub.values())
+            pos += n
+        elif kind == 0x05:
+            n = struct.unpack_from("<i", data, pos)[0]
+            value = data[pos + 5 : pos + 5 + n]
+            pos += 5 + n
+        elif kind == 0x07:
+            value = data[pos : pos + 12].hex()
+            pos += 12
+        elif kind == 0x08:
+            value = data[pos] == 1
+            pos += 1
+        elif kind in (0x09, 0x12):
+            value = struct.unpack_from("<q", data, pos)[0]
+            pos += 8
+        elif kind == 0x11:
+            value = struct.unpack_from("<Q", data, pos)[0]
+            pos += 8
+        elif kind == 0x0A:
+            value = None
+        elif kind == 0x10:
+            value = struct.unpack_from("<i", data, pos)[0]
+            pos += 4
+        elif kind == 0x13:
+            value = data[pos : pos + 16]
+            pos += 16
+        else:
+            raise ValueError(f"Tipo BSON não suportado na resposta: {kind:#x}")
+        out[key] = value
+    return out
+
+
+def _recv_exact(sock, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("Conexão encerrada pelo servidor")
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def mongo_command(host: str, port: int, command: dict, timeout: float = 1.0) -> dict:
+    # Minimal OP_MSG round-trip, enough for hello/isMaster without a driver dependency.
+    import socket
+    import struct
+
+    payload = struct.pack("<I", 0) + b"\x00" + _bson_encode({**command, "$db": "admin"})
+    msg = struct.pack("<iiii", 16 + len(payload), 1, 0, 2013) + payload
+
+    with socket.create_connection((host, port), timeout=timeout) as s:
+        s.settimeout(timeout)
+        s.sendall(msg)
+        length, _request_id, _response_to, opcode = struct.unpack("<iiii", _recv_exact(s, 16))
+        body = _recv_exact(s, length - 16)
+
+    if opcode != 2013 or body[4] != 0:
+        raise ValueError(f"Resposta inesperada do MongoDB (opcode={opcode})")
+    return _bson_decode(body, 5)
+
+
+def mongo_replset_probe(host: str, port: int, timeout: float = 1.0) -> callable:
+    def probe() -> ProbeResult:
+        reply = mongo_command(host, port, {"hello": 1}, timeout=timeout)
+        if not reply.get("ok"):
+            # Servers older than 4.4.2 only know the legacy command.
+            reply = mongo_command(host, port, {"isMaster": 1}, timeout=timeout)
+        if not reply.get("ok"):
+            return ProbeResult(False, f"hello falhou: {reply.get('errmsg', reply)}")
+
+        set_name = reply.get("setName")
+        primary = bool(reply.get("isWritablePrimary", reply.get("ismaster", False)))
+        if set_name is None:
+            if reply.get("isreplicaset"):
+                return ProbeResult(False, "replica set ainda não iniciado (rs.initiate pendente)")
+            return ProbeResult(True, "standalone (sem replica set)")
+        if primary:
+            return ProbeResult(True, f"replica set {set_name}: PRIMARY")
+        return ProbeResult(False, f"replica set {set_name}: aguardando PRIMARY")
+
+    return probe
+
+
+def wait_mongodb_ready(log: callable, timeout: float = 60.0) -> float:
+    health = compose_health_probe("mongodb", repo_root())
+    hello = mongo_replset_probe("127.0.0.1", 27017)
+
+    def probe() -> ProbeResult:
+        # The compose healthcheck gates the hello probe, so a missing, stopped or unhealthy container is reported
+        # as such. "starting" lets hello decide, since the first healthcheck only runs after its interval.
+        state = health()
+        if not state.ok and not state.detail.endswith("/starting"):
+            return state
+        return hello()
+
+    return wait_ready("MongoDB (replica set)", probe, log, timeout=timeout)
+
+
+def wait_dynamodb_ready(log: callable, timeout: float = 30.0) -> float:
+    # DynamoDB Local answers unauthenticated requests with HTTP 400; any response means it is serving.
+    return wait_ready("DynamoDB Local", http_probe("http://localhost:8000/shard/", max_status=499), log, timeout=timeout)
+
+
+class DynamoDBError(CommandError):
+    def __init__(self, code: str, message: str):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+
+
+class DynamoDBLocalClient:
+    # Tiny DynamoDB JSON-protocol client; DynamoDB Local accepts any SigV4-signed credentials.
+    def __init__(self, endpoint: str, region: str = "us-east-1", access_key: str = "fake", secret_key: str = "fake"):
+        self.endpoint = endpoint.rstrip("/")
+        self.region = region
+        self.access_key = access_key
+        self.secret_key = secret_key
+        # One keep-alive connection per thread: bulk loads would otherwise pay a TCP handshake per request.
+        self._local = threading.local()
+
+    @classmethod
+    def from_env(cls, root: Path) -> "DynamoDBLocalClient":
+        return cls(
+            read_env_value(root, "DYNAMODB_ENDPOINT", "http://localhost:8000"),
+            region=read_env_value(root, "AWS_REGION", "us-east-1"),
+            access_key=read_env_value(root, "DYNAMODB_ACCESS_KEY_ID", "fake"),
+            secret_key=read_env_value(root, "DYNAMODB_SECRET_ACCESS_KEY", "fake"),
+        )
+
+    def _signed_headers(self, target: str, body: bytes, timestamp: float | None = None) -> dict[str, str]:
+        import hashlib
+        import hmac
+        from datetime import datetime, timezone
+        from urllib.parse import urlparse
+
+        now = datetime.fromtimestamp(time.time() if timestamp is None else timestamp, timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        day = now.strftime("%Y%m%d")
+        headers = {
+            "content-type": "application/x-amz-json-1.0",
+            "host": urlparse(self.endpoint).netloc,
+            "x-amz-date": amz_date,
+            "x-amz-target": f"DynamoDB_20120810.{target}",
+        }
+        signed = ";".join(sorted(headers))
+        canonical = "\n".join(
+            [
+                "POST",
+                "/",
+                "",
+                "".join(f"{k}:{headers[k]}\n" for k in sorted(headers)),
+                signed,
+                hashlib.sha256(body).hexdigest(),
+            ]
+        )
+        scope = f"{day}/{self.region}/dynamodb/aws4_request"
+        to_sign = "\n".join(["AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical.encode()).hexdigest()])
+
+        key = ("AWS4" + self.secret_key).encode()
+        for part in (day, self.region, "dynamodb", "aws4_request"):
+            key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+        signature = hmac.new(key, to_sign.encode(), hashlib.sha256).hexdigest()
+
+        headers["authorization"] = (
+            f"AWS4-HMAC-SHA256 Credential={self.access_key}/{scope}, SignedHeaders={signed}, Signature={signature}"
+        )
+        return headers
+
+    def _connection(self, timeout: float):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            import http.client
+            from urllib.parse import urlparse
+
+            url = urlparse(self.endpoint)
+            cls = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+            conn = self._local.conn = cls(url.netloc, timeout=timeout)
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn
+
+    def _drop_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def call(self, target: str, payload: dict, timeout: float = 10.0) -> dict:
+        import http.client
+        import json
+
+        body = json.dumps(payload).encode("utf-8")
+        # A pooled connection may have been closed while idle: retry once on a fresh one.
+        for attempt in (1, 2):
+            conn = self._connection(timeout)
+            try:
+                conn.request("POST", "/", body=body, headers=self._signed_headers(target, body))
+                resp = conn.getresponse()
+                status, raw = resp.status, resp.read()
+                break
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest, BrokenPipeError, ConnectionResetError) as e:
+                self._drop_connection()
+                if attempt == 2:
+                    raise CommandError(f"DynamoDB inacessível em {self.endpoint}: {e}") from None
+            except (OSError, http.client.HTTPException) as e:
+                self._drop_connection()
+                raise CommandError(f"DynamoDB inacessível em {self.endpoint}: {e}") from None
+
+        if status >= 400:
+            try:
+                err = json.loads(raw or b"{}")
+            except ValueError:
+                err = {}
+            code = str(err.get("__type", f"HTTP{status}")).rsplit("#", 1)[-1]
+            raise DynamoDBError(code, err.get("message") or err.get("Message") or raw.decode("utf-8", "replace"))
+        return json.loads(raw or b"{}")
+
+    def list_tables(self) -> list[str]:
+        names: list[str] = []
+        payload: dict = {}
+        while True:
+            resp = self.call("ListTables", payload)
+            names.extend(resp.get("TableNames", []))
+            last = resp.get("LastEvaluatedTableName")
+            if not last:
+                return names
+            payload = {"ExclusiveStartTableName": last}
+
+    def describe_table(self, name: str) -> dict:
+        return self.call("DescribeTable", {"TableName": name})["Table"]
+
+
+DYNAMODB_BATCH_SIZE = 25
+DYNAMODB_RETRYABLE = {"ProvisionedThroughputExceededException", "ThrottlingException", "RequestLimitExceeded", "InternalServerError"}
+
+
+class _JsonNumber(str):
+    # Keeps JSON numbers as their source text so DynamoDB "N" values don't go through float.
+    pass
+
+
+def _to_attribute_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, _JsonNumber):
+        return {"N": str(value)}
+    if isinstance(value, str):
+        return {"S": value}
+    if value is None:
+        return {"NULL": True}
+    if isinstance(value, list):
+        return {"L": [_to_attribute_value(v) for v in value]}
+    if isinstance(value, dict):
+        return {"M": {k: _to_attribute_value(v) for k, v in value.items()}}
+    if isinstance(value, (int, float)):
+        return {"N": repr(value)}
+    raise ValueError(f"tipo não suportado em fixture: {type(value).__name__}")
+
+
+def _from_attribute_value(value: dict):
+    # Inverse of _to_attribute_value; binary and set types have no plain-JSON form in a fixture.
+    (kind, inner), = value.items()
+    if kind == "N":
+        return int(inner) if inner.lstrip("-").isdigit() else float(inner)
+    if kind in ("S", "BOOL"):
+        return inner
+    if kind == "NULL":
+        return None
+    if kind == "L":
+        return [_from_attribute_value(v) for v in inner]
+    if kind == "M":
+        return {k: _from_attribute_value(v) for k, v in inner.items()}
+    raise ValueError(f"tipo DynamoDB não suportado em fixture: {kind}")
+
+
+def _read_ndjson(path: Path):
+    import gzip
+    import json
+
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line, parse_int=_JsonNumber, parse_float=_JsonNumber)
+            except ValueError as e:
+                raise CommandError(f"{path.name}:{line_no}: JSON inválido ({e})") from None
+
+
+def dynamodb_fixtures_dir(root: Path) -> Path:
+    configured = read_env_value(root, "DYNAMODB_FIXTURES_DIR")
+    return (root / configured) if configured else root / "fixtures" / "dynamodb"
+
+
+def batch_write_items(
+    client: DynamoDBLocalClient,
+    table: str,
+    items,
+    log: callable,
+    workers: int = 8,
+    max_attempts: int = 10,
+) -> tuple[int, float]:
+    # `items` are DynamoDB attribute maps, streamed into 25-item BatchWriteItem calls on a bounded pool; UnprocessedItems are retried with backoff.
+    import random
+    from concurrent.futures import ThreadPoolExecutor
+
+    keys = [k["AttributeName"] for k in client.describe_table(table).get("KeySchema", [])]
+    written = 0
+    lock = threading.Lock()
+    # Caps batches in flight so a huge fixture never sits in memory.
+    slots = threading.BoundedSemaphore(workers * 2)
+    errors: list[Exception] = []
+
+    def write(batch: list[dict]) -> None:
+        nonlocal written
+        pending = {table: [{"PutRequest": {"Item": item}} for item in batch]}
+        delay = 0.05
+        try:
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    resp = client.call("BatchWriteItem", {"RequestItems": pending}, timeout=30.0)
+                except DynamoDBError as e:
+                    if e.code not in DYNAMODB_RETRYABLE or attempt == max_attempts:
+                        raise
+                    resp = {"UnprocessedItems": pending}
+                left = resp.get("UnprocessedItems") or {}
+                with lock:
+                    written += len(pending.get(table, ())) - len(left.get(table, ()))
+                if not left:
+                    return
+                pending = left
+                if attempt == max_attempts:
+                    raise CommandError(f"{table}: {len(left.get(table, ()))} item(ns) não processados após {max_attempts} tentativas")
+                time.sleep(delay * (0.5 + random.random()))
+                delay = min(delay * 2, 2.0)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            slots.release()
+
+    started = time.monotonic()
+    next_report = started + 1.0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dynamodb-batch") as pool:
+        batch: dict[tuple, dict] = {}
+        for n, item in enumerate(items, 1):
+            # A batch may not hold the same key twice; the last occurrence wins, like sequential puts.
+            batch[tuple(str(item.get(k)) for k in keys) if keys else n] = item
+            if len(batch) == DYNAMODB_BATCH_SIZE:
+                slots.acquire()
+                if errors:
+                    slots.release()
+                    break
+                pool.submit(write, list(batch.values()))
+                batch = {}
+            now = time.monotonic()
+            if now >= next_report:
+                log(f"{table}: {written} itens ({written / (now - started):.0f} itens/s)\n")
+                next_report = now + 1.0
+        if batch and not errors:
+            slots.acquire()
+            pool.submit(write, list(batch.values()))
+    if errors:
+        raise errors[0] if isinstance(errors[0], CommandError) else CommandError(f"{table}: {errors[0]}")
+    return written, time.monotonic() - started
+
+
+def seed_dynamodb_fixtures(root: Path, log: callable, workers: int = 8) -> int:
+    directory = dynamodb_fixtures_dir(root)
+    if not directory.is_dir():
+        raise CommandError(
+            f"Diretório de fixtures {directory} não existe. Rode o seed TS (pnpm run dynamodb:seed) e depois "
+            "'DynamoDB: exportar fixtures NDJSON', ou aponte DYNAMODB_FIXTURES_DIR para um diretório existente."
+        )
+    files = sorted([*directory.glob("*.ndjson"), *directory.glob("*.ndjson.gz")])
+    if not files:
+        raise CommandError(f"Nenhuma fixture *.ndjson em {directory} (um arquivo por tabela, um item JSON por linha).")
+
+    client = DynamoDBLocalClient.from_env(root)
+    existing = set(client.list_tables())
+    prefix = read_env_value(root, "DYNAMODB_TABLE", "portfolio-backend-table")
+    total, total_elapsed = 0, 0.0
+    for path in files:
+        stem = path.name.split(".", 1)[0]
+        # posts.ndjson -> <DYNAMODB_TABLE>-posts; a file named after the full table also works.
+        table = stem if stem in existing else f"{prefix}-{stem}"
+        if table not in existing:
+            log(f"⚠️  {path.name}: tabela {table} não existe; pulando\n")
+            continue
+        items = ({k: _to_attribute_value(v) for k, v in doc.items()} for doc in _read_ndjson(path))
+        count, elapsed = batch_write_items(client, table, items, log, workers=workers)
+        total += count
+        total_elapsed += elapsed
+        log(f"✅ {table}: {count} itens em {elapsed:.2f}s ({count / elapsed if elapsed else 0:.0f} itens/s)\n")
+    if total_elapsed:
+        log(f"Total: {total} itens em {total_elapsed:.2f}s ({total / total_elapsed:.0f} itens/s)\n")
+    return total
+
+
+def export_dynamodb_fixtures(root: Path, log: callable) -> int:
+    # Scans the project's tables (<DYNAMODB_TABLE>-*) into plain-JSON <stem>.ndjson fixtures, e.g. after the TS seed.
+    import json
+
+    client = DynamoDBLocalClient.from_env(root)
+    prefix = read_env_value(root, "DYNAMODB_TABLE", "portfolio-backend-table")
+    tables = [name for name in client.list_tables() if name.startswith(f"{prefix}-")]
+    if not tables:
+        raise CommandError(f"Nenhuma tabela {prefix}-* no DynamoDB Local; rode o seed (pnpm run dynamodb:seed) primeiro.")
+
+    directory = dynamodb_fixtures_dir(root)
+    directory.mkdir(parents=True, exist_ok=True)
+    total = 0
+    for table in tables:
+        stem = table[len(prefix) + 1 :]
+        target = directory / f"{stem}.ndjson"
+        staging = target.with_name(target.name + ".part")
+        count = 0
+        payload: dict = {"TableName": table}
+        with open(staging, "w", encoding="utf-8", newline="\n") as f:
+            while True:
+                resp = client.call("Scan", payload, timeout=30.0)
+                for item in resp.get("Items", []):
+                    try:
+                        doc = {k: _from_attribute_value(v) for k, v in item.items()}
+                    except ValueError as e:
+                        staging.unlink(missing_ok=True)
+                        raise CommandError(f"{table}: {e}") from None
+                    f.write(json.dumps(doc, ensure_ascii=False, sort_keys=True) + "\n")
+                    count += 1
+                last = resp.get("LastEvaluatedKey")
+                if not last:
+                    break
+                payload["ExclusiveStartKey"] = last
+        staging.replace(target)
+        total += count
+        log(f"- {table}: {count} itens -> {target.name}\n")
+    log(f"✅ {total} itens de {len(tables)} tabela(s) exportados para {directory}\n")
+    return total
+
+
+def _table_create_definition(table: dict) -> dict:
+    # DescribeTable output minus the runtime fields CreateTable rejects.
+    def index(ix: dict) -> dict:
+        out = {k: ix[k] for k in ("IndexName", "KeySchema", "Projection") if k in ix}
+        throughput = ix.get("ProvisionedThroughput") or {}
+        if throughput.get("ReadCapacityUnits"):
+            out["ProvisionedThroughput"] = {k: throughput[k] for k in ("ReadCapacityUnits", "WriteCapacityUnits")}
+        return out
+
+    definition = {k: table[k] for k in ("TableName", "AttributeDefinitions", "KeySchema")}
+    throughput = table.get("ProvisionedThroughput") or {}
+    if (table.get("BillingModeSummary") or {}).get("BillingMode") == "PAY_PER_REQUEST" or not throughput.get("ReadCapacityUnits"):
+        definition["BillingMode"] = "PAY_PER_REQUEST"
+    else:
+        definition["ProvisionedThroughput"] = {k: throughput[k] for k in ("ReadCapacityUnits", "WriteCapacityUnits")}
+    for key in ("GlobalSecondaryIndexes", "LocalSecondaryIndexes"):
+        if table.get(key):
+            definition[key] = [index(ix) for ix in table[key]]
+            if key == "GlobalSecondaryIndexes" and definition.get("BillingMode") == "PAY_PER_REQUEST":
+                for ix in definition[key]:
+                    ix.pop("ProvisionedThroughput", None)
+    return definition
+
+
+def dynamodb_snapshot_export(root: Path, log: callable, workers: int = 8) -> Path:
+    # Parallel segmented Scan of every table into <table>.ndjson.gz (DynamoDB JSON, so types survive) + tables.json.
+    import gzip
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+    from datetime import datetime
+
+    client = DynamoDBLocalClient.from_env(root)
+    tables = [client.describe_table(name) for name in client.list_tables()]
+    if not tables:
+        raise CommandError("Nenhuma tabela no DynamoDB Local; nada para exportar.")
+
+    base = _snapshot_dir(root)
+    target = base / f"dynamodb-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    staging = target.with_name(target.name + ".part")
+    staging.mkdir(parents=True, exist_ok=True)
+    started = time.monotonic()
+    counts = {t["TableName"]: 0 for t in tables}
+    files = {t["TableName"]: gzip.open(staging / f"{t['TableName']}.ndjson.gz", "wt", encoding="utf-8") for t in tables}
+    locks = {name: threading.Lock() for name in files}
+
+    def scan(table: str, segment: int) -> None:
+        payload = {"TableName": table, "Segment": segment, "TotalSegments": workers}
+        while True:
+            resp = client.call("Scan", payload, timeout=30.0)
+            items = resp.get("Items", [])
+            if items:
+                chunk = "".join(json.dumps(item, separators=(",", ":")) + "\n" for item in items)
+                with locks[table]:
+                    files[table].write(chunk)
+                    counts[table] += len(items)
+            last = resp.get("LastEvaluatedKey")
+            if not last:
+                return
+            payload["ExclusiveStartKey"] = last
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dynamodb-scan") as pool:
+            futures = [pool.submit(scan, name, seg) for name in files for seg in range(workers)]
+            for fut in futures:
+                fut.result()
+    except Exception:
+        for f in files.values():
+            f.close()
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    for f in files.values():
+        f.close()
+
+    (staging / "tables.json").write_text(
+        json.dumps([_table_create_definition(t) for t in tables], indent=2), encoding="utf-8"
+    )
+    staging.rename(target)
+    elapsed = time.monotonic() - started
+    size = sum(p.stat().st_size for p in target.iterdir())
+    for name, count in counts.items():
+        log(f"- {name}: {count} itens\n")
+    log(
+        f"✅ Snapshot DynamoDB: {sum(counts.values())} itens de {len(tables)} tabela(s) em {elapsed:.2f}s "
+        f"({_format_bytes(size)}) -> {target.name}\n"
+    )
+
+    old = sorted(p for p in base.glob("dynamodb-*") if p.is_dir() and not p.name.endswith(".part"))
+    for stale in old[: max(0, len(old) - SNAPSHOTS_KEPT)]:
+        shutil.rmtree(stale, ignore_errors=True)
+    return target
+
+
+def _table_gone_probe(client: DynamoDBLocalClient, name: str) -> callable:
+    def probe() -> ProbeResult:
+        try:
+            status = client.describe_table(name).get("TableStatus")
+        except DynamoDBError as e:
+            if e.code == "ResourceNotFoundException":
+                return ProbeResult(True)
+            raise
+        return ProbeResult(False, str(status))
+
+    return probe
+
+
+def dynamodb_snapshot_restore(root: Path, snapshot: Path, log: callable, workers: int = 8) -> int:
+    # Recreates the snapshot's tables from scratch, then reloads them through the batch writer.
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+
+    client = DynamoDBLocalClient.from_env(root)
+    definitions = json.loads((snapshot / "tables.json").read_text(encoding="utf-8"))
+    existing = set(client.list_tables())
+    started = time.monotonic()
+
+    def recreate(definition: dict) -> None:
+        name = definition["TableName"]
+        if name in existing:
+            client.call("DeleteTable", {"TableName": name})
+            wait_ready(f"tabela {name} removida", _table_gone_probe(client, name), log, timeout=60.0, initial_delay=0.05)
+        client.call("CreateTable", definition)
+        wait_ready(f"tabela {name} ACTIVE", _table_active_probe(client, name), log, timeout=60.0, initial_delay=0.05)
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(definitions)) or 1, thread_name_prefix="dynamodb-create") as pool:
+        for fut in [pool.submit(recreate, d) for d in definitions]:
+            fut.result()
+
+    total = 0
+    for definition in definitions:
+        name = definition["TableName"]
+        path = snapshot / f"{name}.ndjson.gz"
+        if not path.exists():
+            continue
+        count, elapsed = batch_write_items(client, name, _read_ndjson(path), log, workers=workers)
+        total += count
+        log(f"✅ {name}: {count} itens em {elapsed:.2f}s\n")
+    elapsed = time.monotonic() - started
+    log(f"✅ DynamoDB restaurado de {snapshot.name}: {len(definitions)} tabela(s), {total} itens em {elapsed:.2f}s\n")
+    return total
+
+
+def dynamodb_snapshot(action: str, log: callable) -> None:
+    root = repo_root()
+    snapshots = sorted(
+        (p for p in _snapshot_dir(root).glob("dynamodb-*") if p.is_dir() and not p.name.endswith(".part")), reverse=True
+    )
+    if action == "exportar":
+        dynamodb_snapshot_export(root, log)
+    elif action == "restaurar":
+        if not snapshots:
+            raise CommandError("Nenhum snapshot DynamoDB; use 'exportar' primeiro.")
+        dynamodb_snapshot_restore(root, snapshots[0], log)
+    elif action == "descartar":
+        for path in snapshots:
+            shutil.rmtree(path, ignore_errors=True)
+            log(f"Removido: {path.name}\n")
+    else:
+        if not snapshots:
+            log("Nenhum snapshot DynamoDB.\n")
+        for path in snapshots:
+            size = sum(p.stat().st_size for p in path.iterdir())
+            log(f"- {path.name}  {len(list(path.glob('*.ndjson.gz')))} tabela(s)  {_format_bytes(size)}\n")
+
+
+def seed_dynamodb(root: Path, pm: list[str], log: callable) -> None:
+    # Fixtures present: native loader. Otherwise the TS seed (tsx) stays the default.
+    directory = dynamodb_fixtures_dir(root)
+    if read_env_value(root, "DYNAMODB_ENDPOINT") and any(directory.glob("*.ndjson*")):
+        seed_dynamodb_fixtures(root, log)
+    else:
+        run_stream([*pm, "run", "dynamodb:seed"], cwd=root, env=None, log=log)
+
+
+def dynamodb_table_definitions(root: Path) -> list[dict]:
+    # scripts/create-dynamodb-tables.ts stays the source of truth; its literal is close enough to JSON to convert.
+    import json
+    import re
+
+    src = (root / "scripts" / "create-dynamodb-tables.ts").read_text(encoding="utf-8")
+    base = read_env_value(root, "DYNAMODB_TABLE", "portfolio-backend-table")
+    suffixes = dict(re.findall(r"^\s*(\w+): `\$\{config\.database\.tableName\}(-[\w-]+)`", src, re.MULTILINE))
+
+    m = re.search(r"const baseTableDefinitions = (\[.*?\n\]);", src, re.DOTALL)
+    if not m:
+        raise CommandError("baseTableDefinitions não encontrado em create-dynamodb-tables.ts")
+
+    body = re.sub(r"//[^\n]*", "", m.group(1))
+    body = re.sub(r"TABLES\.(\w+)", lambda t: json.dumps(base + suffixes[t.group(1)]), body)
+    body = body.replace("'", '"')
+    body = re.sub(r"(?<=[{,\s])([A-Za-z_]\w*)\s*:", r'"\1":', body)
+    body = re.sub(r",(\s*[}\]])", r"\1", body)
+    try:
+        return json.loads(body)
+    except ValueError as e:
+        raise CommandError(f"Não consegui interpretar as definições de tabelas: {e}") from None
+
+
+def _dynamodb_schema_drift(expected: dict, actual: dict) -> list[str]:
+    def keys(schema: list[dict]) -> list[tuple[str, str]]:
+        return [(k["AttributeName"], k["KeyType"]) for k in schema]
+
+    drift: list[str] = []
+    if keys(expected["KeySchema"]) != keys(actual.get("KeySchema", [])):
+        drift.append(f"KeySchema {keys(actual.get('KeySchema', []))} != esperado {keys(expected['KeySchema'])}")
+
+    want = {g["IndexName"]: g for g in expected.get("GlobalSecondaryIndexes", [])}
+    have = {g["IndexName"]: g for g in actual.get("GlobalSecondaryIndexes", [])}
+    for name in sorted(want.keys() - have.keys()):
+        drift.append(f"GSI ausente: {name}")
+    for name in sorted(have.keys() - want.keys()):
+        drift.append(f"GSI não definido no script: {name}")
+    for name in sorted(want.keys() & have.keys()):
+        if keys(want[name]["KeySchema"]) != keys(have[name]["KeySchema"]):
+            drift.append(f"GSI {name}: KeySchema {keys(have[name]['KeySchema'])} != esperado {keys(want[name]['KeySchema'])}")
+        want_proj = want[name].get("Projection", {}).get("ProjectionType")
+        have_proj = have[name].get("Projection", {}).get("ProjectionType")
+        if want_proj != have_proj:
+            drift.append(f"GSI {name}: Projection {have_proj} != esperado {want_proj}")
+    return drift
+
+
+def _table_active_probe(client: DynamoDBLocalClient, name: str) -> callable:
+    def probe() -> ProbeResult:
+        table = client.describe_table(name)
+        pending = [g["IndexName"] for g in table.get("GlobalSecondaryIndexes", []) if g.get("IndexStatus", "ACTIVE") != "ACTIVE"]
+        if table.get("TableStatus") == "ACTIVE" and not pending:
+            return ProbeResult(True)
+        return ProbeResult(False, f"{table.get('TableStatus')} (GSIs pendentes: {', '.join(pending) or '-'})")
+
+    return probe
+
+
+def provision_dynamodb_tables(root: Path, log: callable, max_workers: int = 8) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    client = DynamoDBLocalClient.from_env(root)
+    definitions = dynamodb_table_definitions(root)
+    started = time.monotonic()
+
+    existing = set(client.list_tables())
+    missing = [d for d in definitions if d["TableName"] not in existing]
+    present = [d for d in definitions if d["TableName"] in existing]
+
+    drifted = 0
+    for definition in present:
+        drift = _dynamodb_schema_drift(definition, client.describe_table(definition["TableName"]))
+        if drift:
+            drifted += 1
+            log(f"⚠️  {definition['TableName']} difere do script:\n")
+            for item in drift:
+                log(f"   - {item}\n")
+        else:
+            log(f"⏭️  {definition['TableName']} já existe (schema ok)\n")
+
+    def create(definition: dict) -> None:
+        name = definition["TableName"]
+        try:
+            client.call("CreateTable", definition)
+            log(f"📝 CreateTable {name} enviado\n")
+        except DynamoDBError as e:
+            # Another launcher (or the TS script) may have won the race.
+            if e.code != "ResourceInUseException":
+                raise
+        wait_ready(f"tabela {name} ACTIVE", _table_active_probe(client, name), log, timeout=60.0, initial_delay=0.05)
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing)), thread_name_prefix="dynamodb-create") as pool:
+            for fut in [pool.submit(create, d) for d in missing]:
+                fut.result()
+
+    elapsed = time.monotonic() - started
+    log(
+        f"✅ Tabelas DynamoDB: {len(missing)} criada(s), {len(present)} já existente(s)"
+        f"{f', {drifted} com divergência' if drifted else ''} em {elapsed:.2f}s\n"
+    )
+    if drifted:
+        log("   Para recriar: reinicie o DynamoDB Local (-inMemory) ou apague as tabelas divergentes.\n")
+
+
+def ensure_dynamodb_tables(root: Path, pm: list[str], log: callable) -> None:
+    # Native provisioning only targets a local endpoint; real AWS keeps going through the TS script (IAM creds).
+    endpoint = read_env_value(root, "DYNAMODB_ENDPOINT")
+    if not endpoint:
+        log("DYNAMODB_ENDPOINT vazio (AWS); usando dynamodb:create-tables.\n")
+        run_stream([*pm, "run", "dynamodb:create-tables"], cwd=root, env=None, log=log)
+        return
+
+    try:
+        definitions_ok = bool(dynamodb_table_definitions(root))
+    except (CommandError, OSError) as e:
+        log(f"⚠️  {e}; usando dynamodb:create-tables.\n")
+        definitions_ok = False
+    if not definitions_ok:
+        run_stream([*pm, "run", "dynamodb:create-tables"], cwd=root, env=None, log=log)
+        return
+
+    provision_dynamodb_tables(root, log)
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    name: str
+    result: ProbeResult
+    elapsed: float
+
+    @property
+    def ok(self) -> bool:
+        return self.result.ok
+
+    @property
+    def latency(self) -> str:
+        return f"[{self.elapsed * 1000:.0f} ms]"
+
+
+def command_probe(cmd: list[str], cwd: Path | None = None, timeout: float = 15.0) -> callable:
+    def probe() -> ProbeResult:
+        try:
+            proc = subprocess.run(cmd, cwd=str(cwd) if cwd else None, capture_output=True, text=True, timeout=timeout)
+        except FileNotFoundError:
+            return ProbeResult(False, f"{cmd[0]} não encontrado")
+        except subprocess.TimeoutExpired:
+            return ProbeResult(False, f"timeout após {timeout:.0f}s")
+        out = (proc.stdout or "") + (proc.stderr or "")
+        return ProbeResult(proc.returncode == 0, out.strip())
+
+    return probe
+
+
+def run_checks(checks: list[tuple[str, callable]], log: Callable[[str], None] | None = None, max_workers: int = 16) -> dict[str, CheckResult]:
+    # Every check runs at once, so the whole pass costs about as much as the slowest one.
+    from concurrent.futures import ThreadPoolExecutor
+
+    def timed(name: str, probe: callable) -> CheckResult:
+        t0 = time.monotonic()
+        try:
+            result = probe()
+        except Exception as e:
+            result = ProbeResult(False, str(e))
+        return CheckResult(name, result, time.monotonic() - t0)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(checks)))) as pool:
+        futures = [pool.submit(timed, name, probe) for name, probe in checks]
+        results = {f.result().name: f.result() for f in futures}
+
+    if log and results:
+        wall = time.monotonic() - started
+        slowest = max(results.values(), key=lambda r: r.elapsed)
+        serial = sum(r.elapsed for r in results.values())
+        log(
+            f"⏱  {len(results)} verificações em {wall:.2f}s "
+            f"(mais lenta: {slowest.name} {slowest.elapsed:.2f}s; em série seriam {serial:.2f}s)\n"
+        )
+    return results
+
+
+ENVIRONMENT_PORTS = {
+    4000: "API",
+    27017: "MongoDB",
+    8000: "DynamoDB",
+    5555: "Prisma Studio",
+    8001: "DynamoDB Admin",
+}
+
+
 def verify_environment(log: callable) -> None:
     root = repo_root()
     log("=== Verificação do Ambiente ===\n")
 
     all_ok = True
+    pm = which_any(["pnpm", "npm"])
+    running: list[ContainerInfo] = []
+
+    def docker_probe() -> ProbeResult:
+        running.extend(list_containers(all=False))
+        return ProbeResult(True, format_containers_table(running).rstrip())
+
+    checks = [
+        ("docker", docker_probe),
+        ("node", command_probe(["node", "--version"])),
+        *[(f"port:{p}", tcp_probe("127.0.0.1", p)) for p in ENVIRONMENT_PORTS],
+    ]
+    if pm:
+        checks.append(("pm", command_probe([pm, "--version"])))
+    results = run_checks(checks, log)
+    log("\n")
 
     # Docker
     log("[1/6] Docker\n")
-    try:
-        run_stream(["docker", "ps"], cwd=root, env=None, log=log, check=True)
-        log("✅ Docker está funcionando\n\n")
-    except Exception:
-        log("❌ Docker não está rodando\n\n")
+    docker = results["docker"]
+    if docker.ok:
+        log(docker.result.detail + "\n")
+        log(f"✅ Docker está funcionando {docker.latency}\n\n")
+    else:
+        log(f"❌ Docker não está rodando {docker.latency}\n\n")
         all_ok = False
 
     # Node
     log("[2/6] Node.js\n")
-    if shutil.which("node"):
-        log(f"✅ Node.js instalado - { _capture(['node','--version']).strip() }\n\n")
+    node = results["node"]
+    if node.ok:
+        log(f"✅ Node.js instalado - {node.result.detail} {node.latency}\n\n")
     else:
         log("❌ Node.js não encontrado\n\n")
         all_ok = False
 
     # npm/pnpm
     log("[3/6] Gerenciador de pacotes\n")
-    pm = which_any(["pnpm", "npm"])
     if pm:
-        log(f"✅ {pm} encontrado - { _capture([pm,'--version']).strip() }\n\n")
+        log(f"✅ {pm} encontrado - {results['pm'].result.detail} {results['pm'].latency}\n\n")
     else:
         log("❌ pnpm/npm não encontrado\n\n")
         all_ok = False
 
     # Ports
     log("[4/6] Portas\n")
-    ports = {
-        4000: "API",
-        27017: "MongoDB",
-        8000: "DynamoDB",
-        5555: "Prisma Studio",
-        8001: "DynamoDB Admin",
-    }
-    for p, name in ports.items():
-        if _port_open("127.0.0.1", p):
-            log(f"⚠️  Porta {p} ({name}) está em uso\n")
+    for p, name in ENVIRONMENT_PORTS.items():
+        check = results[f"port:{p}"]
+        if check.ok:
+            log(f"⚠️  Porta {p} ({name}) está em uso {check.latency}\n")
         else:
-            log(f"✅ Porta {p} ({name}) está livre\n")
+            log(f"✅ Porta {p} ({name}) está livre {check.latency}\n")
     log("\n")
 
     # Files
@@ -476,16 +3192,16 @@ def verify_environment(log: callable) -> None:
 
     # Containers
     log("[6/6] Containers\n")
-    try:
-        out = _capture(["docker", "ps", "--filter", "name=rainer-blog-backend", "--format", "{{.Names}}: {{.Status}}"], cwd=root)
-        if out.strip():
-            log("✅ Containers encontrados:\n")
-            for line in out.splitlines():
-                log(f"- {line}\n")
-        else:
-            log("⚠️  Nenhum container do projeto rodando\n")
-    except Exception:
-        log("❌ Falha ao verificar containers\n")
+    compose_project = compose_project_name(root)
+    project = [c for c in running if c.labels.get("com.docker.compose.project") == compose_project]
+    if not docker.ok:
+        log(f"❌ Falha ao verificar containers: {docker.result.detail}\n")
+    elif project:
+        log("✅ Containers encontrados:\n")
+        for c in project:
+            log(f"- {c.name}: {c.status}\n")
+    else:
+        log("⚠️  Nenhum container do projeto rodando\n")
 
     log("\n=== Resumo ===\n")
     if all_ok:
@@ -500,7 +3216,7 @@ def docker_manage(action: str, log: callable) -> None:
 
     if action == "start":
         log("=== Docker: start ===\n")
-        run_stream([*base, "up", "-d", "mongodb", "dynamodb-local", "prisma-studio", "dynamodb-admin"], cwd=root, env=None, log=log)
+        run_stream([*base, "up", "-d", "mongodb", "dynamodb", "dynamodb-admin"], cwd=root, env=None, log=log)
         docker_manage("status", log)
         return
 
@@ -522,8 +3238,8 @@ def docker_manage(action: str, log: callable) -> None:
         return
 
     if action == "logs":
-        log("=== Docker: logs (mongodb, dynamodb-local) ===\n")
-        run_stream([*base, "logs", "-f", "mongodb", "dynamodb-local"], cwd=root, env=None, log=log, check=False)
+        log("=== Docker: logs (mongodb, dynamodb) ===\n")
+        run_stream([*base, "logs", "-f", "mongodb", "dynamodb"], cwd=root, env=None, log=log, check=False)
         return
 
     if action == "clean":
@@ -557,44 +3273,67 @@ def switch_database_provider(provider: str, log: callable) -> None:
 
 def status_containers(log: callable) -> None:
     root = repo_root()
-    # Verify docker
-    run_stream(["docker", "ps"], cwd=root, env=None, log=log, check=False)
 
+    # Compose service name (None: started by the launcher, not by compose), port, label, URL.
     names = [
-        ("rainer-blog-backend-mongodb", 27017, "MongoDB"),
-        ("rainer-blog-backend-dynamodb", 8000, "DynamoDB Local"),
-        ("rainer-blog-backend-prisma-studio", 5555, "Prisma Studio"),
-        ("rainer-blog-backend-dynamodb-admin", 8001, "DynamoDB Admin"),
-        ("rainer-blog-backend-api", 4000, "API"),
+        ("mongodb", 27017, "MongoDB", "mongodb://localhost:27017"),
+        ("dynamodb", 8000, "DynamoDB Local", "http://localhost:8000"),
+        (None, 5555, "Prisma Studio", "http://localhost:5555"),
+        ("dynamodb-admin", 8001, "DynamoDB Admin", "http://localhost:8001"),
+        ("api", 4000, "API", "http://localhost:4000"),
     ]
+    containers: list[ContainerInfo] = []
+
+    def docker_probe() -> ProbeResult:
+        # A single /containers/json round-trip (or one `docker ps`) feeds the whole report.
+        containers.extend(list_containers(all=True))
+        return ProbeResult(True)
+
+    results = run_checks(
+        [
+            ("docker", docker_probe),
+            *[(f"port:{port}", tcp_probe("127.0.0.1", port)) for _service, port, _label, _url in names],
+        ],
+        log,
+    )
+    # Verify docker
+    if results["docker"].ok:
+        log(format_containers_table(containers))
+    else:
+        log(f"❌ Docker indisponível: {results['docker'].result.detail}\n")
 
     log("\n=== Status containers (projeto) ===\n")
-    running_out = _capture(["docker", "ps", "--format", "{{.Names}}"], cwd=root)
-    running = set(line.strip() for line in running_out.splitlines() if line.strip())
+    project = compose_project_name(root)
+    by_service = {
+        c.labels.get("com.docker.compose.service"): c
+        for c in containers
+        if c.labels.get("com.docker.compose.project") == project
+    }
 
     total = 0
-    running_count = 0
-    for name, port, label in names:
+    running_urls = []
+    for service, port, label, url in names:
         total += 1
-        if name in running:
-            running_count += 1
-            log(f"✅ {label} - Rodando (porta {port})\n")
+        check = results[f"port:{port}"]
+        port_state = f"porta {port} {'aberta' if check.ok else 'fechada'} {check.latency}"
+        container = by_service.get(service) if service else None
+        if service is None and check.ok:
+            running_urls.append((label, url))
+            log(f"✅ {label} - Rodando ({port_state})\n")
+        elif container is not None and container.state == "running":
+            running_urls.append((label, url))
+            suffix = f", {container.health}" if container.health else ""
+            log(f"✅ {label} - Rodando ({port_state}{suffix})\n")
         else:
-            log(f"⚠️  {label} - Parado\n")
+            log(f"⚠️  {label} - Parado ({port_state})\n")
 
     log("\nResumo:\n")
     log(f"Total (conhecidos): {total}\n")
-    log(f"Rodando: {running_count}\n")
+    log(f"Rodando: {len(running_urls)}\n")
 
     log("\nURLs:\n")
-    if "rainer-blog-backend-mongodb" in running:
-        log("- MongoDB: mongodb://localhost:27017\n")
-    if "rainer-blog-backend-dynamodb" in running:
-        log("- DynamoDB Local: http://localhost:8000\n")
-    if "rainer-blog-backend-prisma-studio" in running:
-        log("- Prisma Studio: http://localhost:5555\n")
-    if "rainer-blog-backend-dynamodb-admin" in running:
-        log("- DynamoDB Admin: http://localhost:8001\n")
+    for label, url in running_urls:
+        log(f"- {label}: {url}\n")
 
 
 def update_aws_credentials_ui(parent: tk.Tk, log: callable) -> None:
@@ -617,6 +3356,21 @@ def update_aws_credentials_ui(parent: tk.Tk, log: callable) -> None:
     if not ok:
         raise CommandError("Operação cancelada.")
 
+    update_aws_credentials(access_key, secret_key, log)
+
+
+def update_aws_credentials_from_env(log: callable) -> None:
+    # Headless counterpart of the dialog: secrets come from the environment, never from argv.
+    access_key = os.environ.get("AWS_ACCESS_KEY_ID", "")
+    secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY", "")
+    if not access_key or not secret_key:
+        raise CommandError("Defina AWS_ACCESS_KEY_ID e AWS_SECRET_ACCESS_KEY no ambiente para atualizar o .env.")
+    ensure_env_file(repo_root(), log)
+    update_aws_credentials(access_key, secret_key, log)
+
+
+def update_aws_credentials(access_key: str, secret_key: str, log: callable) -> None:
+    root = repo_root()
     env_file = root / ".env"
     backup = root / f".env.backup.{int(time.time())}"
     shutil.copyfile(env_file, backup)
@@ -628,6 +3382,8 @@ def update_aws_credentials_ui(parent: tk.Tk, log: callable) -> None:
 
 
 def finalize_configuration(log: callable) -> None:
+    from urllib.error import URLError
+
     root = repo_root()
     log("=== Finalizar configuração (checklist) ===\n")
 
@@ -639,7 +3395,10 @@ def finalize_configuration(log: callable) -> None:
         log("⚠️  AWS CLI não encontrado (instale se for usar AWS).\n\n")
 
     log("[2/5] Criando tabelas DynamoDB\n")
-    run_package_script("dynamodb:create-tables", log, check=False)
+    try:
+        ensure_dynamodb_tables(root, package_manager_cmd(), log)
+    except CommandError as e:
+        log(f"⚠️  {e}\n")
     log("\n")
 
     log("[3/5] Populando MongoDB\n")
@@ -661,46 +3420,169 @@ def finalize_configuration(log: callable) -> None:
         log("Inicie com: pnpm run dev\n")
 
 
-def _docker_list_ids(cmd: list[str], root: Path) -> list[str]:
-    out = _capture(cmd, cwd=root)
-    return [line.strip() for line in out.splitlines() if line.strip()]
+@dataclass
+class TeardownPlan:
+    project: str
+    # (id, name, bytes); sizes are 0 when unknown (CLI fallback).
+    containers: list[tuple[str, str, int]]
+    volumes: list[tuple[str, str, int]]
+    networks: list[tuple[str, str, int]]
+    images: list[tuple[str, str, int]]
 
+    @property
+    def reclaimable(self) -> int:
+        return sum(size for group in (self.containers, self.volumes, self.images) for _id, _name, size in group)
 
-def clean_environment_destructive(log: callable) -> None:
-    root = repo_root()
-    log("=== Limpar ambiente (DESTRUTIVO) ===\n")
+    @property
+    def empty(self) -> bool:
+        return not (self.containers or self.volumes or self.networks or self.images)
+
+
+def _built_image_tags(root: Path, project: str) -> set[str]:
+    # Only images this project builds; pulled base images (mongo, dynamodb-local, ...) are shared and kept.
+    tags: set[str] = set()
+    for svc in compose_services(root):
+        if not svc.build:
+            continue
+        if svc.image:
+            tags.add(svc.image if ":" in svc.image.rsplit("/", 1)[-1] else f"{svc.image}:latest")
+        else:
+            tags.update({f"{project}-{svc.name}:latest", f"{project}_{svc.name}:latest"})
+    return tags
+
+
+def plan_project_teardown(root: Path) -> TeardownPlan:
+    import json
+
+    project = compose_project_name(root)
+    label = f"com.docker.compose.project={project}"
+    tags = _built_image_tags(root, project)
+
+    def in_project(labels: dict) -> bool:
+        return labels.get("com.docker.compose.project") == project or labels.get("com.docker.compose.project.working_dir") == str(root)
+
+    containers = [c for c in list_containers(all=True) if in_project(c.labels)]
+    client = docker_engine()
+    if client is not None:
+        # One /system/df call gives sizes for everything the plan may touch.
+        df = client.json("GET", "/system/df") or {}
+        container_size = {c["Id"]: int(c.get("SizeRw") or 0) for c in df.get("Containers") or []}
+        volumes = [
+            (v["Name"], v["Name"], max(0, int((v.get("UsageData") or {}).get("Size") or 0)))
+            for v in df.get("Volumes") or []
+            if in_project(v.get("Labels") or {})
+        ]
+        images = [
+            (i["Id"], next(t for t in i["RepoTags"] if t in tags), max(0, int(i.get("Size") or 0) - max(0, int(i.get("SharedSize") or 0))))
+            for i in df.get("Images") or []
+            if tags.intersection(i.get("RepoTags") or ())
+        ]
+        networks = [(n["Id"], n["Name"], 0) for n in client.json("GET", "/networks", {"filters": json.dumps({"label": [label]})}) or []]
+        return TeardownPlan(project, [(c.id, c.name, container_size.get(c.id, 0)) for c in containers], volumes, networks, images)
+
+    def lines(cmd: list[str]) -> list[str]:
+        return [line.strip() for line in _capture(cmd, cwd=root).splitlines() if line.strip()]
+
+    volumes = [(v, v, 0) for v in lines(["docker", "volume", "ls", "-q", "--filter", f"label={label}"])]
+    networks = [(n, n, 0) for n in lines(["docker", "network", "ls", "-q", "--filter", f"label={label}"])]
+    images = []
+    for line in lines(["docker", "images", "--format", "{{.ID}}\t{{.Repository}}:{{.Tag}}\t{{.Size}}"]):
+        parts = line.split("\t")
+        if len(parts) == 3 and parts[1] in tags:
+            images.append((parts[0], parts[1], int(_parse_size(parts[2]))))
+    return TeardownPlan(project, [(c.id, c.name, 0) for c in containers], volumes, networks, images)
+
+
+def _log_teardown_plan(plan: TeardownPlan, log: callable) -> None:
+    log(f"Projeto compose: {plan.project}\n")
+    for title, group in (("Containers", plan.containers), ("Volumes", plan.volumes), ("Redes", plan.networks), ("Imagens", plan.images)):
+        log(f"{title}: {len(group)}\n")
+        for _id, name, size in group:
+            log(f"  - {name}{f'  ({_format_bytes(size)})' if size else ''}\n")
+    log(f"Espaço recuperável estimado: {_format_bytes(plan.reclaimable)}\n")
+
+
+def _execute_teardown_api(client: DockerClient, plan: TeardownPlan) -> dict[str, str]:
+    def stop_and_remove(cid: str) -> None:
+        client.stop(cid)
+        client.remove_container(cid)
+
+    def remove_network(nid: str) -> None:
+        client.json("DELETE", f"/networks/{nid}", ok=(404,))
+
+    # Containers first: volumes, networks and images are only removable once nothing uses them.
+    errors = client.bulk(stop_and_remove, [cid for cid, _n, _s in plan.containers])
+    errors.update(client.bulk(client.remove_volume, [v for v, _n, _s in plan.volumes]))
+    errors.update(client.bulk(remove_network, [n for n, _n, _s in plan.networks]))
+    errors.update(client.bulk(client.remove_image, [i for i, _n, _s in plan.images]))
+    return errors
+
+
+def _execute_teardown_cli(root: Path, plan: TeardownPlan) -> dict[str, str]:
+    # One process per resource kind, IDs batched into argv.
+    errors: dict[str, str] = {}
+    for cmd, ids in (
+        (["docker", "stop"], [c for c, _n, _s in plan.containers]),
+        (["docker", "rm", "-f", "-v"], [c for c, _n, _s in plan.containers]),
+        (["docker", "volume", "rm", "-f"], [v for v, _n, _s in plan.volumes]),
+        (["docker", "network", "rm"], [n for n, _n, _s in plan.networks]),
+        (["docker", "rmi", "-f"], [i for i, _n, _s in plan.images]),
+    ):
+        if ids:
+            proc = subprocess.run([*cmd, *ids], cwd=str(root), capture_output=True, text=True)
+            if proc.returncode != 0 and cmd[1] != "stop":
+                errors[" ".join(cmd[1:])] = proc.stderr.strip()
+    return errors
+
+
+def teardown_project_docker(root: Path, log: callable, dry_run: bool = False) -> TeardownPlan:
+    started = time.monotonic()
+    plan = plan_project_teardown(root)
+    _log_teardown_plan(plan, log)
+    if dry_run or plan.empty:
+        if plan.empty:
+            log("ℹ️  Nenhum recurso Docker do projeto encontrado\n")
+        return plan
+
+    client = docker_engine()
+    errors = _execute_teardown_api(client, plan) if client is not None else _execute_teardown_cli(root, plan)
+    for item, err in errors.items():
+        log(f"⚠️  {item[:19]}: {err}\n")
+    log(
+        f"✅ Docker do projeto removido em {time.monotonic() - started:.1f}s "
+        f"({len(plan.containers)} containers, {len(plan.volumes)} volumes, {len(plan.networks)} redes, {len(plan.images)} imagens; "
+        f"~{_format_bytes(plan.reclaimable)})\n"
+    )
+    return plan
 
-    kill_node_processes(log)
 
-    # Stop & remove containers
-    ids = _docker_list_ids(["docker", "ps", "-aq"], root)
-    if ids:
-        for cid in ids:
-            subprocess.run(["docker", "stop", cid], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            subprocess.run(["docker", "rm", "-f", cid], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        log("✅ Containers removidos\n")
+def clean_environment_destructive(log: callable, dry_run: bool = False) -> None:
+    root = repo_root()
+    log(f"=== Limpar ambiente ({'SIMULAÇÃO' if dry_run else 'DESTRUTIVO'}) ===\n")
+
+    if dry_run:
+        for o in listening_port_owners(project_dev_ports(root)):
+            log(f"Encerraria: pid {o.pid} ({o.name}) na porta {o.port}\n")
     else:
-        log("ℹ️  Nenhum container para remover\n")
-
-    # Remove images
-    images = _docker_list_ids(["docker", "images", "-q"], root)
-    for img in images:
-        subprocess.run(["docker", "rmi", "-f", img], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    if images:
-        log("✅ Imagens removidas\n")
-
-    # Remove volumes
-    vols = _docker_list_ids(["docker", "volume", "ls", "-q"], root)
-    for v in vols:
-        subprocess.run(["docker", "volume", "rm", "-f", v], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    if vols:
-        log("✅ Volumes removidos\n")
-
-    subprocess.run(["docker", "system", "prune", "-a", "-f", "--volumes"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    subprocess.run(["docker", "network", "prune", "-f"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    log("✅ Docker system/network prune executado\n")
+        kill_node_processes(log)
+
+    # Scoped to this compose project: shared base images and other projects are left alone.
+    try:
+        teardown_project_docker(root, log, dry_run=dry_run)
+    except CommandError as e:
+        log(f"⚠️  Docker: {e}\n")
 
     # Project files
+    targets = [root / "node_modules", root / ".env", root / "logs", *root.glob("*.log"), *root.glob("*.tmp")]
+    if dry_run:
+        for path in targets:
+            if path.exists():
+                log(f"Removeria: {path.relative_to(root)}\n")
+        if shutil.which("npm"):
+            log("Limparia: cache do npm\n")
+        log("🧪 Simulação concluída: nada foi removido.\n")
+        return
+
     nm = root / "node_modules"
     if nm.exists():
         shutil.rmtree(nm, ignore_errors=True)
@@ -739,25 +3621,11 @@ def kill_node_processes_full(log: callable) -> None:
     root = repo_root()
     log("=== Matar processos Node/npm/pnpm e liberar portas ===\n")
 
-    if is_windows():
-        for exe in ("node.exe", "pnpm.exe", "npm.exe"):
-            subprocess.run(["taskkill", "/F", "/IM", exe], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-
-        for port in (3000, 4000, 5555, 6007):
-            out = _capture(["netstat", "-ano"], cwd=root)
-            pids: set[str] = set()
-            for line in out.splitlines():
-                if f":{port} " in line and "LISTENING" in line:
-                    parts = [p for p in line.split(" ") if p]
-                    if parts:
-                        pids.add(parts[-1])
-            for pid in pids:
-                subprocess.run(["taskkill", "/F", "/PID", pid], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        log("✅ Processos finalizados (se existiam).\n")
+    get_supervisor().stop_all(log)
+    remaining = free_ports(project_dev_ports(root), log, grace=2.0)
+    if remaining:
+        log("Algumas portas continuam ocupadas (processos de outro usuário/serviço?).\n")
     else:
-        subprocess.run(["pkill", "-9", "node"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        subprocess.run(["pkill", "-9", "pnpm"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        subprocess.run(["pkill", "-9", "npm"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         log("✅ Processos finalizados (se existiam).\n")
 
 
@@ -815,8 +3683,274 @@ def smoke_test_api_health(log: callable) -> None:
 
 def smoke_test_ports(log: callable) -> None:
     log("=== Smoke test: portas ===\n")
-    for p in (4000, 27017, 8000, 5555, 8001):
-        log(f"- {p}: {'OPEN' if _port_open('127.0.0.1', p) else 'closed'}\n")
+    results = run_checks([(str(p), tcp_probe("127.0.0.1", p)) for p in ENVIRONMENT_PORTS], log)
+    for p in ENVIRONMENT_PORTS:
+        check = results[str(p)]
+        log(f"- {p}: {'OPEN' if check.ok else 'closed'} {check.latency}\n")
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    routes: tuple[str, ...] = ("/api/v1/health", "/api/v1/posts", "/api/v1/categories")
+    concurrency: int = 8
+    duration: float = 10.0
+    # Requests per second for an open-loop run; 0 means closed loop (each worker fires as soon as it gets a reply).
+    rate: float = 0.0
+    timeout: float = 10.0
+
+
+LOAD_PROFILES = {
+    "leve": LoadProfile(),
+    "medio": LoadProfile(concurrency=32, duration=30.0),
+    "pesado": LoadProfile(concurrency=128, duration=60.0),
+    "taxa-50rps": LoadProfile(concurrency=64, duration=30.0, rate=50.0),
+    "taxa-200rps": LoadProfile(concurrency=128, duration=30.0, rate=200.0),
+}
+
+
+class LatencyHistogram:
+    # Log-bucketed latencies (2% relative precision) from 1 µs to ~100 s in a fixed array.
+    GROWTH = 1.02
+    BUCKETS = 940
+
+    def __init__(self):
+        from array import array
+
+        self.counts = array("Q", bytes(8 * self.BUCKETS))
+        self.count = 0
+        self.max = 0.0
+        self.total = 0.0
+
+    def record(self, seconds: float) -> None:
+        import math
+
+        micros = max(1.0, seconds * 1e6)
+        self.counts[min(self.BUCKETS - 1, int(math.log(micros) / math.log(self.GROWTH)))] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: LatencyHistogram) -> None:
+        for i, n in enumerate(other.counts):
+            if n:
+                self.counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, int(self.count * p / 100.0 + 0.5))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                # Upper edge of the bucket, capped by the real maximum. The last bucket is open-ended.
+                if i == self.BUCKETS - 1:
+                    return self.max
+                return min(self.max, self.GROWTH ** (i + 1) / 1e6)
+        return self.max
+
+
+@dataclass
+class RouteStats:
+    route: str
+    latency: LatencyHistogram
+    statuses: dict[int, int]
+    errors: dict[str, int]
+
+
+def load_profile_from_env(root: Path, preset: str) -> LoadProfile:
+    # LOADTEST_* in the environment or .env override the preset.
+    base = LOAD_PROFILES.get(preset, LoadProfile())
+
+    def value(key: str) -> str:
+        return os.environ.get(key) or read_env_value(root, key)
+
+    routes = value("LOADTEST_ROUTES")
+    return LoadProfile(
+        routes=tuple(r.strip() for r in routes.split(",") if r.strip()) if routes else base.routes,
+        concurrency=int(value("LOADTEST_CONCURRENCY") or base.concurrency),
+        duration=float(value("LOADTEST_DURATION") or base.duration),
+        rate=float(value("LOADTEST_RATE") or base.rate),
+        timeout=float(value("LOADTEST_TIMEOUT") or base.timeout),
+    )
+
+
+async def _http_keepalive_get(conn: list, host: str, port: int, path: str, timeout: float) -> int:
+    # conn is [reader, writer] or [] and is reused across calls (HTTP/1.1 keep-alive).
+    import asyncio
+
+    if not conn:
+        conn.extend(await asyncio.wait_for(asyncio.open_connection(host, port), timeout))
+    reader, writer = conn
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nUser-Agent: launcher-ui-load\r\nAccept: */*\r\n\r\n".encode("latin-1"))
+
+    async def read_response() -> tuple[int, bool]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("conexão fechada pelo servidor")
+        status = int(status_line.split()[1])
+        length, chunked, close = 0, False, False
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, val = line.decode("latin-1").partition(":")
+            name, val = name.strip().lower(), val.strip().lower()
+            if name == "content-length":
+                length = int(val)
+            elif name == "transfer-encoding" and "chunked" in val:
+                chunked = True
+            elif name == "connection" and val == "close":
+                close = True
+        if chunked:
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif length:
+            await reader.readexactly(length)
+        return status, close
+
+    try:
+        await writer.drain()
+        status, close = await asyncio.wait_for(read_response(), timeout)
+    except BaseException:
+        writer.close()
+        conn.clear()
+        raise
+    if close:
+        writer.close()
+        conn.clear()
+    return status
+
+
+async def _run_load(host: str, port: int, profile: LoadProfile) -> tuple[dict[str, RouteStats], float, int]:
+    import asyncio
+
+    stats = {r: RouteStats(r, LatencyHistogram(), {}, {}) for r in profile.routes}
+    loop = asyncio.get_running_loop()
+    # LIFO hands out the most recently used (already connected) slot first; cold slots only open under load.
+    pool: asyncio.LifoQueue = asyncio.LifoQueue()
+    for _ in range(profile.concurrency):
+        pool.put_nowait([])
+    started = loop.time()
+    deadline = started + profile.duration
+    dropped = 0
+
+    async def one(route: str, intended: float) -> None:
+        conn = await pool.get()
+        try:
+            status = await _http_keepalive_get(conn, host, port, route, profile.timeout)
+            st = stats[route]
+            st.statuses[status] = st.statuses.get(status, 0) + 1
+        except (OSError, asyncio.TimeoutError, ValueError, IndexError, asyncio.IncompleteReadError) as e:
+            key = type(e).__name__
+            stats[route].errors[key] = stats[route].errors.get(key, 0) + 1
+        finally:
+            # Measured from the intended start, so queueing behind a slow server counts (no coordinated omission).
+            stats[route].latency.record(loop.time() - intended)
+            pool.put_nowait(conn)
+
+    if profile.rate > 0:
+        interval = 1.0 / profile.rate
+        tasks: set = set()
+        i = 0
+        while True:
+            intended = started + i * interval
+            if intended >= deadline:
+                break
+            delay = intended - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # Bound the backlog so an overloaded server can't make us queue unbounded tasks.
+            if len(tasks) >= profile.concurrency * 50:
+                dropped += 1
+            else:
+                task = asyncio.ensure_future(one(profile.routes[i % len(profile.routes)], intended))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            i += 1
+        if tasks:
+            await asyncio.wait(tasks)
+    else:
+
+        async def worker(offset: int) -> None:
+            n = offset
+            while loop.time() < deadline:
+                await one(profile.routes[n % len(profile.routes)], loop.time())
+                n += 1
+
+        await asyncio.gather(*(worker(k) for k in range(profile.concurrency)))
+
+    while not pool.empty():
+        conn = pool.get_nowait()
+        if conn:
+            conn[1].close()
+    return stats, loop.time() - started, dropped
+
+
+def _format_latency(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}ms" if seconds < 10 else f"{seconds:.1f}s"
+
+
+def load_test_api(preset: str, log: callable) -> None:
+    import asyncio
+
+    root = repo_root()
+    port = int(read_env_port(root))
+    profile = load_profile_from_env(root, preset)
+    mode = f"open loop {profile.rate:g} req/s" if profile.rate > 0 else "closed loop"
+    log(f"=== Teste de carga: http://localhost:{port} ({preset}) ===\n")
+    log(f"Rotas: {', '.join(profile.routes)}\n")
+    log(f"{mode}, concorrência {profile.concurrency}, duração {profile.duration:g}s\n\n")
+
+    if not _port_open("127.0.0.1", port):
+        raise CommandError(f"API não está escutando na porta {port}. Inicie o ambiente primeiro.")
+
+    stats, elapsed, dropped = asyncio.run(_run_load("127.0.0.1", port, profile))
+
+    overall = LatencyHistogram()
+    errors = 0
+    width = max(len(r) for r in profile.routes)
+    log(f"{'rota'.ljust(width)}  {'req':>7}  {'erros':>6}  {'p50':>9}  {'p90':>9}  {'p99':>9}  {'max':>9}  status\n")
+    for route, st in stats.items():
+        overall.merge(st.latency)
+        route_errors = sum(st.errors.values())
+        errors += route_errors
+        codes = " ".join(f"{code}×{n}" for code, n in sorted(st.statuses.items()))
+        log(
+            f"{route.ljust(width)}  {st.latency.count:>7}  {route_errors:>6}  "
+            + "  ".join(f"{_format_latency(st.latency.percentile(p)):>9}" for p in (50, 90, 99))
+            + f"  {_format_latency(st.latency.max):>9}  {codes}\n"
+        )
+        for name, n in st.errors.items():
+            log(f"    ⚠️  {name}: {n}\n")
+
+    throughput = overall.count / elapsed if elapsed else 0.0
+    log(
+        f"\nTotal: {overall.count} req em {elapsed:.1f}s → {throughput:.1f} req/s | "
+        f"p50 {_format_latency(overall.percentile(50))}  p90 {_format_latency(overall.percentile(90))}  "
+        f"p99 {_format_latency(overall.percentile(99))}  max {_format_latency(overall.max)}\n"
+    )
+    if dropped:
+        log(f"⚠️  {dropped} requisições não disparadas: servidor não acompanhou a taxa pedida\n")
+    _emit_event(
+        log,
+        "load_test",
+        preset=preset,
+        requests=overall.count,
+        errors=errors,
+        dropped=dropped,
+        throughput=round(throughput, 2),
+        p50_ms=round(overall.percentile(50) * 1000, 2),
+        p90_ms=round(overall.percentile(90) * 1000, 2),
+        p99_ms=round(overall.percentile(99) * 1000, 2),
+        max_ms=round(overall.max * 1000, 2),
+    )
 
 
 def memory_version_update(log: callable) -> None:
@@ -889,6 +4023,387 @@ def sam_delete(env_name: str, log: callable) -> None:
     raise CommandError(f"Ambiente SAM inválido: {env_name}")
 
 
+def _format_duration(seconds: float) -> str:
+    seconds = int(max(0, seconds))
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
+def _format_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def build_actions() -> list[ActionDef]:
+    return [
+        ActionDef(
+            key="env_mongodb",
+            category="00 - Iniciar Ambiente",
+            label="Iniciar MongoDB (Prisma)",
+            description="Setup MongoDB + Prisma + servidor",
+            destructive=True,
+        ),
+        ActionDef(
+            key="env_dynamodb",
+            category="00 - Iniciar Ambiente",
+            label="Iniciar DynamoDB Local",
+            description="Setup DynamoDB + tabelas + servidor",
+            destructive=True,
+        ),
+        ActionDef(
+            key="env_complete",
+            category="00 - Iniciar Ambiente",
+            label="Iniciar Completo (Mongo + Dynamo)",
+            description="Setup completo com Mongo + Dynamo + Prisma",
+            destructive=True,
+        ),
+        ActionDef(
+            key="env_dev_clean",
+            category="00 - Iniciar Ambiente",
+            label="Dev Limpo (matar Node + PORT=4000)",
+            description="Finaliza processos Node e inicia dev",
+            destructive=True,
+        ),
+        ActionDef(
+            key="verify_env",
+            category="01 - Verificar Ambiente",
+            label="Verificar ambiente",
+            description="Diagnóstico do ambiente (Docker/Node/ports/.env/containers)",
+        ),
+        ActionDef(
+            key="docker_manage",
+            category="02 - Gerenciar Docker",
+            label="Gerenciar Docker (start/stop/restart/status/logs/clean)",
+            description="Gerenciar docker-compose do ambiente local",
+            parameter_kind="choice",
+            parameter_label="Ação",
+            parameter_choices=("start", "stop", "restart", "status", "logs", "clean"),
+            destructive=True,
+        ),
+        ActionDef(
+            key="mongodb_snapshot",
+            category="03 - Banco de Dados",
+            label="MongoDB: snapshot do banco semeado",
+            description="mongodump/mongorestore por hash de schema + seed",
+            parameter_kind="choice",
+            parameter_label="Ação",
+            parameter_choices=("status", "criar", "descartar"),
+        ),
+        ActionDef(
+            key="mongodb_snapshot_restore",
+            category="03 - Banco de Dados",
+            label="MongoDB: restaurar snapshot",
+            description="mongorestore --drop do snapshot do schema/seed atuais (substitui o banco)",
+            destructive=True,
+        ),
+        ActionDef(
+            key="dynamodb_snapshot",
+            category="03 - Banco de Dados",
+            label="DynamoDB: snapshot das tabelas",
+            description="Scan paralelo para NDJSON.gz + definições das tabelas",
+            parameter_kind="choice",
+            parameter_label="Ação",
+            parameter_choices=("status", "exportar", "descartar"),
+        ),
+        ActionDef(
+            key="dynamodb_snapshot_restore",
+            category="03 - Banco de Dados",
+            label="DynamoDB: restaurar snapshot",
+            description="Recria as tabelas do último snapshot e recarrega com BatchWriteItem (apaga os dados atuais)",
+            destructive=True,
+        ),
+        ActionDef(
+            key="dynamodb_fixtures",
+            category="03 - Banco de Dados",
+            label="DynamoDB: carregar fixtures NDJSON",
+            description="BatchWriteItem paralelo a partir de fixtures/dynamodb/*.ndjson (sobrescreve itens com a mesma chave)",
+            destructive=True,
+        ),
+        ActionDef(
+            key="dynamodb_fixtures_export",
+            category="03 - Banco de Dados",
+            label="DynamoDB: exportar fixtures NDJSON",
+            description="Grava as tabelas atuais (ex.: após o seed TS) em fixtures/dynamodb/*.ndjson",
+        ),
+        ActionDef(
+            key="switch_db",
+            category="03 - Banco de Dados",
+            label="Alternar banco (PRISMA/DYNAMODB/status)",
+            description="Atualiza DATABASE_PROVIDER no .env",
+            parameter_kind="choice",
+            parameter_label="Provider",
+            parameter_choices=("status", "PRISMA", "DYNAMODB"),
+        ),
+        ActionDef(
+            key="status_containers",
+            category="04 - Containers",
+            label="Status containers",
+            description="Exibe status e URLs do ambiente",
+        ),
+        ActionDef(
+            key="aws_update",
+            category="09 - AWS",
+            label="Atualizar credenciais AWS no .env",
+            description="Prompt de AccessKey/SecretKey e update no .env (com backup)",
+            destructive=True,
+        ),
+        ActionDef(
+            key="finalize",
+            category="10 - Finalizar Configuração",
+            label="Finalizar configuração (checklist)",
+            description="Cria tabelas Dynamo, seed Mongo, status containers, testa /health",
+            destructive=True,
+        ),
+        ActionDef(
+            key="clean_all",
+            category="11 - Limpar Ambiente",
+            label="Reset completo (DESTRUTIVO)",
+            description="Remove containers/volumes/redes/imagens do projeto, apaga node_modules, remove .env",
+            destructive=True,
+        ),
+        ActionDef(
+            key="clean_all_dry_run",
+            category="11 - Limpar Ambiente",
+            label="Reset completo (simulação)",
+            description="Mostra o que o reset removeria e quanto espaço liberaria, sem apagar nada",
+        ),
+        ActionDef(
+            key="kill_node_full",
+            category="12 - Utilitários",
+            label="Matar processos Node/npm/pnpm (e portas)",
+            description="Finaliza processos e libera portas comuns",
+            destructive=True,
+        ),
+        ActionDef(
+            key="wsl_diag",
+            category="13 - WSL",
+            label="WSL diagnóstico",
+            description="Mostra status do WSL e serviços do Windows",
+        ),
+        ActionDef(
+            key="wsl_fix",
+            category="13 - WSL",
+            label="WSL fix services (Admin)",
+            description="Habilita/inicia serviços LxssManager/vmcompute",
+            destructive=True,
+        ),
+        ActionDef(
+            key="wsl_restart",
+            category="13 - WSL",
+            label="WSL restart",
+            description="Executa wsl --shutdown e re-diagnóstico",
+        ),
+        ActionDef(
+            key="test_ports",
+            category="testes",
+            label="Smoke test: portas",
+            description="Checa se portas principais estão abertas",
+        ),
+        ActionDef(
+            key="test_health",
+            category="testes",
+            label="Smoke test: /health",
+            description="Chama http://localhost:<PORT>/health",
+        ),
+        ActionDef(
+            key="phase_history",
+            category="testes",
+            label="Histórico de tempos de inicialização",
+            description="Tempo por fase das últimas execuções e mediana usada para detectar regressões",
+            parameter_kind="choice",
+            parameter_label="Fluxo",
+            parameter_choices=("env_mongodb", "env_dynamodb", "env_complete"),
+        ),
+        ActionDef(
+            key="load_test",
+            category="testes",
+            label="Teste de carga da API",
+            description="Carga HTTP keep-alive (asyncio) em /api/v1/*; p50/p90/p99/max e req/s. Ajuste com LOADTEST_* no .env",
+            parameter_kind="choice",
+            parameter_label="Perfil",
+            parameter_choices=tuple(LOAD_PROFILES),
+        ),
+        ActionDef(
+            key="memory_version_update",
+            category="08 - Memória",
+            label="Atualizar versão (version:update)",
+            description="Executa: pnpm run version:update (tsx scripts/08-memoria/update-version.ts)",
+            destructive=True,
+        ),
+        ActionDef(
+            key="memory_update",
+            category="08 - Memória",
+            label="Atualizar memórias (memory:update)",
+            description="Executa: pnpm run memory:update (tsx scripts/08-memoria/update-memory.ts)",
+            destructive=True,
+        ),
+        ActionDef(
+            key="memory_sync",
+            category="08 - Memória",
+            label="Sync memórias (memory:sync)",
+            description="Executa: pnpm run memory:sync",
+            destructive=True,
+        ),
+        ActionDef(
+            key="sam_validate",
+            category="SAM / Serverless",
+            label="SAM validate",
+            description="Executa: pnpm run sam:validate",
+        ),
+        ActionDef(
+            key="sam_build",
+            category="SAM / Serverless",
+            label="SAM build",
+            description="Executa: pnpm run sam:build",
+            destructive=True,
+        ),
+        ActionDef(
+            key="sam_deploy",
+            category="SAM / Serverless",
+            label="SAM deploy (default/dev/staging/prod)",
+            description="Executa deploy via scripts sam:* do package.json",
+            parameter_kind="choice",
+            parameter_label="Ambiente",
+            parameter_choices=("default", "dev", "staging", "prod"),
+            destructive=True,
+        ),
+        ActionDef(
+            key="sam_logs",
+            category="SAM / Serverless",
+            label="SAM logs (dev/staging/prod)",
+            description="Tail de logs via scripts sam:logs:*",
+            parameter_kind="choice",
+            parameter_label="Ambiente",
+            parameter_choices=("dev", "staging", "prod"),
+        ),
+        ActionDef(
+            key="sam_delete",
+            category="SAM / Serverless",
+            label="SAM delete (dev/staging/prod)",
+            description="Remove stack via scripts sam:delete:*",
+            parameter_kind="choice",
+            parameter_label="Ambiente",
+            parameter_choices=("dev", "staging", "prod"),
+            destructive=True,
+        ),
+    ]
+
+
+def _prune_traces(directory: Path, keep: int = TRACES_KEPT) -> None:
+    old = sorted(directory.glob("*.trace.json"), key=lambda p: p.stat().st_mtime)
+    for path in old[: max(0, len(old) - keep)]:
+        path.unlink(missing_ok=True)
+
+
+def run_action(key: str, param: str, cfg: RunnerConfig, log: callable, parent: tk.Tk | None = None) -> Path | None:
+    # Every run is traced; the Chrome trace is written even when the action fails.
+    global _active_trace
+    recorder = TraceRecorder(key)
+    _active_trace = recorder
+    try:
+        with trace_span(key, "action", track="ação", param=param):
+            _dispatch_action(key, param, cfg, log, parent)
+    finally:
+        _active_trace = None
+        directory = repo_root() / "logs" / "traces"
+        try:
+            path = recorder.export(directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{key}.trace.json")
+            _prune_traces(directory)
+        except OSError as e:
+            log(f"⚠️  Trace não gravado: {e}\n")
+            path = None
+        if path is not None:
+            log(f"🧵 Trace: {path} (abra em ui.perfetto.dev ou chrome://tracing)\n")
+            _emit_event(log, "trace", path=str(path))
+    return path
+
+
+def _dispatch_action(key: str, param: str, cfg: RunnerConfig, log: callable, parent: tk.Tk | None) -> None:
+    if key == "env_mongodb":
+        start_mongodb_environment(cfg, log)
+    elif key == "env_dynamodb":
+        start_dynamodb_environment(cfg, log)
+    elif key == "env_complete":
+        start_complete_environment(cfg, log)
+    elif key == "env_dev_clean":
+        start_dev_clean(cfg, log)
+    elif key == "verify_env":
+        verify_environment(log)
+    elif key == "docker_manage":
+        docker_manage(param or "status", log)
+    elif key == "mongodb_snapshot":
+        log("=== MongoDB: snapshot ===\n")
+        mongo_snapshot(param or "status", log)
+    elif key == "mongodb_snapshot_restore":
+        log("=== MongoDB: restaurar snapshot ===\n")
+        mongo_snapshot("restaurar", log)
+    elif key == "dynamodb_snapshot":
+        log("=== DynamoDB: snapshot ===\n")
+        dynamodb_snapshot(param or "status", log)
+    elif key == "dynamodb_snapshot_restore":
+        log("=== DynamoDB: restaurar snapshot ===\n")
+        dynamodb_snapshot("restaurar", log)
+    elif key == "dynamodb_fixtures":
+        log("=== DynamoDB: carregar fixtures NDJSON ===\n")
+        seed_dynamodb_fixtures(repo_root(), log)
+    elif key == "dynamodb_fixtures_export":
+        log("=== DynamoDB: exportar fixtures NDJSON ===\n")
+        export_dynamodb_fixtures(repo_root(), log)
+    elif key == "switch_db":
+        switch_database_provider(param or "status", log)
+    elif key == "status_containers":
+        status_containers(log)
+    elif key == "aws_update":
+        if parent is not None:
+            update_aws_credentials_ui(parent, log)
+        else:
+            update_aws_credentials_from_env(log)
+    elif key == "finalize":
+        finalize_configuration(log)
+    elif key == "clean_all":
+        clean_environment_destructive(log)
+    elif key == "clean_all_dry_run":
+        clean_environment_destructive(log, dry_run=True)
+    elif key == "kill_node_full":
+        kill_node_processes_full(log)
+    elif key == "wsl_diag":
+        wsl_diagnose(log)
+    elif key == "wsl_fix":
+        wsl_fix_services(log)
+    elif key == "wsl_restart":
+        wsl_restart(log)
+    elif key == "test_ports":
+        smoke_test_ports(log)
+    elif key == "test_health":
+        smoke_test_api_health(log)
+    elif key == "phase_history":
+        show_phase_history(param or "env_complete", log)
+    elif key == "load_test":
+        load_test_api(param or "leve", log)
+    elif key == "memory_version_update":
+        memory_version_update(log)
+    elif key == "memory_update":
+        memory_update(log)
+    elif key == "memory_sync":
+        memory_sync(log)
+    elif key == "sam_validate":
+        sam_validate(log)
+    elif key == "sam_build":
+        sam_build(log)
+    elif key == "sam_deploy":
+        sam_deploy(param or "default", log)
+    elif key == "sam_logs":
+        sam_logs(param or "dev", log)
+    elif key == "sam_delete":
+        sam_delete(param or "dev", log)
+    else:
+        raise CommandError(f"Ação não implementada: {key}")
+
+
 class LauncherUI:
     def __init__(self, root: tk.Tk):
         self.root = root
@@ -898,7 +4413,7 @@ class LauncherUI:
         self.log_queue: queue.Queue[str] = queue.Queue()
         self.worker: threading.Thread | None = None
 
-        self.actions = self._build_actions()
+        self.actions = build_actions()
         self.actions_by_key = {a.key: a for a in self.actions}
 
         self.selected_action_key = tk.StringVar(value="")
@@ -911,195 +4426,27 @@ class LauncherUI:
         self.seed_mongodb = tk.BooleanVar(value=True)
         self.create_dynamodb_tables = tk.BooleanVar(value=True)
         self.seed_dynamodb = tk.BooleanVar(value=False)
+        self.force_prisma = tk.BooleanVar(value=False)
+
+        self.search_source = tk.StringVar(value="todas")
+        self.search_level = tk.StringVar(value="todos")
+        self.search_query = tk.StringVar(value="")
 
         self._build_ui()
         self._populate_actions_tree()
-        self.root.after(80, self._poll_log)
-
-    def _build_actions(self) -> list[ActionDef]:
-        return [
-            ActionDef(
-                key="env_mongodb",
-                category="00 - Iniciar Ambiente",
-                label="Iniciar MongoDB (Prisma)",
-                description="Setup MongoDB + Prisma + servidor",
-                destructive=True,
-            ),
-            ActionDef(
-                key="env_dynamodb",
-                category="00 - Iniciar Ambiente",
-                label="Iniciar DynamoDB Local",
-                description="Setup DynamoDB + tabelas + servidor",
-                destructive=True,
-            ),
-            ActionDef(
-                key="env_complete",
-                category="00 - Iniciar Ambiente",
-                label="Iniciar Completo (Mongo + Dynamo)",
-                description="Setup completo com Mongo + Dynamo + Prisma",
-                destructive=True,
-            ),
-            ActionDef(
-                key="env_dev_clean",
-                category="00 - Iniciar Ambiente",
-                label="Dev Limpo (matar Node + PORT=4000)",
-                description="Finaliza processos Node e inicia dev",
-                destructive=True,
-            ),
-            ActionDef(
-                key="verify_env",
-                category="01 - Verificar Ambiente",
-                label="Verificar ambiente",
-                description="Diagnóstico do ambiente (Docker/Node/ports/.env/containers)",
-            ),
-            ActionDef(
-                key="docker_manage",
-                category="02 - Gerenciar Docker",
-                label="Gerenciar Docker (start/stop/restart/status/logs/clean)",
-                description="Gerenciar docker-compose do ambiente local",
-                parameter_kind="choice",
-                parameter_label="Ação",
-                parameter_choices=("start", "stop", "restart", "status", "logs", "clean"),
-                destructive=True,
-            ),
-            ActionDef(
-                key="switch_db",
-                category="03 - Banco de Dados",
-                label="Alternar banco (PRISMA/DYNAMODB/status)",
-                description="Atualiza DATABASE_PROVIDER no .env",
-                parameter_kind="choice",
-                parameter_label="Provider",
-                parameter_choices=("status", "PRISMA", "DYNAMODB"),
-            ),
-            ActionDef(
-                key="status_containers",
-                category="04 - Containers",
-                label="Status containers",
-                description="Exibe status e URLs do ambiente",
-            ),
-            ActionDef(
-                key="aws_update",
-                category="09 - AWS",
-                label="Atualizar credenciais AWS no .env",
-                description="Prompt de AccessKey/SecretKey e update no .env (com backup)",
-                destructive=True,
-            ),
-            ActionDef(
-                key="finalize",
-                category="10 - Finalizar Configuração",
-                label="Finalizar configuração (checklist)",
-                description="Cria tabelas Dynamo, seed Mongo, status containers, testa /health",
-                destructive=True,
-            ),
-            ActionDef(
-                key="clean_all",
-                category="11 - Limpar Ambiente",
-                label="Reset completo (DESTRUTIVO)",
-                description="Remove containers/imagens/volumes, apaga node_modules, remove .env",
-                destructive=True,
-            ),
-            ActionDef(
-                key="kill_node_full",
-                category="12 - Utilitários",
-                label="Matar processos Node/npm/pnpm (e portas)",
-                description="Finaliza processos e libera portas comuns",
-                destructive=True,
-            ),
-            ActionDef(
-                key="wsl_diag",
-                category="13 - WSL",
-                label="WSL diagnóstico",
-                description="Mostra status do WSL e serviços do Windows",
-            ),
-            ActionDef(
-                key="wsl_fix",
-                category="13 - WSL",
-                label="WSL fix services (Admin)",
-                description="Habilita/inicia serviços LxssManager/vmcompute",
-                destructive=True,
-            ),
-            ActionDef(
-                key="wsl_restart",
-                category="13 - WSL",
-                label="WSL restart",
-                description="Executa wsl --shutdown e re-diagnóstico",
-            ),
-            ActionDef(
-                key="test_ports",
-                category="testes",
-                label="Smoke test: portas",
-                description="Checa se portas principais estão abertas",
-            ),
-            ActionDef(
-                key="test_health",
-                category="testes",
-                label="Smoke test: /health",
-                description="Chama http://localhost:<PORT>/health",
-            ),
-            ActionDef(
-                key="memory_version_update",
-                category="08 - Memória",
-                label="Atualizar versão (version:update)",
-                description="Executa: pnpm run version:update (tsx scripts/08-memoria/update-version.ts)",
-                destructive=True,
-            ),
-            ActionDef(
-                key="memory_update",
-                category="08 - Memória",
-                label="Atualizar memórias (memory:update)",
-                description="Executa: pnpm run memory:update (tsx scripts/08-memoria/update-memory.ts)",
-                destructive=True,
-            ),
-            ActionDef(
-                key="memory_sync",
-                category="08 - Memória",
-                label="Sync memórias (memory:sync)",
-                description="Executa: pnpm run memory:sync",
-                destructive=True,
-            ),
-            ActionDef(
-                key="sam_validate",
-                category="SAM / Serverless",
-                label="SAM validate",
-                description="Executa: pnpm run sam:validate",
-            ),
-            ActionDef(
-                key="sam_build",
-                category="SAM / Serverless",
-                label="SAM build",
-                description="Executa: pnpm run sam:build",
-                destructive=True,
-            ),
-            ActionDef(
-                key="sam_deploy",
-                category="SAM / Serverless",
-                label="SAM deploy (default/dev/staging/prod)",
-                description="Executa deploy via scripts sam:* do package.json",
-                parameter_kind="choice",
-                parameter_label="Ambiente",
-                parameter_choices=("default", "dev", "staging", "prod"),
-                destructive=True,
-            ),
-            ActionDef(
-                key="sam_logs",
-                category="SAM / Serverless",
-                label="SAM logs (dev/staging/prod)",
-                description="Tail de logs via scripts sam:logs:*",
-                parameter_kind="choice",
-                parameter_label="Ambiente",
-                parameter_choices=("dev", "staging", "prod"),
-            ),
-            ActionDef(
-                key="sam_delete",
-                category="SAM / Serverless",
-                label="SAM delete (dev/staging/prod)",
-                description="Remove stack via scripts sam:delete:*",
-                parameter_kind="choice",
-                parameter_label="Ambiente",
-                parameter_choices=("dev", "staging", "prod"),
-                destructive=True,
-            ),
-        ]
+
+        # Set from the watcher thread; the Tk side redraws on its next log tick.
+        self._containers_dirty = threading.Event()
+        self.container_watcher = ContainerWatcher(repo_root(), on_change=self._containers_dirty.set, log=self._log)
+        self.container_watcher.start()
+        self.stats_collector = StatsCollector(
+            lambda: {st.service: st.container_id for st in self.container_watcher.snapshot() if st.state == "running" and st.container_id}
+        )
+        self.stats_collector.start()
+
+        self.root.after(LOG_POLL_MS, self._poll_log)
+        self.root.after(PROCESS_PANEL_REFRESH_MS, self._refresh_processes)
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def _build_ui(self) -> None:
         outer = ttk.Frame(self.root, padding=10)
@@ -1150,6 +4497,7 @@ class LauncherUI:
         ttk.Checkbutton(self.env_opts_frame, text="Seed MongoDB", variable=self.seed_mongodb).grid(row=1, column=0, sticky="w", pady=(6, 0))
         ttk.Checkbutton(self.env_opts_frame, text="Criar tabelas DynamoDB", variable=self.create_dynamodb_tables).grid(row=1, column=1, sticky="w", padx=(10, 0), pady=(6, 0))
         ttk.Checkbutton(self.env_opts_frame, text="Seed DynamoDB", variable=self.seed_dynamodb).grid(row=1, column=2, sticky="w", padx=(10, 0), pady=(6, 0))
+        ttk.Checkbutton(self.env_opts_frame, text="Forçar Prisma (ignorar cache)", variable=self.force_prisma).grid(row=2, column=0, sticky="w", pady=(6, 0))
 
         buttons = ttk.Frame(right)
         buttons.grid(row=1, column=0, sticky="ew", pady=(10, 10))
@@ -1166,16 +4514,108 @@ class LauncherUI:
 
         log_frame = ttk.LabelFrame(right, text="Log", padding=8)
         log_frame.grid(row=2, column=0, sticky="nsew")
-        log_frame.grid_rowconfigure(0, weight=1)
+        log_frame.grid_rowconfigure(1, weight=1)
         log_frame.grid_columnconfigure(0, weight=1)
 
+        search_bar = ttk.Frame(log_frame)
+        search_bar.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 6))
+        search_bar.grid_columnconfigure(5, weight=1)
+
+        ttk.Label(search_bar, text="Fonte").grid(row=0, column=0, sticky="w")
+        self.search_source_combo = ttk.Combobox(
+            search_bar,
+            textvariable=self.search_source,
+            state="readonly",
+            width=24,
+            postcommand=self._refresh_search_sources,
+        )
+        self.search_source_combo.grid(row=0, column=1, sticky="w", padx=(4, 10))
+        ttk.Label(search_bar, text="Nível").grid(row=0, column=2, sticky="w")
+        ttk.Combobox(
+            search_bar,
+            textvariable=self.search_level,
+            state="readonly",
+            width=8,
+            values=("todos", "error", "warn"),
+        ).grid(row=0, column=3, sticky="w", padx=(4, 10))
+        ttk.Label(search_bar, text="Buscar").grid(row=0, column=4, sticky="w")
+        search_entry = ttk.Entry(search_bar, textvariable=self.search_query)
+        search_entry.grid(row=0, column=5, sticky="ew", padx=(4, 10))
+        search_entry.bind("<Return>", lambda _e: self._on_search())
+        ttk.Button(search_bar, text="Filtrar", command=self._on_search).grid(row=0, column=6, sticky="e")
+
         self.log_text = tk.Text(log_frame, wrap="none")
-        self.log_text.grid(row=0, column=0, sticky="nsew")
+        self.log_text.grid(row=1, column=0, sticky="nsew")
         self.log_text.configure(state="disabled")
 
         scroll = ttk.Scrollbar(log_frame, orient="vertical", command=self.log_text.yview)
-        scroll.grid(row=0, column=1, sticky="ns")
-        self.log_text.configure(yscrollcommand=scroll.set)
+        scroll.grid(row=1, column=1, sticky="ns")
+        procs_frame = ttk.LabelFrame(right, text="Processos supervisionados", padding=8)
+        procs_frame.grid(row=3, column=0, sticky="ew", pady=(10, 0))
+        procs_frame.grid_columnconfigure(0, weight=1)
+
+        columns = ("state", "pid", "uptime", "restarts", "cpu", "rss")
+        self.procs_tree = ttk.Treeview(procs_frame, columns=columns, height=4)
+        self.procs_tree.heading("#0", text="Processo")
+        for col, title, width in (
+            ("state", "Estado", 90),
+            ("pid", "PID", 70),
+            ("uptime", "Uptime", 80),
+            ("restarts", "Reinícios", 70),
+            ("cpu", "CPU %", 70),
+            ("rss", "RSS", 90),
+        ):
+            self.procs_tree.heading(col, text=title)
+            self.procs_tree.column(col, width=width, anchor="e" if col != "state" else "w")
+        self.procs_tree.grid(row=0, column=0, rowspan=2, sticky="ew")
+
+        ttk.Button(procs_frame, text="Parar", command=lambda: self._on_process_control("stop")).grid(row=0, column=1, sticky="ew", padx=(10, 0))
+        ttk.Button(procs_frame, text="Reiniciar", command=lambda: self._on_process_control("restart")).grid(row=1, column=1, sticky="ew", padx=(10, 0), pady=(4, 0))
+
+        containers_frame = ttk.LabelFrame(right, text="Containers (docker-compose)", padding=8)
+        containers_frame.grid(row=4, column=0, sticky="ew", pady=(10, 0))
+        containers_frame.grid_columnconfigure(0, weight=1)
+
+        columns = ("container", "state", "health", "uptime")
+        self.containers_tree = ttk.Treeview(containers_frame, columns=columns, height=4)
+        self.containers_tree.heading("#0", text="Serviço")
+        for col, title, width in (
+            ("container", "Container", 200),
+            ("state", "Estado", 90),
+            ("health", "Saúde", 90),
+            ("uptime", "Uptime", 80),
+        ):
+            self.containers_tree.heading(col, text=title)
+            self.containers_tree.column(col, width=width, anchor="e" if col == "uptime" else "w")
+        self.containers_tree.grid(row=0, column=0, sticky="ew")
+
+        stats_frame = ttk.LabelFrame(right, text="Recursos dos containers (docker stats)", padding=8)
+        stats_frame.grid(row=5, column=0, sticky="ew", pady=(10, 0))
+        stats_frame.grid_columnconfigure(0, weight=1)
+
+        columns = ("cpu", "cpu_spark", "mem", "mem_spark", "net", "blk")
+        self.stats_tree = ttk.Treeview(stats_frame, columns=columns, height=4)
+        self.stats_tree.heading("#0", text="Serviço")
+        for col, title, width, anchor in (
+            ("cpu", "CPU %", 60, "e"),
+            ("cpu_spark", "CPU", 170, "w"),
+            ("mem", "Memória", 80, "e"),
+            ("mem_spark", "Memória", 170, "w"),
+            ("net", "Rede rx/tx /s", 130, "e"),
+            ("blk", "Disco r/w /s", 130, "e"),
+        ):
+            self.stats_tree.heading(col, text=title)
+            self.stats_tree.column(col, width=width, anchor=anchor)
+        self.stats_tree.grid(row=0, column=0, sticky="ew")
+        ttk.Button(stats_frame, text="Exportar CSV", command=self._on_export_stats).grid(row=0, column=1, sticky="n", padx=(10, 0))
+
+        self.log_index = LogIndex()
+        self.log_view = VirtualLogView(
+            self.log_text,
+            scroll,
+            SessionLog.create(repo_root() / "logs" / "launcher", "launcher"),
+            index=self.log_index,
+        )
 
     def _populate_actions_tree(self) -> None:
         self.tree.delete(*self.tree.get_children())
@@ -1222,22 +4662,163 @@ class LauncherUI:
     def _log(self, text: str) -> None:
         self.log_queue.put(text)
 
-    def _poll_log(self) -> None:
+    def _drain_log_queue(self) -> str:
+        deadline = time.perf_counter() + LOG_FRAME_BUDGET_S
+        parts: list[str] = []
+        size = 0
         try:
-            while True:
+            while size < LOG_MAX_CHARS_PER_TICK and time.perf_counter() < deadline:
                 msg = self.log_queue.get_nowait()
-                self.log_text.configure(state="normal")
-                self.log_text.insert("end", msg)
-                self.log_text.see("end")
-                self.log_text.configure(state="disabled")
+                parts.append(msg)
+                size += len(msg)
         except queue.Empty:
             pass
-        self.root.after(80, self._poll_log)
+        return "".join(parts)
+
+    def _append_log(self, text: str) -> None:
+        self.log_view.append(text)
+
+    def _poll_log(self) -> None:
+        chunk = self._drain_log_queue()
+        if chunk:
+            self._append_log(chunk)
+        if self._containers_dirty.is_set():
+            self._containers_dirty.clear()
+            self._render_containers()
+        # Backlog left over: come back on the next idle slot instead of waiting a full interval.
+        self.root.after(1 if not self.log_queue.empty() else LOG_POLL_MS, self._poll_log)
 
     def _clear_log(self) -> None:
-        self.log_text.configure(state="normal")
-        self.log_text.delete("1.0", "end")
-        self.log_text.configure(state="disabled")
+        self.log_view.clear()
+
+    def _refresh_processes(self) -> None:
+        now = time.time()
+        seen: set[str] = set()
+        for m in get_supervisor().sample():
+            name = m.spec.name
+            seen.add(name)
+            running = m.proc is not None and m.proc.poll() is None
+            values = (
+                m.state,
+                m.pid or "",
+                _format_duration(now - m.started_at) if running and m.started_at else "",
+                m.restarts,
+                f"{m.cpu_percent:.1f}" if m.cpu_percent is not None else "-",
+                _format_bytes(m.rss_bytes) if m.rss_bytes is not None else "-",
+            )
+            if self.procs_tree.exists(name):
+                self.procs_tree.item(name, values=values)
+            else:
+                self.procs_tree.insert("", "end", iid=name, text=name, values=values)
+        for iid in self.procs_tree.get_children():
+            if iid not in seen:
+                self.procs_tree.delete(iid)
+        # Uptime is derived locally; Docker itself is only heard from through events.
+        self._render_containers()
+        self._render_stats()
+        self.root.after(PROCESS_PANEL_REFRESH_MS, self._refresh_processes)
+
+    def _render_containers(self) -> None:
+        now = time.time()
+        for st in self.container_watcher.snapshot():
+            state = f"{st.state} ({st.exit_code})" if st.exit_code else st.state
+            values = (
+                st.container or "-",
+                state,
+                st.health or "-",
+                _format_duration(now - st.started_at) if st.started_at else "",
+            )
+            if self.containers_tree.exists(st.service):
+                self.containers_tree.item(st.service, values=values)
+            else:
+                self.containers_tree.insert("", "end", iid=st.service, text=st.service, values=values)
+
+    def _render_stats(self) -> None:
+        seen: set[str] = set()
+        for series in self.stats_collector.series():
+            _times, m = series.window()
+            if not _times:
+                continue
+            seen.add(series.service)
+            values = (
+                f"{m['cpu_percent'][-1]:.1f}",
+                sparkline(m["cpu_percent"]),
+                _format_bytes(m["mem_bytes"][-1]),
+                sparkline(m["mem_bytes"]),
+                f"{_format_bytes(m['net_rx_bps'][-1])} / {_format_bytes(m['net_tx_bps'][-1])}",
+                f"{_format_bytes(m['blk_read_bps'][-1])} / {_format_bytes(m['blk_write_bps'][-1])}",
+            )
+            if self.stats_tree.exists(series.service):
+                self.stats_tree.item(series.service, values=values)
+            else:
+                self.stats_tree.insert("", "end", iid=series.service, text=series.service, values=values)
+        for iid in self.stats_tree.get_children():
+            if iid not in seen:
+                self.stats_tree.delete(iid)
+
+    def _on_export_stats(self) -> None:
+        path = repo_root() / "logs" / "stats" / f"containers-{time.strftime('%Y%m%d-%H%M%S')}.csv"
+        rows = self.stats_collector.export_csv(path)
+        self._log(f"📈 Telemetria exportada: {path} ({rows} amostras)\n")
+
+    def _on_process_control(self, op: str) -> None:
+        selection = self.procs_tree.selection()
+        if not selection:
+            messagebox.showwarning("Processos", "Selecione um processo.")
+            return
+        name = selection[0]
+        sup = get_supervisor()
+        # stop() waits for the grace period; keep it off the Tk thread.
+        target = sup.stop if op == "stop" else sup.restart
+        threading.Thread(target=target, args=(name,), daemon=True).start()
+        self._log(f"[{name}] {'parada' if op == 'stop' else 'reinício'} solicitado\n")
+
+    def _on_close(self) -> None:
+        sup = get_supervisor()
+        if sup.any_alive():
+            ok = messagebox.askyesno("Sair", "Existem processos supervisionados em execução. Encerrar todos e sair?")
+            if not ok:
+                return
+            sup.stop_all()
+        self.container_watcher.stop()
+        self.stats_collector.stop()
+        self.log_view.store.close()
+        self.root.destroy()
+
+    def _refresh_search_sources(self) -> None:
+        self.search_source_combo["values"] = ["todas", *self.log_index.source_names()]
+
+    def _on_search(self) -> None:
+        source = self.search_source.get()
+        level = self.search_level.get()
+        query = self.search_query.get()
+
+        started = time.perf_counter()
+        matches, truncated = self.log_index.search(
+            self.log_view.store,
+            source=None if source in ("", "todas") else source,
+            level=None if level in ("", "todos") else level,
+            query=query,
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        win = tk.Toplevel(self.root)
+        shown = f"{len(matches)}{'+' if truncated else ''}"
+        win.title(f"Log: {shown} linha(s) de {self.log_index.line_count} em {elapsed_ms:.0f} ms")
+        win.geometry("1000x500")
+        win.grid_rowconfigure(0, weight=1)
+        win.grid_columnconfigure(0, weight=1)
+
+        text = tk.Text(win, wrap="none")
+        text.grid(row=0, column=0, sticky="nsew")
+        yscroll = ttk.Scrollbar(win, orient="vertical", command=text.yview)
+        yscroll.grid(row=0, column=1, sticky="ns")
+        text.configure(yscrollcommand=yscroll.set)
+
+        # Oldest first, like the main log; line numbers point into the session file.
+        text.insert("end", "".join(f"{line_no + 1:>8}  {line}\n" for line_no, line in reversed(matches)))
+        text.see("end")
+        text.configure(state="disabled")
 
     def _cfg(self) -> RunnerConfig:
         return RunnerConfig(
@@ -1247,6 +4828,7 @@ class LauncherUI:
             seed_mongodb=bool(self.seed_mongodb.get()),
             create_dynamodb_tables=bool(self.create_dynamodb_tables.get()),
             seed_dynamodb=bool(self.seed_dynamodb.get()),
+            force_prisma=bool(self.force_prisma.get()),
         )
 
     def _on_run(self) -> None:
@@ -1281,58 +4863,7 @@ class LauncherUI:
 
         def work() -> None:
             try:
-                if key == "env_mongodb":
-                    start_mongodb_environment(cfg, self._log)
-                elif key == "env_dynamodb":
-                    start_dynamodb_environment(cfg, self._log)
-                elif key == "env_complete":
-                    start_complete_environment(cfg, self._log)
-                elif key == "env_dev_clean":
-                    start_dev_clean(cfg, self._log)
-                elif key == "verify_env":
-                    verify_environment(self._log)
-                elif key == "docker_manage":
-                    docker_manage(param or "status", self._log)
-                elif key == "switch_db":
-                    switch_database_provider(param or "status", self._log)
-                elif key == "status_containers":
-                    status_containers(self._log)
-                elif key == "aws_update":
-                    update_aws_credentials_ui(self.root, self._log)
-                elif key == "finalize":
-                    finalize_configuration(self._log)
-                elif key == "clean_all":
-                    clean_environment_destructive(self._log)
-                elif key == "kill_node_full":
-                    kill_node_processes_full(self._log)
-                elif key == "wsl_diag":
-                    wsl_diagnose(self._log)
-                elif key == "wsl_fix":
-                    wsl_fix_services(self._log)
-                elif key == "wsl_restart":
-                    wsl_restart(self._log)
-                elif key == "test_ports":
-                    smoke_test_ports(self._log)
-                elif key == "test_health":
-                    smoke_test_api_health(self._log)
-                elif key == "memory_version_update":
-                    memory_version_update(self._log)
-                elif key == "memory_update":
-                    memory_update(self._log)
-                elif key == "memory_sync":
-                    memory_sync(self._log)
-                elif key == "sam_validate":
-                    sam_validate(self._log)
-                elif key == "sam_build":
-                    sam_build(self._log)
-                elif key == "sam_deploy":
-                    sam_deploy(param or "default", self._log)
-                elif key == "sam_logs":
-                    sam_logs(param or "dev", self._log)
-                elif key == "sam_delete":
-                    sam_delete(param or "dev", self._log)
-                else:
-                    raise CommandError(f"Ação não implementada: {key}")
+                run_action(key, param, cfg, self._log, parent=self.root)
             except Exception as e:
                 self._log(f"\n[ERRO] {e}\n")
 
@@ -1367,14 +4898,150 @@ def self_check() -> int:
     return 0
 
 
+class NdjsonLog:
+    # Log sink for headless runs: every complete line becomes {"event": "log", ...} on stdout.
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.t0 = time.monotonic()
+        self._lock = threading.Lock()
+        self._partial = ""
+
+    def __call__(self, text: str) -> None:
+        with self._lock:
+            data = self._partial + text
+            lines = data.split("\n")
+            self._partial = lines.pop()
+            for line in lines:
+                self._write("log", {"line": collapse_cr(line.rstrip("\r"))})
+
+    def event(self, kind: str, **fields) -> None:
+        with self._lock:
+            self._write(kind, fields)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._partial:
+                self._write("log", {"line": collapse_cr(self._partial)})
+                self._partial = ""
+
+    def _write(self, kind: str, fields: dict) -> None:
+        import json
+
+        record = {"event": kind, "t": round(time.monotonic() - self.t0, 3), **fields}
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+
+def _wait_supervised(out: NdjsonLog) -> None:
+    # Supervised children die with the launcher, so a headless run stays up while they do.
+    sup = get_supervisor()
+    if not sup.any_alive():
+        return
+    out.event("supervising", processes=[{"name": m.spec.name, "pid": m.pid, "state": m.state} for m in sup.processes()])
+    try:
+        while sup.any_alive():
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        out.event("interrupted")
+    finally:
+        sup.stop_all(out)
+        out.flush()
+        out.event("supervised_exit", processes=[{"name": m.spec.name, "state": m.state} for m in sup.processes()])
+
+
+def run_headless(key: str, param: str, cfg: RunnerConfig, assume_yes: bool = False) -> int:
+    out = NdjsonLog()
+    actions = {a.key: a for a in build_actions()}
+    action = actions.get(key)
+
+    error = ""
+    if action is None:
+        error = f"Ação desconhecida: {key} (use --list-actions)"
+    elif action.parameter_choices and param and param not in action.parameter_choices:
+        error = f"Parâmetro inválido para {key}: {param} (opções: {', '.join(action.parameter_choices)})"
+    elif action.destructive and not assume_yes:
+        error = f"Ação destrutiva {key}: confirme com --yes"
+    if error:
+        out.event("action_end", action=key, status="error", exit_code=2, duration=0.0, error=error)
+        return 2
+
+    if os.name != "nt":
+        import signal
+
+        # SIGTERM from CI/ssh should tear supervised children down like Ctrl+C does.
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    out.event("action_start", action=key, label=action.label, category=action.category, param=param)
+    started = time.monotonic()
+    status, exit_code, error = "ok", 0, ""
+    try:
+        run_action(key, param, cfg, out)
+    except KeyboardInterrupt:
+        status, exit_code, error = "interrupted", 130, "interrompido"
+    except Exception as e:
+        status, exit_code, error = "error", 1, str(e)
+    out.flush()
+    out.event("action_end", action=key, status=status, exit_code=exit_code, duration=round(time.monotonic() - started, 3), error=error)
+
+    if exit_code == 0:
+        _wait_supervised(out)
+    else:
+        get_supervisor().stop_all(out)
+        out.flush()
+    return exit_code
+
+
+def list_actions_ndjson() -> int:
+    out = NdjsonLog()
+    for a in build_actions():
+        out.event(
+            "action",
+            key=a.key,
+            category=a.category,
+            label=a.label,
+            description=a.description,
+            parameter=a.parameter_label,
+            choices=list(a.parameter_choices or ()),
+            destructive=a.destructive,
+        )
+    return 0
+
+
 def main(argv: list[str]) -> int:
+    import argparse
+
     parser = argparse.ArgumentParser(description="Launcher 100% Python (Tkinter) para o projeto")
     parser.add_argument("--self-check", action="store_true", help="Valida dependências (docker/pnpm/.env.example)")
+    parser.add_argument("--action", metavar="KEY", help="Executa uma ação sem GUI e emite eventos NDJSON no stdout")
+    parser.add_argument("--param", default="", help="Parâmetro da ação (ex.: dev, staging, prod)")
+    parser.add_argument("--list-actions", action="store_true", help="Lista as ações disponíveis (NDJSON)")
+    parser.add_argument("--yes", action="store_true", help="Confirma ações destrutivas no modo --action")
+    parser.add_argument("--no-dev-server", action="store_true", help="Não inicia o servidor de desenvolvimento")
+    parser.add_argument("--no-prisma-studio", action="store_true", help="Não abre o Prisma Studio")
+    parser.add_argument("--no-dynamodb-admin", action="store_true", help="Não abre o DynamoDB Admin")
+    parser.add_argument("--no-seed-mongodb", action="store_true", help="Não popula o MongoDB")
+    parser.add_argument("--no-create-tables", action="store_true", help="Não cria as tabelas DynamoDB")
+    parser.add_argument("--seed-dynamodb", action="store_true", help="Popula o DynamoDB")
+    parser.add_argument("--force-prisma", action="store_true", help="Ignora o cache do prisma generate/db push")
     args = parser.parse_args(argv)
 
     if args.self_check:
         return self_check()
+    if args.list_actions:
+        return list_actions_ndjson()
+    if args.action:
+        cfg = RunnerConfig(
+            start_dev_server=not args.no_dev_server,
+            open_prisma_studio=not args.no_prisma_studio,
+            open_dynamodb_admin=not args.no_dynamodb_admin,
+            seed_mongodb=not args.no_seed_mongodb,
+            create_dynamodb_tables=not args.no_create_tables,
+            seed_dynamodb=args.seed_dynamodb,
+            force_prisma=args.force_prisma,
+        )
+        return run_headless(args.action, args.param.strip(), cfg, assume_yes=args.yes)
 
+    _load_tk()
     root = tk.Tk()
     try:
         ttk.Style().theme_use("clam")
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The launcher scripts are plain modules in scripts/, not an installed package.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,142 @@
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from launcher_ui import DockerClient, DockerEngineError
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="requer unix sockets")
+
+
+class _Engine(BaseHTTPRequestHandler):
+    # Just enough of the Engine API: chunked and sized bodies, errors, an event stream, idle disconnects.
+    protocol_version = "HTTP/1.1"
+    events: list[dict] = []
+    connections = 0
+
+    def log_message(self, *args):
+        pass
+
+    def address_string(self):
+        return "unix"
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def _chunked(self, status: int, chunks: list[bytes]) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for chunk in chunks:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _sized(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith("/containers/json"):
+            body = json.dumps(
+                [
+                    {
+                        "Id": "c1",
+                        "Names": ["/rainer-backend-mongodb"],
+                        "Image": "mongo:8.0",
+                        "State": "running",
+                        "Status": "Up 2 minutes (healthy)",
+                        "Labels": {"com.docker.compose.service": "mongodb"},
+                    }
+                ]
+            ).encode()
+            # Split mid-token so the client has to reassemble chunks.
+            self._chunked(200, [body[:7], body[7:40], body[40:]])
+        elif self.path == "/_ping":
+            self._sized(200, b"OK")
+        elif self.path == "/idle-close":
+            self._sized(200, b"{}")
+            # Keep-alive was promised; drop the connection anyway, like a daemon closing an idle socket.
+            self.close_connection = True
+        elif self.path.startswith("/events"):
+            self._chunked(200, [json.dumps(ev).encode() + b"\n" for ev in self.events])
+        else:
+            self._sized(404, b'{"message":"page not found"}')
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        if self.path.startswith("/containers/gone/stop"):
+            self._sized(304, b"")
+        else:
+            self._sized(500, b"not json")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+@pytest.fixture
+def engine():
+    # AF_UNIX paths are short (~104 bytes); pytest's tmp_path can be longer.
+    directory = tempfile.mkdtemp(prefix="dock")
+    path = os.path.join(directory, "docker.sock")
+    server = _Server(path, _Engine)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    _Engine.connections = 0
+    yield DockerClient(path, timeout=5.0)
+    server.shutdown()
+    server.server_close()
+    os.unlink(path)
+    os.rmdir(directory)
+
+
+def test_ping(engine):
+    assert engine.ping()
+
+
+def test_chunked_json_is_reassembled(engine):
+    [container] = engine.containers()
+    assert (container.name, container.state, container.health) == ("rainer-backend-mongodb", "running", "healthy")
+    assert container.labels["com.docker.compose.service"] == "mongodb"
+
+
+def test_keep_alive_reuses_one_connection(engine):
+    for _ in range(5):
+        engine.containers()
+    assert _Engine.connections == 1
+
+
+def test_retries_once_after_idle_disconnect(engine):
+    assert engine.json("GET", "/idle-close") == {}
+    assert engine.ping()
+    assert _Engine.connections == 2
+
+
+def test_errors(engine):
+    with pytest.raises(DockerEngineError) as exc:
+        engine.json("GET", "/nope")
+    assert exc.value.status == 404 and "page not found" in str(exc.value)
+    with pytest.raises(DockerEngineError) as exc:
+        engine.json("POST", "/containers/x/kill")
+    assert exc.value.status == 500 and "not json" in str(exc.value)
+    # Statuses the caller declares as fine come back as an empty result.
+    assert engine.json("POST", "/containers/gone/stop", ok=(304,)) is None
+
+
+def test_stream_yields_one_event_per_line(engine):
+    _Engine.events = [{"Action": "start", "id": "c1"}, {"Action": "die", "id": "c1"}]
+    resp, sock = engine.stream("/events", {"filters": json.dumps({"type": ["container"]})})
+    try:
+        assert [json.loads(line)["Action"] for line in iter(resp.readline, b"")] == ["start", "die"]
+    finally:
+        sock.close()
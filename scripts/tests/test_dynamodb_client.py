@@ -0,0 +1,57 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from launcher_ui import DynamoDBLocalClient, _from_attribute_value, _JsonNumber, _to_attribute_value
+
+SECRET = "wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY"
+SIGNED_AT = datetime(2015, 8, 30, 12, 36, tzinfo=timezone.utc).timestamp()
+
+
+# Expected signatures were produced by botocore's SigV4Auth for the same request, credentials and time.
+@pytest.mark.parametrize(
+    "region, target, body, signature",
+    [
+        (
+            "us-east-1",
+            "DescribeTable",
+            b'{"TableName":"posts"}',
+            "1a6b39402864eb84f2b2c6194d39141b656a015caf062d96c27ed5f0fe14e993",
+        ),
+        (
+            "sa-east-1",
+            "GetItem",
+            '{"TableName":"posts","Key":{"id":{"S":"açaí"}}}'.encode(),
+            "bc16635a0feea5332e578a038302b26a4eb9762d818a5762c783eee8d14007c0",
+        ),
+    ],
+)
+def test_sigv4_matches_reference(region, target, body, signature):
+    client = DynamoDBLocalClient("http://localhost:8000", region=region, access_key="AKIDEXAMPLE", secret_key=SECRET)
+    headers = client._signed_headers(target, body, timestamp=SIGNED_AT)
+    assert headers["x-amz-date"] == "20150830T123600Z"
+    assert headers["x-amz-target"] == f"DynamoDB_20120810.{target}"
+    assert headers["authorization"] == (
+        f"AWS4-HMAC-SHA256 Credential=AKIDEXAMPLE/20150830/{region}/dynamodb/aws4_request, "
+        f"SignedHeaders=content-type;host;x-amz-date;x-amz-target, Signature={signature}"
+    )
+
+
+def test_sigv4_signs_host_with_port():
+    client = DynamoDBLocalClient("http://127.0.0.1:4566/", secret_key=SECRET)
+    assert client._signed_headers("ListTables", b"{}", timestamp=SIGNED_AT)["host"] == "127.0.0.1:4566"
+
+
+def test_attribute_values_round_trip():
+    line = '{"id": "p1", "n": 12345678901234567890, "f": -1.5, "tags": ["a", true, null], "m": {"x": 0}}'
+    doc = json.loads(line, parse_int=_JsonNumber, parse_float=_JsonNumber)
+    item = {k: _to_attribute_value(v) for k, v in doc.items()}
+    assert item["n"] == {"N": "12345678901234567890"}
+    assert item["tags"] == {"L": [{"S": "a"}, {"BOOL": True}, {"NULL": True}]}
+    assert {k: _from_attribute_value(v) for k, v in item.items()} == json.loads(line)
+
+
+def test_from_attribute_value_rejects_sets():
+    with pytest.raises(ValueError):
+        _from_attribute_value({"SS": ["a", "b"]})
@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from launcher_ui import LatencyHistogram
+
+
+def test_empty():
+    assert LatencyHistogram().percentile(99) == 0.0
+
+
+def test_percentiles_within_bucket_precision():
+    rng = random.Random(7)
+    samples = sorted(rng.lognormvariate(-5, 1.2) for _ in range(20_000))
+    hist = LatencyHistogram()
+    for s in samples:
+        hist.record(s)
+    for p in (50, 90, 99, 99.9):
+        exact = samples[int(len(samples) * p / 100.0 + 0.5) - 1]
+        assert hist.percentile(p) == pytest.approx(exact, rel=LatencyHistogram.GROWTH - 1 + 1e-9)
+    assert hist.percentile(100) == samples[-1]
+    assert hist.count == len(samples)
+
+
+def test_out_of_range_values_are_clamped():
+    hist = LatencyHistogram()
+    hist.record(0.0)
+    hist.record(10_000.0)
+    assert hist.percentile(1) <= 2e-6
+    assert hist.percentile(100) == 10_000.0
+
+
+def test_merge_equals_recording_everything():
+    a, b, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for i in range(1, 500):
+        (a if i % 2 else b).record(i / 1000)
+        both.record(i / 1000)
+    a.merge(b)
+    assert list(a.counts) == list(both.counts)
+    assert (a.count, a.max) == (both.count, both.max)
+    assert a.total == pytest.approx(both.total)
@@ -0,0 +1,99 @@
+import time
+
+import pytest
+
+import launcher_common
+from launcher_common import LogIndex, OutputDecoder, PrefixedLog, SessionLog, collapse_cr
+
+
+def _feed(store: SessionLog, index: LogIndex, *texts: str) -> None:
+    for text in texts:
+        store.append(text)
+        index.feed(text)
+    # LogIndex indexes on its own thread; wait until it has caught up with the store.
+    deadline = time.monotonic() + 5
+    while index.base + index.line_count < store.line_count - (1 if store._tail_partial else 0):
+        assert time.monotonic() < deadline, "LogIndex não acompanhou o SessionLog"
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = SessionLog(tmp_path / "session.log", index_every=4)
+    yield s
+    s.close()
+
+
+def test_session_log_reads_by_line(store):
+    store.append("zero\num")
+    store.append("\ndois\ntrês\n")
+    assert store.line_count == 4
+    assert store.read_lines(1, 2) == "um\ndois\n"
+    assert store.read_lines(3, 10) == "três\n"
+    assert store.offset_of_line(99) == store.size
+
+
+def test_session_log_sparse_index(store):
+    for i in range(50):
+        store.append(f"linha {i}\n")
+    assert store.read_lines(37, 1) == "linha 37\n"
+
+
+def test_log_index_filters(store):
+    index = LogIndex()
+    _feed(
+        store,
+        index,
+        "POST /login ok\n",
+        "[api] GET /api/v1/posts 200\n",
+        "[prisma-studio] ❌ erro ao abrir\n",
+        "[api] ⚠ aviso: lento\n",
+    )
+    assert index.source_names() == ["(principal)", "api", "prisma-studio"]
+    assert index.candidates(source="api") == [1, 3]
+    assert index.candidates(level="error") == [2]
+    assert index.candidates(level="warn") == [3]
+    # Substring semantics: "post" also finds "posts", "prisma" finds "prisma-studio".
+    assert index.candidates(query="post") == [0, 1]
+    assert index.candidates(query="prisma") == [2]
+    matches, truncated = index.search(store, source="api", query="get")
+    assert matches == [(1, "[api] GET /api/v1/posts 200")] and not truncated
+
+
+def test_log_index_trim_drops_old_lines(store):
+    index = LogIndex()
+    _feed(store, index, *(f"linha {i} tok{i % 3}\n" for i in range(10)))
+    index.trim(6)
+    assert index.base == 6
+    assert index.candidates(query="tok0") == [6, 9]
+    assert index.candidates() == [6, 7, 8, 9]
+    assert index.search(store, query="tok1")[0] == [(7, "linha 7 tok1")]
+
+
+def test_log_index_is_bounded(store, monkeypatch):
+    monkeypatch.setattr(launcher_common, "LOG_INDEX_MAX_LINES", 100)
+    index = LogIndex()
+    _feed(store, index, "".join(f"linha {i} unico{i}\n" for i in range(500)))
+    assert index.candidates() == list(range(400, 500))
+    assert "unico0" not in index.tokens
+    assert index.search(store, query="unico499")[0] == [(499, "linha 499 unico499")]
+
+
+def test_prefixed_log_never_splices_sources():
+    out: list[str] = []
+    a = PrefixedLog("[a] ", out.append)
+    b = PrefixedLog("[b] ", out.append)
+    a("baixando...")
+    b("pronto\n")
+    a(" feito\n\rprog 10%\r")
+    b("sem fim")
+    b.flush()
+    assert "".join(out) == "[b] pronto\n[a] baixando... feito\n[a] prog 10%\r[b] sem fim\n"
+
+
+def test_output_decoder_handles_split_crlf_and_utf8():
+    raw = "açaí 🚀\r\n50%\r100%\n".encode()
+    decoder = OutputDecoder()
+    text = "".join(decoder.decode(raw[i : i + 1]) for i in range(len(raw))) + decoder.decode(b"", final=True)
+    assert text == "açaí 🚀\n50%\r100%\n"
+    assert collapse_cr(text) == "açaí 🚀\n100%\n"
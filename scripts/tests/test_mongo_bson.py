@@ -0,0 +1,46 @@
+import struct
+
+import pytest
+
+from launcher_ui import _bson_decode, _bson_encode
+
+
+@pytest.mark.parametrize(
+    "doc",
+    [
+        {},
+        {"hello": 1},
+        {"ok": 1.0, "maxWireVersion": 21, "isWritablePrimary": True, "setName": "rs0"},
+        {"big": 2**40, "neg": -(2**31), "edge": 2**31 - 1, "ratio": -0.125},
+        {"nested": {"a": "açaí 🚀", "b": None}, "hosts": ["mongodb:27017", "localhost:27017"]},
+    ],
+)
+def test_round_trip(doc):
+    assert _bson_decode(_bson_encode(doc)) == doc
+
+
+def test_encode_int_widths():
+    assert _bson_encode({"n": 1})[4] == 0x10
+    assert _bson_encode({"n": 2**31})[4] == 0x12
+
+
+def test_encode_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        _bson_encode({"v": object()})
+
+
+def test_decode_server_only_types():
+    # ObjectId, int64 timestamp and a binary subtype, as found in a real hello reply.
+    oid = bytes(range(12))
+    body = (
+        b"\x07_id\x00" + oid
+        + b"\x11ts\x00" + struct.pack("<Q", 7)
+        + b"\x05bin\x00" + struct.pack("<i", 3) + b"\x00abc"
+    )
+    data = struct.pack("<i", len(body) + 5) + body + b"\x00"
+    assert _bson_decode(data) == {"_id": oid.hex(), "ts": 7, "bin": b"abc"}
+
+
+def test_decode_at_offset():
+    payload = b"\x00" * 5 + _bson_encode({"ok": 1.0})
+    assert _bson_decode(payload, 5) == {"ok": 1.0}
@@ -0,0 +1,79 @@
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+_spec = importlib.util.spec_from_file_location(
+    "scripts_runner_ui", Path(__file__).resolve().parents[1] / "00-iniciar-ambiente" / "scripts-runner-ui.py"
+)
+runner = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(runner)
+ScriptIndex = runner.ScriptIndex
+
+
+def _touch(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("echo ok\n", encoding="utf-8")
+
+
+def _bump(directory: Path) -> None:
+    # Filesystems with coarse mtimes could otherwise hide an edit made in the same tick.
+    st = directory.stat()
+    os.utime(directory, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    scripts = tmp_path / "scripts"
+    _touch(scripts / "a" / "start.sh")
+    _touch(scripts / "a" / "deep" / "run.ps1")
+    _touch(scripts / "b" / "setup.bat")
+    _touch(scripts / "b" / "notes.md")
+    _touch(scripts / "__pycache__" / "x.sh")
+    return scripts
+
+
+def test_discovers_script_files_only(tree):
+    index = ScriptIndex(tree)
+    assert index.refresh()
+    assert index.files == {"a/start.sh", "a/deep/run.ps1", "b/setup.bat"}
+    assert index.exists("b/setup.bat") and not index.exists("b/notes.md")
+
+
+def test_unchanged_tree_rescans_nothing(tree, tmp_path):
+    manifest = tmp_path / "manifest.json"
+    ScriptIndex(tree, manifest).refresh()
+
+    index = ScriptIndex(tree, manifest)
+    assert index.refresh()  # first refresh of a fresh instance always reports its file set
+    assert index.rescanned == 0
+    assert not index.refresh()
+
+
+def test_only_changed_directories_are_listed_again(tree):
+    index = ScriptIndex(tree)
+    index.refresh()
+    _touch(tree / "b" / "teardown.sh")
+    _bump(tree / "b")
+    assert index.refresh()
+    assert index.rescanned == 1
+    assert "b/teardown.sh" in index.files
+
+    (tree / "a" / "deep" / "run.ps1").unlink()
+    _bump(tree / "a" / "deep")
+    assert index.refresh()
+    assert "a/deep/run.ps1" not in index.files
+
+
+def test_manifest_for_another_directory_is_ignored(tree, tmp_path):
+    manifest = tmp_path / "manifest.json"
+    ScriptIndex(tree, manifest).refresh()
+    other = tmp_path / "other"
+    _touch(other / "x.sh")
+    index = ScriptIndex(other, manifest)
+    index.refresh()
+    assert index.files == {"x.sh"}
+    assert index.rescanned == 1